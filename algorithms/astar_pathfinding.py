@@ -0,0 +1,71 @@
+"""A* search generator for grids, guided by the Manhattan distance.
+
+Same grid and frame protocol as ``bfs_pathfinding``; ``weights`` works as in
+``dijkstra_pathfinding``. The heuristic is the Manhattan distance to the goal
+times the cheapest cell weight, so it never overestimates and the path is a
+shortest one. Heap entries are ``(f, h, index)``: among equal ``f`` the cell
+closer to the goal is expanded first, which keeps A* from flooding open areas.
+"""
+from array import array
+from heapq import heappop, heappush
+from typing import Dict, Generator, List, Optional, Tuple
+
+from utils.grid import flat_walls, flat_weights, parent_array, rebuild_path, search_stats, to_index
+
+
+ALGORITHM = {
+    "name": "A* Search",
+    "input": "grid",
+    "complexity": "O((V + E) log V)",
+    "renderer": "grid",
+}
+
+
+@search_stats
+def astar_pathfinding(grid: List[List[int]], start: Tuple[int, int], goal: Tuple[int, int],
+                      weights=None) -> Generator[Dict, None, Optional[List[Tuple[int, int]]]]:
+    rows, cols, walls = flat_walls(grid)
+    cost = flat_weights(weights, rows, cols)
+    scale = min(cost) if cost else 1.0
+    # walls count as expanded, so one lookup rejects both
+    done = walls
+    parent = parent_array(rows * cols)
+    dist = array("d", [float("inf")]) * (rows * cols)
+    s, g = to_index(start, cols), to_index(goal, cols)
+    gr, gc = goal
+
+    def h(j: int) -> float:
+        r, c = divmod(j, cols)
+        return scale * (abs(r - gr) + abs(c - gc))
+
+    dist[s] = 0.0
+    heap = [(h(s), h(s), s)]
+    yield {"state": grid, "highlight": [tuple(start)], "info": "start", "visited": (), "frontier": (s,)}
+    last_row = (rows - 1) * cols
+    while heap:
+        _, _, i = heappop(heap)
+        if done[i]:
+            continue
+        done[i] = 1
+        r, c = divmod(i, cols)
+        if i == g:
+            yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": ()}
+            path = rebuild_path(parent, g, cols)
+            yield {"state": grid, "highlight": path, "info": "goal", "visited": (), "frontier": (), "path": path}
+            return path
+        found = []
+        d = dist[i]
+        # down, up, right, left
+        for j, inside in ((i + cols, i < last_row), (i - cols, i >= cols), (i + 1, c < cols - 1), (i - 1, c > 0)):
+            if inside and not done[j]:
+                nd = d + (cost[j] if cost is not None else 1.0)
+                if nd < dist[j]:
+                    if dist[j] == float("inf"):
+                        found.append(j)
+                    dist[j] = nd
+                    parent[j] = i
+                    hj = h(j)
+                    heappush(heap, (nd + hj, hj, j))
+        yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": tuple(found)}
+    yield {"state": grid, "highlight": [], "info": "not found", "visited": (), "frontier": ()}
+    return None
@@ -1,27 +1,62 @@
 """Breadth-First Search pathfinding generator for grid.
-Yields expansions as sets of visited coordinates and current frontier.
+
+Works on flat row-major indices: walls and visited cells live in one
+``bytearray``, each discovered cell stores its parent in an ``array('i')``
+and the path is rebuilt from those parents only once the goal is reached.
+
+Frames carry deltas rather than whole paths:
+
+- visited: flat indices expanded in this frame
+- frontier: flat indices discovered (queued) in this frame
+- path: the (row, col) path, on the final "goal" frame only
+
+``state`` is the input grid itself (it never changes) and ``highlight`` the
+(row, col) cell being expanded. The last frame also carries ``stats``
+(cells expanded, seconds spent searching). The generator returns the path,
+or None.
 """
-from typing import List, Tuple, Generator, Dict
+from typing import List, Tuple, Generator, Dict, Optional
 from collections import deque
 
+from utils.grid import flat_walls, parent_array, rebuild_path, search_stats, to_index
+
+
+ALGORITHM = {
+    "name": "BFS Pathfinding",
+    "input": "grid",
+    "complexity": "O(V + E)",
+    "renderer": "grid",
+}
+
 
-def bfs_pathfinding(grid: List[List[int]], start: Tuple[int, int], goal: Tuple[int, int]) -> Generator[Dict, None, None]:
-    rows = len(grid)
-    cols = len(grid[0]) if rows else 0
-    visited = set()
-    q = deque()
-    q.append((start, [start]))
-    visited.add(start)
-    yield {"state": grid, "highlight": [start], "info": "start"}
+@search_stats
+def bfs_pathfinding(grid: List[List[int]], start: Tuple[int, int],
+                    goal: Tuple[int, int]) -> Generator[Dict, None, Optional[List[Tuple[int, int]]]]:
+    rows, cols, walls = flat_walls(grid)
+    # walls count as seen, so one lookup rejects both
+    seen = walls
+    parent = parent_array(rows * cols)
+    s, g = to_index(start, cols), to_index(goal, cols)
+    seen[s] = 1
+    q = deque([s])
+    yield {"state": grid, "highlight": [tuple(start)], "info": "start", "visited": (), "frontier": (s,)}
+    last_row = (rows - 1) * cols
     while q:
-        (r, c), path = q.popleft()
-        yield {"state": grid, "highlight": path, "info": f"visit {r},{c}"}
-        if (r, c) == goal:
-            yield {"state": grid, "highlight": path, "info": "goal"}
-            return
-        for dr, dc in ((1,0),(-1,0),(0,1),(0,-1)):
-            nr, nc = r+dr, c+dc
-            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == 0 and (nr, nc) not in visited:
-                visited.add((nr, nc))
-                q.append(((nr, nc), path+[(nr, nc)]))
-    yield {"state": grid, "highlight": [], "info": "not found"}
+        i = q.popleft()
+        r, c = divmod(i, cols)
+        if i == g:
+            yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": ()}
+            path = rebuild_path(parent, g, cols)
+            yield {"state": grid, "highlight": path, "info": "goal", "visited": (), "frontier": (), "path": path}
+            return path
+        found = []
+        # down, up, right, left
+        for j, inside in ((i + cols, i < last_row), (i - cols, i >= cols), (i + 1, c < cols - 1), (i - 1, c > 0)):
+            if inside and not seen[j]:
+                seen[j] = 1
+                parent[j] = i
+                q.append(j)
+                found.append(j)
+        yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": tuple(found)}
+    yield {"state": grid, "highlight": [], "info": "not found", "visited": (), "frontier": ()}
+    return None
@@ -0,0 +1,68 @@
+"""Bidirectional breadth-first search generator for grids.
+
+Two BFS waves grow from the start and from the goal; each round expands one
+whole layer of whichever wave has the smaller queue. The search stops as
+soon as a wave discovers a cell the other one has seen: since both waves
+grow a layer at a time, that first meeting closes a shortest path.
+
+Same grid and frame protocol as ``bfs_pathfinding``; the first frame's
+``frontier`` holds both the start and the goal.
+"""
+from collections import deque
+from typing import Dict, Generator, List, Optional, Tuple
+
+from utils.grid import flat_walls, parent_array, rebuild_path, search_stats, to_index
+
+
+ALGORITHM = {
+    "name": "Bidirectional BFS",
+    "input": "grid",
+    "complexity": "O(V + E)",
+    "renderer": "grid",
+}
+
+
+@search_stats
+def bidirectional_bfs(grid: List[List[int]], start: Tuple[int, int],
+                      goal: Tuple[int, int]) -> Generator[Dict, None, Optional[List[Tuple[int, int]]]]:
+    rows, cols, walls = flat_walls(grid)
+    s, g = to_index(start, cols), to_index(goal, cols)
+    # per wave (0 from the start, 1 from the goal); walls count as seen
+    seen = (bytearray(walls), walls)
+    parent = (parent_array(rows * cols), parent_array(rows * cols))
+    queues = (deque([s]), deque([g]))
+    seen[0][s] = seen[1][g] = 1
+    yield {"state": grid, "highlight": [tuple(start), tuple(goal)], "info": "start", "visited": (),
+           "frontier": (s,) if s == g else (s, g)}
+    last_row = (rows - 1) * cols
+    if s == g:
+        path = [tuple(start)]
+        yield {"state": grid, "highlight": path, "info": "goal", "visited": (), "frontier": (), "path": path}
+        return path
+    while queues[0] and queues[1]:
+        side = 0 if len(queues[0]) <= len(queues[1]) else 1
+        queue, mine, other, par = queues[side], seen[side], seen[1 - side], parent[side]
+        for _ in range(len(queue)):
+            i = queue.popleft()
+            r, c = divmod(i, cols)
+            found = []
+            meet = -1
+            # down, up, right, left
+            for j, inside in ((i + cols, i < last_row), (i - cols, i >= cols), (i + 1, c < cols - 1), (i - 1, c > 0)):
+                if inside and not mine[j]:
+                    if other[j]:
+                        meet = j
+                        break
+                    mine[j] = 1
+                    par[j] = i
+                    queue.append(j)
+                    found.append(j)
+            yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,),
+                   "frontier": tuple(found)}
+            if meet >= 0:
+                ends = (i, meet) if side == 0 else (meet, i)
+                path = rebuild_path(parent[0], ends[0], cols) + rebuild_path(parent[1], ends[1], cols)[::-1]
+                yield {"state": grid, "highlight": path, "info": "goal", "visited": (), "frontier": (), "path": path}
+                return path
+    yield {"state": grid, "highlight": [], "info": "not found", "visited": (), "frontier": ()}
+    return None
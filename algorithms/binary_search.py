@@ -1,26 +1,38 @@
 """Binary Search (generator)
 
-Yields search range updates.
+Yields search range updates. The array never changes, so every frame shares
+the input list as its state.
 """
 from typing import List, Generator, Dict, Optional
 
 
+ALGORITHM = {
+    "name": "Binary Search",
+    "input": "sorted_array",
+    "complexity": "O(log n)",
+    "renderer": "bars",
+}
+
+
 def binary_search(arr: List[int], target: int) -> Generator[Dict, None, Optional[int]]:
     a = arr
-    lo = 0
-    hi = len(a) - 1
-    yield {"state": a.copy(), "highlight": (lo, hi), "info": "start"}
+    yield {"state": a, "highlight": (0, len(a) - 1), "info": "start", "op": None}
+    return (yield from _bisect(a, target, 0, len(a) - 1))
+
+
+def _bisect(a: List[int], target: int, lo: int, hi: int) -> Generator[Dict, None, Optional[int]]:
+    """Binary search of ``a[lo..hi]``; ends with a "found" or "not found" frame."""
     while lo <= hi:
         mid = (lo + hi) // 2
-        yield {"state": a.copy(), "highlight": (mid,), "info": f"check {mid}"}
+        yield {"state": a, "highlight": (mid,), "info": f"check {mid}", "op": ("compare", mid)}
         if a[mid] == target:
-            yield {"state": a.copy(), "highlight": (mid,), "info": "found"}
+            yield {"state": a, "highlight": (mid,), "info": "found", "op": None}
             return mid
         elif a[mid] < target:
             lo = mid + 1
-            yield {"state": a.copy(), "highlight": (lo, hi), "info": "move right"}
+            yield {"state": a, "highlight": (lo, hi), "info": "move right", "op": None}
         else:
             hi = mid - 1
-            yield {"state": a.copy(), "highlight": (lo, hi), "info": "move left"}
-    yield {"state": a.copy(), "highlight": (), "info": "not found"}
+            yield {"state": a, "highlight": (lo, hi), "info": "move left", "op": None}
+    yield {"state": a, "highlight": (), "info": "not found", "op": None}
     return None
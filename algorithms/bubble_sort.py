@@ -1,21 +1,32 @@
 """Bubble Sort (generator)
 
 Yields dicts with:
-- state: list of numbers
+- state: the working list (the same object every step; copy it to keep it)
 - highlight: tuple of indices being compared or swapped
 - info: short string
+- op: ("compare", i, j), ("swap", i, j) or None for a plain note
+- pass: true on the first frame of each outer pass (optional)
 """
 from typing import List, Generator, Dict
 
 
+ALGORITHM = {
+    "name": "Bubble Sort",
+    "input": "array",
+    "complexity": "O(n²)",
+    "renderer": "bars",
+}
+
+
 def bubble_sort(arr: List[int]) -> Generator[Dict, None, None]:
     a = arr.copy()
     n = len(a)
-    yield {"state": a.copy(), "highlight": (), "info": "start"}
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
     for i in range(n):
         for j in range(0, n - i - 1):
-            yield {"state": a.copy(), "highlight": (j, j + 1), "info": f"compare {j} and {j+1}"}
+            yield {"state": a, "highlight": (j, j + 1), "info": f"compare {j} and {j+1}", "op": ("compare", j, j + 1),
+                   "pass": j == 0}
             if a[j] > a[j + 1]:
                 a[j], a[j + 1] = a[j + 1], a[j]
-                yield {"state": a.copy(), "highlight": (j, j + 1), "info": f"swapped {j} & {j+1}"}
-    yield {"state": a.copy(), "highlight": (), "info": "done"}
+                yield {"state": a, "highlight": (j, j + 1), "info": f"swapped {j} & {j+1}", "op": ("swap", j, j + 1)}
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
@@ -0,0 +1,102 @@
+"""Bucket Sort (generator)
+
+Spreads the values over ``buckets`` equal-width value ranges (one per value
+by default), gathers the buckets in order with a counting pass (see
+``algorithms.counting_sort``) and then sorts inside each bucket. On evenly
+spread values every bucket holds a few values and the whole sort is O(n) on
+average; if most values share one bucket it is as slow as sorting that
+bucket, O(n²) with insertion sort.
+
+Large inputs get one frame for the gather and one for sorting every bucket
+at once: stable counting passes by each value's offset from its bucket's
+smallest value (16 bits a pass, so one pass for narrow buckets), then by
+bucket. Inputs of up to ``DETAIL_LIMIT`` values (or any input with
+``detail=True``) get a frame per value placed and per slot written, then
+insertion sort each bucket of two or more values; those frames carry the
+bucket's ``range``.
+"""
+from typing import List, Generator, Dict, Optional
+
+import numpy as np
+
+from algorithms.counting_sort import _counting_pass, _offset_keys, _stable_order, _wants_detail
+
+ALGORITHM = {
+    "name": "Bucket Sort",
+    "input": "array",
+    "complexity": "O(n) average, O(n²) worst",
+    "renderer": "bars",
+}
+
+
+def bucket_sort(arr: List[int], buckets: Optional[int] = None,
+                detail: Optional[bool] = None) -> Generator[Dict, None, None]:
+    if buckets is not None and buckets < 1:
+        raise ValueError("buckets must be at least 1")
+    a = arr.copy()
+    values = np.array(a)
+    if len(values) and values.dtype.kind not in "iuf":
+        raise ValueError("bucket sort needs numbers")
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    if len(values) > 1:
+        detail = _wants_detail(detail, len(values))
+        m = buckets or len(values)
+        index = bucket_index(values, m)
+        order = yield from _counting_pass(a, values, index, m, detail, f"gather {m:,} buckets")
+        index = index[order]
+        if detail:
+            sizes = np.bincount(index, minlength=m)
+            ends = np.cumsum(sizes)
+            for b in np.flatnonzero(sizes > 1).tolist():
+                yield from _insertion_sort(a, int(ends[b] - sizes[b]), int(ends[b]) - 1, b)
+        else:
+            # every bucket at once: order by how far each value lies above its
+            # bucket's smallest, then stably by bucket again; both by counting
+            sizes = np.bincount(index, minlength=m)
+            filled = sizes[sizes > 0]
+            keys = _sortable_keys(values)
+            offsets = keys - np.repeat(np.minimum.reduceat(keys, np.cumsum(filled) - filled), filled)
+            order = _stable_order(offsets, int(offsets.max()) + 1)
+            order = order[_stable_order(index[order], m)]
+            values = values[order]
+            a[:] = values.tolist()
+            yield {"state": a, "highlight": (), "info": "sorted inside every bucket", "pass": True}
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
+
+
+def bucket_index(values: np.ndarray, buckets: int) -> np.ndarray:
+    """The bucket of every value: ``buckets`` equal-width ranges from min to max.
+
+    Larger values never land in an earlier bucket.
+    """
+    x = values.astype(np.float64)
+    lo, span = x.min(), x.max() - x.min()
+    if not span:
+        return np.zeros(len(x), np.int64)
+    return np.minimum((x - lo) / span * buckets, buckets - 1).astype(np.int64)
+
+
+def _sortable_keys(values: np.ndarray) -> np.ndarray:
+    """Unsigned keys in the order of ``values``: integers less their minimum,
+    or the bits of floats with negative ones flipped."""
+    if values.dtype.kind != "f":
+        return _offset_keys(values)
+    bits = values.astype(np.float64).view(np.uint64)
+    return np.where(bits >> np.uint64(63), ~bits, bits | np.uint64(1 << 63))
+
+
+def _insertion_sort(a: List, lo: int, hi: int, b: int) -> Generator[Dict, None, None]:
+    span = (lo, hi)
+    yield {"state": a, "highlight": span, "info": f"sort bucket {b} ({lo}-{hi})", "op": None, "pass": True,
+           "range": span}
+    for i in range(lo + 1, hi + 1):
+        key = a[i]
+        j = i - 1
+        yield {"state": a, "highlight": (i,), "info": f"take {i}", "op": None, "range": span}
+        while j >= lo and a[j] > key:
+            a[j + 1] = a[j]
+            yield {"state": a, "highlight": (j + 1,), "info": "shift", "op": ("set", j + 1, a[j]), "range": span}
+            j -= 1
+        a[j + 1] = key
+        yield {"state": a, "highlight": (j + 1,), "info": f"placed at {j + 1}", "op": ("set", j + 1, key),
+               "range": span}
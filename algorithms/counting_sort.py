@@ -0,0 +1,135 @@
+"""Counting Sort (generator)
+
+Counts how often each key occurs (``np.bincount``), turns the counts into
+each key's first output slot (their cumulative sum) and writes the keys out
+in order: O(n + k) for ``k`` distinct possible keys, with no comparisons.
+Keys are the values minus the smallest one, so negative numbers work; the
+span of values is limited to ``MAX_RANGE``.
+
+The count and write steps run in NumPy. On large inputs the whole pass is
+one frame that carries the new array as ``state`` and no ``op`` (a trace
+stores it as a keyframe), so a million values sort in a handful of frames.
+Inputs of up to ``DETAIL_LIMIT`` values also get per-element frames: a note
+per value naming the slot it goes to, then one ``set`` per slot as the
+output is copied back. Pass ``detail`` to choose either way.
+
+Bad input (or too wide a span) raises ``ValueError`` before the first
+frame, so callers can pull that frame to check a run before keeping it.
+
+The radix and bucket sorts reuse this module's counting pass. It reorders
+values stably with NumPy's radix argsort, 16 bits of the key at a time, so
+no pass compares values, however wide its keys.
+"""
+from typing import List, Generator, Dict, Optional
+
+import numpy as np
+
+ALGORITHM = {
+    "name": "Counting Sort",
+    "input": "array",
+    "complexity": "O(n + k)",
+    "renderer": "bars",
+}
+
+# Inputs this short get per-element frames unless ``detail`` says otherwise
+DETAIL_LIMIT = 2000
+# Widest span of values (max - min + 1) counted; one counter per key
+MAX_RANGE = 1 << 22
+
+
+def counting_sort(arr: List[int], detail: Optional[bool] = None) -> Generator[Dict, None, None]:
+    a = arr.copy()
+    values = _int_values(a, "counting sort")
+    size = _key_span(values)
+    if size > MAX_RANGE:
+        raise ValueError(f"values span {size:,} keys, more than counting sort's {MAX_RANGE:,}; try radix sort")
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    if len(values) > 1:
+        keys = _offset_keys(values).astype(np.int64)
+        if _wants_detail(detail, len(values)):
+            yield from _counting_pass(a, values, keys, size, True, "count keys")
+        else:
+            counts = np.bincount(keys, minlength=size)
+            # each key, repeated as often as it was counted
+            a[:] = np.repeat(np.arange(size) + values.min(), counts).tolist()
+            yield {"state": a, "highlight": (), "info": f"counted {np.count_nonzero(counts):,} distinct keys, "
+                   f"wrote {len(a):,} values", "pass": True}
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
+
+
+def _key_span(values: np.ndarray) -> int:
+    """How many keys ``min(values)..max(values)`` covers (0 for no values)."""
+    return int(values.max()) - int(values.min()) + 1 if len(values) else 0
+
+
+def _wants_detail(detail: Optional[bool], n: int) -> bool:
+    return n <= DETAIL_LIMIT if detail is None else detail
+
+
+def _int_values(a: List[int], name: str) -> np.ndarray:
+    values = np.array(a)
+    if len(values) and values.dtype.kind not in "iu":
+        raise ValueError(f"{name} needs integers")
+    return values.astype(np.int64)
+
+
+def _offset_keys(values: np.ndarray) -> np.ndarray:
+    """``values - min`` as ``uint64``; exact even when the span overflows ``int64``."""
+    return (values - values.min()).view(np.uint64)
+
+
+def _stable_order(keys: np.ndarray, size: int) -> np.ndarray:
+    """Stable argsort of non-negative integer keys in ``range(size)``, by counting.
+
+    NumPy's stable argsort radix sorts 8 and 16-bit keys. Wider keys are
+    sorted 16 bits at a time, least significant first, so no key range
+    falls back to a comparison sort.
+    """
+    if size <= 1 << 8:
+        return np.argsort(keys.astype(np.uint8), kind="stable")
+    keys = keys.astype(np.uint64)
+    order = np.argsort((keys & np.uint64(0xFFFF)).astype(np.uint16), kind="stable")
+    shift = 16
+    while (size - 1) >> shift:
+        digit = (keys[order] >> np.uint64(shift)) & np.uint64(0xFFFF)
+        order = order[np.argsort(digit.astype(np.uint16), kind="stable")]
+        shift += 16
+    return order
+
+
+def _counting_pass(a: List, values: np.ndarray, keys: np.ndarray, size: int, detail: bool, label: str,
+                   at: Optional[np.ndarray] = None, extra: Optional[Dict] = None
+                   ) -> Generator[Dict, None, np.ndarray]:
+    """One stable counting pass over ``values[at]`` by ``keys`` (aligned with ``at``).
+
+    ``at`` (default: every position) lists the positions taking part in
+    ascending order; the pass reorders them among themselves, in ``values``
+    and in ``a``. Frames are labelled with ``label`` and carry ``extra``.
+    Returns the order applied, as indices into ``at``.
+    """
+    extra = extra or {}
+    at = np.arange(len(values)) if at is None else at
+    order = _stable_order(keys, size)
+    before = values[at]
+    moved = before[order]
+    values[at] = moved
+    if not detail:
+        a[:] = values.tolist()
+        yield {"state": a, "highlight": (), "info": f"{label}: {len(at):,} values placed", "pass": True, **extra}
+        return order
+    counts = np.bincount(keys, minlength=size)
+    starts = np.cumsum(counts) - counts
+    yield {"state": a, "highlight": (), "op": None, "pass": True, **extra,
+           "info": f"{label}: counts {counts.tolist()}" if size <= 16 else
+                   f"{label}: {np.count_nonzero(counts)} of {size} buckets used"}
+    # the counting sort proper: a key's next free slot starts where its bucket does
+    slot = starts.tolist()
+    for i, (value, key) in enumerate(zip(before.tolist(), keys.tolist())):
+        dest = int(at[slot[key]])
+        slot[key] += 1
+        yield {"state": a, "highlight": (int(at[i]),), "info": f"{value} (key {key}) goes to {dest}", "op": None,
+               **extra}
+    for pos, value in zip(at.tolist(), moved.tolist()):
+        a[pos] = value
+        yield {"state": a, "highlight": (pos,), "info": f"wrote {value} at {pos}", "op": ("set", pos, value), **extra}
+    return order
@@ -0,0 +1,65 @@
+"""Dijkstra's shortest path generator for weighted grids.
+
+Same grid and frame protocol as ``bfs_pathfinding``: walls are non-zero
+cells of ``grid``, frames carry ``visited``/``frontier`` deltas of flat
+indices and the final "goal" frame the path. ``weights``, a grid of the same
+shape, gives the (positive) cost of entering each cell; without it every
+step costs 1 and the search expands cells in BFS order.
+
+The queue is a binary heap with lazy deletion: a cell is pushed again when
+its distance improves and stale entries are skipped once it is expanded.
+"""
+from array import array
+from heapq import heappop, heappush
+from typing import Dict, Generator, List, Optional, Tuple
+
+from utils.grid import flat_walls, flat_weights, parent_array, rebuild_path, search_stats, to_index
+
+
+ALGORITHM = {
+    "name": "Dijkstra",
+    "input": "grid",
+    "complexity": "O((V + E) log V)",
+    "renderer": "grid",
+}
+
+
+@search_stats
+def dijkstra_pathfinding(grid: List[List[int]], start: Tuple[int, int], goal: Tuple[int, int],
+                         weights=None) -> Generator[Dict, None, Optional[List[Tuple[int, int]]]]:
+    rows, cols, walls = flat_walls(grid)
+    cost = flat_weights(weights, rows, cols)
+    # walls count as expanded, so one lookup rejects both
+    done = walls
+    parent = parent_array(rows * cols)
+    dist = array("d", [float("inf")]) * (rows * cols)
+    s, g = to_index(start, cols), to_index(goal, cols)
+    dist[s] = 0.0
+    heap = [(0.0, s)]
+    yield {"state": grid, "highlight": [tuple(start)], "info": "start", "visited": (), "frontier": (s,)}
+    last_row = (rows - 1) * cols
+    while heap:
+        d, i = heappop(heap)
+        if done[i]:
+            continue
+        done[i] = 1
+        r, c = divmod(i, cols)
+        if i == g:
+            yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": ()}
+            path = rebuild_path(parent, g, cols)
+            yield {"state": grid, "highlight": path, "info": "goal", "visited": (), "frontier": (), "path": path}
+            return path
+        found = []
+        # down, up, right, left
+        for j, inside in ((i + cols, i < last_row), (i - cols, i >= cols), (i + 1, c < cols - 1), (i - 1, c > 0)):
+            if inside and not done[j]:
+                nd = d + (cost[j] if cost is not None else 1.0)
+                if nd < dist[j]:
+                    if dist[j] == float("inf"):
+                        found.append(j)
+                    dist[j] = nd
+                    parent[j] = i
+                    heappush(heap, (nd, j))
+        yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": tuple(found)}
+    yield {"state": grid, "highlight": [], "info": "not found", "visited": (), "frontier": ()}
+    return None
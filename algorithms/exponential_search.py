@@ -0,0 +1,44 @@
+"""Exponential Search (generator)
+
+Probes indices 0, 1, 2, 4, 8, ... until one holds a value not below the
+target, then binary searches the range between the last two probes. Finding
+the element at index ``i`` takes about ``2 log2(i)`` probes, so it beats a
+plain binary search on targets near the front of a long array.
+"""
+from typing import List, Generator, Dict, Optional
+
+from algorithms.binary_search import _bisect
+
+ALGORITHM = {
+    "name": "Exponential Search",
+    "input": "sorted_array",
+    "complexity": "O(log n)",
+    "renderer": "bars",
+}
+
+
+def exponential_search(arr: List[int], target: int) -> Generator[Dict, None, Optional[int]]:
+    a = arr
+    n = len(a)
+    yield {"state": a, "highlight": (0, n - 1), "info": "start", "op": None}
+    if n:
+        yield {"state": a, "highlight": (0,), "info": "check 0", "op": ("compare", 0)}
+        if a[0] == target:
+            yield {"state": a, "highlight": (0,), "info": "found", "op": None}
+            return 0
+    if not n or a[0] > target:
+        yield {"state": a, "highlight": (), "info": "not found", "op": None}
+        return None
+    bound = 1
+    while bound < n:
+        yield {"state": a, "highlight": (bound,), "info": f"check {bound}", "op": ("compare", bound)}
+        if a[bound] == target:
+            yield {"state": a, "highlight": (bound,), "info": "found", "op": None}
+            return bound
+        if a[bound] > target:
+            break
+        bound *= 2
+    # everything up to bound // 2 is below the target, a[bound] (if any) above it
+    lo, hi = bound // 2 + 1, min(bound, n) - 1
+    yield {"state": a, "highlight": (lo, hi), "info": f"search {lo}-{hi}", "op": None}
+    return (yield from _bisect(a, target, lo, hi))
@@ -0,0 +1,613 @@
+"""Vectorized trace engines for the sorting algorithms.
+
+Each ``fast_*`` function returns the same :class:`~utils.trace.Trace` that
+``record_trace`` builds from the matching generator in this package (same
+ops, indices, highlights, info text and final state) without running a
+Python loop per step. Ops are written into preallocated NumPy columns a whole
+pass (bubble, selection, insertion), merge level (merge) or partition (quick)
+at a time, with info strings stored once as templates.
+
+These are not registered as algorithms; look engines up by registry key in
+``FAST_ENGINES``::
+
+    trace = FAST_ENGINES["bubble_sort"](data)
+"""
+import random
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from algorithms.parallel_merge_sort import DEFAULT_WORKERS, chunk_bounds
+from utils.trace import COMPARE, NOTE, SET, SWAP, Trace, default_keyframe_interval
+
+# Partitions below this size are simulated element by element; the NumPy
+# setup per call costs more than it saves there.
+SMALL_PARTITION = 32
+
+
+def _working_copy(arr: Sequence) -> np.ndarray:
+    a = np.array(arr)
+    if a.dtype.kind in "biu":
+        return a.astype(np.int64)
+    if a.dtype.kind != "f" and len(a):
+        raise TypeError("fast engines only handle int or float arrays")
+    return a.astype(np.float64)
+
+
+def _inversions(a: np.ndarray) -> int:
+    """Number of pairs i < j with a[i] > a[j] (the swaps of bubble sort)."""
+    return int(sum(np.count_nonzero(a[:j] > a[j]) for j in range(1, len(a))))
+
+
+def _grow(col: np.ndarray, capacity: int) -> np.ndarray:
+    out = np.empty(capacity, col.dtype)
+    out[:len(col)] = col
+    return out
+
+
+class _Events:
+    """Preallocated op columns, filled a block at a time.
+
+    ``infos`` lists ``(text, is_template)`` pairs; their positions are the
+    info ids written into ``info_ids``.
+    """
+
+    def __init__(self, initial: np.ndarray, infos: Sequence[Tuple[str, bool]], capacity: int,
+                 value_capacity: int = 0):
+        self.initial = initial.copy()
+        self.infos = [text for text, _ in infos]
+        self.templates = [k for k, (_, template) in enumerate(infos) if template]
+        self.kinds = np.empty(capacity, np.uint8)
+        self.first = np.empty(capacity, np.int32)
+        self.second = np.empty(capacity, np.int32)
+        self.info_ids = np.empty(capacity, np.uint16)
+        self.values = np.empty(value_capacity, initial.dtype)
+        self.size = 0
+        self.nvalues = 0
+        self.keyframe_interval = default_keyframe_interval(len(initial))
+        self.keyframes: Dict[int, np.ndarray] = {}
+        self._last_keyframe = -1
+        # first event of every outer pass, like the generators' "pass" flag
+        self.pass_starts: Sequence[int] = []
+
+    def block(self, count: int) -> slice:
+        """Reserve the next ``count`` events and return their slice."""
+        end = self.size + count
+        if end > len(self.kinds):
+            capacity = max(end, 2 * len(self.kinds))
+            for name in ("kinds", "first", "second", "info_ids"):
+                setattr(self, name, _grow(getattr(self, name), capacity))
+        span = slice(self.size, end)
+        self.size = end
+        return span
+
+    def add(self, kind: int, first: int, second: int, info: int) -> None:
+        k = self.block(1).start
+        self.kinds[k], self.first[k], self.second[k], self.info_ids[k] = kind, first, second, info
+
+    def store_values(self, values: np.ndarray) -> np.ndarray:
+        """Append SET values; returns their positions for the ``second`` column."""
+        end = self.nvalues + len(values)
+        if end > len(self.values):
+            self.values = _grow(self.values, max(end, 2 * len(self.values)))
+        self.values[self.nvalues:end] = values
+        positions = np.arange(self.nvalues, end, dtype=np.int32)
+        self.nvalues = end
+        return positions
+
+    def checkpoint(self, a: np.ndarray) -> None:
+        """Keyframe the state after the last event if one is due."""
+        last = self.size - 1
+        if last >= 0 and last - self._last_keyframe >= self.keyframe_interval:
+            self.keyframes[last] = a.copy()
+            self._last_keyframe = last
+
+    def to_trace(self, final: np.ndarray) -> Trace:
+        if not self.size:
+            # what record_trace gives for a generator that yields nothing
+            return Trace([])
+        if self.kinds[0] == COMPARE:
+            # Trace.record keeps the first frame's op as a note
+            self.kinds[0] = NOTE
+        self.keyframes[self.size - 1] = final.copy()
+        n = self.size
+        return Trace.from_columns(
+            self.initial, self.kinds[:n], self.first[:n], self.second[:n], self.info_ids[:n],
+            self.infos, self.templates, self.values[:self.nvalues], keyframes=self.keyframes,
+            pass_starts=self.pass_starts, keyframe_interval=self.keyframe_interval)
+
+
+def _interleave(counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """For steps emitting ``counts[s]`` (1 or 2) events each: step of every
+    event, and the event positions of the second events."""
+    step = np.repeat(np.arange(len(counts)), counts)
+    starts = np.cumsum(counts) - counts
+    return step, starts[counts == 2] + 1
+
+
+# -- bubble sort -------------------------------------------------------------
+
+_BUBBLE_INFOS = [("start", False), ("done", False), ("compare {i} and {j}", True), ("swapped {i} & {j}", True)]
+
+
+def fast_bubble_sort(arr: Sequence) -> Trace:
+    """Trace of :func:`algorithms.bubble_sort.bubble_sort`, one NumPy pass per pass."""
+    a = _working_copy(arr)
+    n = len(a)
+    ev = _Events(a, _BUBBLE_INFOS, n * (n - 1) // 2 + _inversions(a) + 2)
+    ev.add(NOTE, -1, -1, 0)
+    for i in range(n - 1):
+        m = n - i - 1
+        head = a[:m + 1]
+        # The element bubbling right at step j is the running maximum.
+        carry = np.maximum.accumulate(head)
+        swapped = carry[:-1] > head[1:]
+        step, second = _interleave(1 + swapped)
+        span = ev.block(len(step))
+        ev.pass_starts.append(span.start)
+        kinds = np.full(len(step), COMPARE, np.uint8)
+        kinds[second] = SWAP
+        ev.kinds[span] = kinds
+        ev.first[span] = step
+        ev.second[span] = step + 1
+        ev.info_ids[span] = kinds + 1
+        a[:m] = np.where(swapped, head[1:], carry[:-1])
+        a[m] = carry[-1]
+        ev.checkpoint(a)
+    ev.add(NOTE, -1, -1, 1)
+    return ev.to_trace(a)
+
+
+# -- insertion sort ----------------------------------------------------------
+
+_INSERTION_INFOS = [("start", False), ("done", False), ("take {i}", True), ("shift", False),
+                    ("placed at {i}", True)]
+
+
+def fast_insertion_sort(arr: Sequence) -> Trace:
+    """Trace of :func:`algorithms.insertion_sort.insertion_sort`.
+
+    Each insertion point is found by binary search and its shifts are
+    written as one block.
+    """
+    a = _working_copy(arr)
+    n = len(a)
+    shifts_total = _inversions(a)
+    ev = _Events(a, _INSERTION_INFOS, shifts_total + 2 * n, shifts_total + n)
+    ev.add(NOTE, -1, -1, 0)
+    for i in range(1, n):
+        key = a[i]
+        # the shifting stops at the first element <= key: bisect right
+        pos = int(np.searchsorted(a[:i], key, side="right"))
+        shifts = i - pos
+        ev.pass_starts.append(ev.size)
+        ev.add(NOTE, i, -1, 2)
+        span = ev.block(shifts + 1)
+        ev.kinds[span] = SET
+        ev.first[span] = np.arange(i, pos - 1, -1)
+        ev.second[span] = ev.store_values(np.append(a[pos:i][::-1], key))
+        ev.info_ids[span] = 3
+        ev.info_ids[span.stop - 1] = 4
+        a[pos + 1:i + 1] = a[pos:i].copy()
+        a[pos] = key
+        ev.checkpoint(a)
+    ev.add(NOTE, -1, -1, 1)
+    return ev.to_trace(a)
+
+
+# -- selection sort ----------------------------------------------------------
+
+_SELECTION_INFOS = [("start", False), ("done", False), ("compare {i} and {j}", True), ("new min {i}", True),
+                    ("swapped {i} & {j}", True)]
+
+
+def fast_selection_sort(arr: Sequence) -> Trace:
+    """Trace of :func:`algorithms.selection_sort.selection_sort`, one scan per pass."""
+    a = _working_copy(arr)
+    n = len(a)
+    ev = _Events(a, _SELECTION_INFOS, n * (n - 1) // 2 + 2 * n + 2)
+    ev.add(NOTE, -1, -1, 0)
+    for i in range(n - 1):
+        seg = a[i:]
+        # a new minimum is an element strictly below everything before it
+        is_min = np.empty(len(seg), bool)
+        is_min[0] = True
+        is_min[1:] = seg[1:] < np.minimum.accumulate(seg)[:-1]
+        offsets = np.arange(len(seg))
+        min_at = np.maximum.accumulate(np.where(is_min, offsets, 0))
+        step, second = _interleave(1 + is_min[1:])
+        j = step + 1
+        span = ev.block(len(step))
+        ev.pass_starts.append(span.start)
+        kinds = np.full(len(step), COMPARE, np.uint8)
+        kinds[second] = NOTE
+        ev.kinds[span] = kinds
+        first = i + min_at[j - 1]
+        first[second] = i + j[second]
+        ev.first[span] = first
+        col = i + j
+        col[second] = -1
+        ev.second[span] = col
+        ev.info_ids[span] = np.where(kinds == COMPARE, 2, 3)
+        min_idx = i + int(min_at[-1])
+        if min_idx != i:
+            ev.add(SWAP, i, min_idx, 4)
+            a[i], a[min_idx] = a[min_idx], a[i]
+        ev.checkpoint(a)
+    ev.add(NOTE, -1, -1, 1)
+    return ev.to_trace(a)
+
+
+# -- merge sort --------------------------------------------------------------
+
+_MERGE_INFOS = [("compare {i} and {j}", True), ("inserted {v} at {i}", True), ("merged {i}-{j}", True)]
+
+
+def _merge_nodes(n: int) -> np.ndarray:
+    """Rows ``(left, mid, right, depth)`` of every merge, in the order they run.
+
+    Built a depth at a time. The recursion runs a merge after every merge
+    inside its range, so merges run by right end, deepest first on ties.
+    """
+    levels = []
+    left, right = np.zeros(1, np.int64), np.full(1, n - 1, np.int64)
+    depth = 0
+    while len(left):
+        keep = left < right
+        left, right = left[keep], right[keep]
+        mid = (left + right) // 2
+        levels.append(np.stack([left, mid, right, np.full(len(left), depth)], axis=1))
+        left, right = np.concatenate([left, mid + 1]), np.concatenate([mid, right])
+        depth += 1
+    nodes = np.concatenate(levels) if levels else np.empty((0, 4), np.int64)
+    return nodes[np.lexsort((-nodes[:, 3], nodes[:, 2]))]
+
+
+def _merge_levels(a: np.ndarray, nodes: np.ndarray):
+    """Merge ``a`` in place one recursion depth at a time, deepest first.
+
+    Yields ``(rows, compares, ci, cj, pos, vals)`` per depth: the node rows,
+    compares per node, the compared index pairs and the written positions and
+    values, all grouped by node in row order.
+    """
+    # values as dense ranks: one stable argsort of node * ranks + rank merges a depth
+    ranks = np.unique(a, return_inverse=True)[1].reshape(-1)
+    span = int(ranks.max()) + 1 if len(ranks) else 1
+    for depth in range(int(nodes[:, 3].max()), -1, -1) if len(nodes) else ():
+        rows = np.flatnonzero(nodes[:, 3] == depth)
+        left, mid, right = nodes[rows, 0], nodes[rows, 1], nodes[rows, 2]
+        sizes = right - left + 1
+        starts = np.cumsum(sizes) - sizes
+        seg = np.repeat(np.arange(len(rows)), sizes)
+        t = np.arange(int(sizes.sum())) - starts[seg]
+        pos = left[seg] + t
+        # stable by value within each merge, left run first on ties
+        src = pos[np.argsort(seg * span + ranks[pos], kind="stable")]
+        from_left = src <= mid[seg]
+        last_left = np.maximum.reduceat(np.where(from_left, t, -1), starts)
+        last_right = np.maximum.reduceat(np.where(from_left, -1, t), starts)
+        # comparing stops once either run is used up
+        compares = np.minimum(last_left, last_right) + 1
+        taken = np.cumsum(from_left) - from_left
+        left_before = taken - taken[starts][seg]
+        compared = t < compares[seg]
+        ci = (left[seg] + left_before)[compared]
+        cj = (mid[seg] + 1 + t - left_before)[compared]
+        vals = a[src]
+        a[pos] = vals
+        ranks[pos] = ranks[src]
+        yield rows, compares, ci, cj, pos, vals
+
+
+def _set_keyframes(ev: _Events) -> None:
+    """Keyframes for a trace of compares, sets and notes only.
+
+    The state after frame ``k`` is the previous keyframe with the last write
+    to each index in between applied, so no frame needs replaying.
+    """
+    state = ev.initial.copy()
+    prev = 0
+    for stop in range(ev.keyframe_interval, ev.size, ev.keyframe_interval):
+        sets = np.flatnonzero(ev.kinds[prev:stop] == SET) + prev
+        if len(sets):
+            index = ev.first[sets][::-1]
+            index, last = np.unique(index, return_index=True)
+            state[index] = ev.values[ev.second[sets][::-1][last]]
+        ev.keyframes[stop - 1] = state.copy()
+        prev = stop
+
+
+def _merge_events(a: np.ndarray, nodes: np.ndarray) -> _Events:
+    """Run the merges in ``nodes`` on ``a`` in place and return their ops.
+
+    All merges of one recursion depth run as a single stable sort. A first
+    run only counts the compares of each merge, which fixes where its frames
+    go in the generator's depth-first order; a second run writes them there.
+    """
+    compares = np.zeros(len(nodes), np.int64)
+    for rows, counts, *_ in _merge_levels(a.copy(), nodes):
+        compares[rows] = counts
+    sizes = nodes[:, 2] - nodes[:, 0] + 1
+    events = compares + sizes + 1
+    offsets = np.cumsum(events) - events
+    value_offsets = np.cumsum(sizes) - sizes
+    ev = _Events(a, _MERGE_INFOS, int(events.sum()), int(sizes.sum()))
+    ev.block(len(ev.kinds))
+    ev.nvalues = len(ev.values)
+    # every merge compares at least once, so its first frame is a compare;
+    # the merges at the left end open each depth's pass
+    ev.pass_starts = offsets[nodes[:, 0] == 0]
+
+    for rows, counts, ci, cj, pos, vals in _merge_levels(a, nodes):
+        # compares of each merge come first ...
+        base = np.repeat(offsets[rows], counts)
+        at = base + np.arange(len(base)) - np.repeat(np.cumsum(counts) - counts, counts)
+        ev.kinds[at], ev.first[at], ev.second[at], ev.info_ids[at] = COMPARE, ci, cj, 0
+        # ... then one set per position ...
+        size = sizes[rows]
+        t = np.arange(len(pos)) - np.repeat(np.cumsum(size) - size, size)
+        at = np.repeat(offsets[rows] + counts, size) + t
+        slots = np.repeat(value_offsets[rows], size) + t
+        ev.values[slots] = vals
+        ev.kinds[at], ev.first[at], ev.second[at], ev.info_ids[at] = SET, pos, slots, 1
+        # ... and the "merged" note
+        at = offsets[rows] + counts + size
+        ev.kinds[at], ev.first[at], ev.second[at], ev.info_ids[at] = NOTE, nodes[rows, 0], nodes[rows, 2], 2
+    return ev
+
+
+def fast_merge_sort(arr: Sequence) -> Trace:
+    """Trace of :func:`algorithms.merge_sort.merge_sort`."""
+    a = _working_copy(arr)
+    ev = _merge_events(a, _merge_nodes(len(a)))
+    _set_keyframes(ev)
+    return ev.to_trace(a)
+
+
+# -- quick sort --------------------------------------------------------------
+
+_QUICK_INFOS = [("start", False), ("done", False), ("pivot {i} to {j}", True), ("compare {i} with pivot", True),
+                ("swapped {i} & {j}", True), ("pivot placed at {i}", True)]
+
+
+def _partition_small(a: np.ndarray, lo: int, hi: int, ev: _Events) -> int:
+    seg = a[lo:hi + 1].tolist()
+    pivot = seg[-1]
+    kinds, first, second, infos = [], [], [], []
+    i = 0
+    for j in range(len(seg) - 1):
+        kinds.append(COMPARE), first.append(lo + j), second.append(hi), infos.append(3)
+        if seg[j] < pivot:
+            if i != j:
+                seg[i], seg[j] = seg[j], seg[i]
+                kinds.append(SWAP), first.append(lo + i), second.append(lo + j), infos.append(4)
+            i += 1
+    if lo + i != hi:
+        seg[i], seg[-1] = seg[-1], seg[i]
+        kinds.append(SWAP), first.append(lo + i), second.append(hi), infos.append(4)
+    span = ev.block(len(kinds))
+    ev.kinds[span], ev.first[span], ev.second[span], ev.info_ids[span] = kinds, first, second, infos
+    a[lo:hi + 1] = seg
+    return lo + i
+
+
+def _partition(a: np.ndarray, lo: int, hi: int, ev: _Events) -> int:
+    """Lomuto partition of ``a[lo..hi]`` around ``a[hi]``; returns the pivot's index."""
+    seg = a[lo:hi]
+    pivot = a[hi]
+    less = seg < pivot
+    greater = ~less
+    # a smaller element is swapped back only once a larger one is in the way
+    ge_before = np.cumsum(greater) - greater
+    swapped = less & (ge_before > 0)
+    i_before = lo + np.cumsum(less) - less
+    step, second = _interleave(1 + swapped)
+    span = ev.block(len(step))
+    kinds = np.full(len(step), COMPARE, np.uint8)
+    kinds[second] = SWAP
+    ev.kinds[span] = kinds
+    first = lo + step
+    first[second] = i_before[swapped]
+    ev.first[span] = first
+    col = np.full(len(step), hi)
+    col[second] = lo + np.flatnonzero(swapped)
+    ev.second[span] = col
+    ev.info_ids[span] = kinds + 2
+
+    # The larger elements behave as a queue: each swap moves its front to
+    # the back. Follow every push back to the element it copies.
+    pushes = greater | swapped
+    push_at = np.cumsum(pushes) - pushes
+    source = np.empty(int(pushes.sum()), np.int64)
+    source[push_at[greater]] = push_at[greater]
+    source[push_at[swapped]] = np.arange(int(swapped.sum()))
+    while True:
+        nxt = source[source]
+        if np.array_equal(nxt, source):
+            break
+        source = nxt
+    pushed = np.empty(len(source), a.dtype)
+    pushed[push_at[greater]] = seg[greater]
+    queue = pushed[source[int(swapped.sum()):]]
+    smaller = seg[less]
+    p = lo + len(smaller)
+    a[lo:p] = smaller
+    if len(queue):
+        ev.add(SWAP, p, hi, 4)
+        a[p] = pivot
+        a[p + 1:hi] = queue[1:]
+        a[hi] = queue[0]
+    return p
+
+
+def fast_quick_sort(arr: Sequence, seed: Optional[int] = None) -> Trace:
+    """Trace of :func:`algorithms.quick_sort.quick_sort` with the same ``seed``.
+
+    Partitions run depth first from an explicit stack, drawing pivots from
+    the RNG in the generator's order.
+    """
+    a = _working_copy(arr)
+    n = len(a)
+    rng = random.Random(seed)
+    ev = _Events(a, _QUICK_INFOS, 4 * n * max(1, int(np.log2(n + 1))) + 2)
+    ev.add(NOTE, -1, -1, 0)
+    stack = [(0, n - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if lo >= hi:
+            continue
+        ev.pass_starts.append(ev.size)
+        p = rng.randint(lo, hi)
+        if p != hi:
+            a[p], a[hi] = a[hi], a[p]
+            ev.add(SWAP, p, hi, 2)
+        if hi - lo < SMALL_PARTITION:
+            i = _partition_small(a, lo, hi, ev)
+        else:
+            i = _partition(a, lo, hi, ev)
+        ev.add(NOTE, i, -1, 5)
+        ev.checkpoint(a)
+        stack.append((i + 1, hi))
+        stack.append((lo, i - 1))
+    ev.add(NOTE, -1, -1, 1)
+    return ev.to_trace(a)
+
+
+# -- parallel merge sort -----------------------------------------------------
+
+# Below this many elements the chunks are traced in this process; starting a
+# pool costs more than the work
+PARALLEL_MIN_SIZE = 50_000
+
+# per worker: its merge sort texts (ids as in _MERGE_INFOS), then its notes
+_WORKER_INFOS = _MERGE_INFOS + [("sorts {i}-{j}", True), ("merges {i}-{j}", True)]
+_SORTS, _MERGES = 3, 4
+
+
+def _worker_task(values: np.ndarray, lo: int, worker: int, mid: Optional[int] = None):
+    """Trace one worker's job on ``values`` (the slice starting at ``lo``).
+
+    With ``mid`` it merges the sorted runs ``values[:mid + 1]`` and
+    ``values[mid + 1:]``, otherwise it merge sorts ``values``. Returns the
+    sorted values and the job's op columns with absolute indices and this
+    worker's info ids, led by the note naming its range; SET ops point into
+    the returned values column.
+    """
+    a = np.array(values)
+    n = len(a)
+    nodes = _merge_nodes(n) if mid is None else np.array([[0, mid, n - 1, 0]], dtype=np.int64)
+    ev = _merge_events(a, nodes)
+    size = ev.size
+    kinds = np.empty(size + 1, np.uint8)
+    first = np.empty(size + 1, np.int32)
+    second = np.empty(size + 1, np.int32)
+    info_ids = np.empty(size + 1, np.uint16)
+    kinds[0], first[0], second[0] = NOTE, lo, lo + n - 1
+    info_ids[0] = _SORTS if mid is None else _MERGES
+    kinds[1:], info_ids[1:] = ev.kinds[:size], ev.info_ids[:size]
+    first[1:] = ev.first[:size] + lo
+    sets = ev.kinds[:size] == SET
+    second[1:] = np.where(sets, ev.second[:size], ev.second[:size] + lo)
+    info_ids += worker * len(_WORKER_INFOS)
+    passes = np.asarray(ev.pass_starts, np.int64) + 1
+    return a, (kinds, first, second, info_ids, ev.values[:ev.nvalues], passes)
+
+
+def _take_turns(out: np.ndarray, columns: Sequence[np.ndarray]) -> None:
+    """Write one column of concurrent jobs' ops into ``out`` as the jobs take turns.
+
+    Round ``t`` holds op ``t`` of every job that has one, in job order.
+    """
+    lengths = np.array([len(column) for column in columns])
+    jobs, full = len(columns), int(lengths.min())
+    # rounds in which every job still has an op fill a (rounds, jobs) block
+    block = out[:full * jobs].reshape(full, jobs)
+    for w, column in enumerate(columns):
+        block[:, w] = column[:full]
+    tail = lengths - full
+    if tail.any():
+        taken = np.arange(tail.max())[:, None] < tail
+        grid = np.zeros((jobs, len(taken)), out.dtype)
+        for w, column in enumerate(columns):
+            grid[w, :tail[w]] = column[full:]
+        out[full * jobs:] = grid.T[taken]
+
+
+def fast_parallel_merge_sort(arr: Sequence, workers: int = DEFAULT_WORKERS, executor: Optional[Executor] = None
+                             ) -> Trace:
+    """Trace of :func:`algorithms.parallel_merge_sort.parallel_merge_sort` with the same ``workers``.
+
+    Each chunk, and then each merge of a level of the merge tree, is traced
+    by a job in ``executor``, by default a process pool with one process per
+    chunk for inputs of ``PARALLEL_MIN_SIZE`` or more. Jobs send back their
+    sorted slice and op columns; the ops of one level are interleaved into
+    the order the generator yields them.
+    """
+    a = _working_copy(arr)
+    n = len(a)
+    if not n:
+        return Trace([])
+    initial = a.copy()
+    runs = chunk_bounds(n, workers)
+    chunks = len(runs)
+    levels = []
+    pool = executor
+    if pool is None and n >= PARALLEL_MIN_SIZE and chunks > 1:
+        pool = ProcessPoolExecutor(max_workers=chunks)
+    try:
+        jobs = [(lo, hi, w, None) for w, (lo, hi) in enumerate(runs)]
+        while jobs:
+            args = [(a[lo:hi + 1], lo, w, mid) for lo, hi, w, mid in jobs]
+            results = list(pool.map(_worker_task, *zip(*args)) if pool else (_worker_task(*job) for job in args))
+            for (lo, hi, _, _), (values, _) in zip(jobs, results):
+                a[lo:hi + 1] = values
+            levels.append([columns for _, columns in results])
+            if len(runs) == 1:
+                break
+            pairs = list(zip(runs[0::2], runs[1::2]))
+            jobs = [(left[0], right[1], p, left[1] - left[0]) for p, (left, right) in enumerate(pairs)]
+            runs = [(left[0], right[1]) for left, right in pairs] + runs[2 * len(pairs):]
+    finally:
+        if executor is None and pool is not None:
+            pool.shutdown()
+
+    infos = [(f"worker {w}: {text}", template) for w in range(chunks) for text, template in _WORKER_INFOS]
+    total = sum(len(job[0]) for level in levels for job in level)
+    nvalues = sum(len(job[4]) for level in levels for job in level)
+    ev = _Events(initial, infos, total, nvalues)
+    ev.block(total)
+    ev.nvalues = nvalues
+    passes = []
+    offset = value_offset = 0
+    for level in levels:
+        jobs = []
+        for kinds, first, second, info_ids, values, job_passes in level:
+            ev.values[value_offset:value_offset + len(values)] = values
+            jobs.append((kinds, first, np.where(kinds == SET, second + value_offset, second), info_ids))
+            value_offset += len(values)
+        lengths = np.array([len(job[0]) for job in jobs])
+        span = slice(offset, offset + int(lengths.sum()))
+        for k, name in enumerate(("kinds", "first", "second", "info_ids")):
+            _take_turns(getattr(ev, name)[span], [job[k] for job in jobs])
+        # op t of job w comes after rounds 0..t-1 and the earlier jobs of round t
+        active = np.zeros(int(lengths.max()), np.int64)
+        for length in lengths:
+            active[:length] += 1
+        round_starts = offset + np.cumsum(active) - active
+        for w, job_passes in enumerate(job[5] for job in level):
+            passes.append(round_starts[job_passes] + (lengths[:w, None] > job_passes).sum(axis=0))
+        offset = span.stop
+    ev.pass_starts = np.sort(np.concatenate(passes))
+    _set_keyframes(ev)
+    return ev.to_trace(a)
+
+
+FAST_ENGINES: Dict[str, Callable[..., Trace]] = {
+    "bubble_sort": fast_bubble_sort,
+    "insertion_sort": fast_insertion_sort,
+    "selection_sort": fast_selection_sort,
+    "merge_sort": fast_merge_sort,
+    "quick_sort": fast_quick_sort,
+    "parallel_merge_sort": fast_parallel_merge_sort,
+}
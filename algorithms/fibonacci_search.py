@@ -0,0 +1,53 @@
+"""Fibonacci Search (generator)
+
+Splits the range at Fibonacci numbers instead of halves: the probe sits
+``F(k-2)`` past the part already ruled out, and each comparison shrinks the
+range from ``F(k)`` to ``F(k-1)`` or ``F(k-2)``. It needs only additions and
+subtractions to find the next probe, at about 1.44 times binary search's
+probes in the worst case.
+"""
+from typing import List, Generator, Dict, Optional
+
+ALGORITHM = {
+    "name": "Fibonacci Search",
+    "input": "sorted_array",
+    "complexity": "O(log n)",
+    "renderer": "bars",
+}
+
+
+def fibonacci_search(arr: List[int], target: int) -> Generator[Dict, None, Optional[int]]:
+    a = arr
+    n = len(a)
+    yield {"state": a, "highlight": (0, n - 1), "info": "start", "op": None}
+    # smallest Fibonacci number fib >= n, with its two predecessors
+    fib2, fib1 = 0, 1
+    fib = fib1 + fib2
+    while fib < n:
+        fib2, fib1 = fib1, fib
+        fib = fib1 + fib2
+    # indices up to offset are known to hold values below the target
+    offset = -1
+    while fib > 1:
+        i = min(offset + fib2, n - 1)
+        yield {"state": a, "highlight": (i,), "info": f"check {i}", "op": ("compare", i)}
+        if a[i] == target:
+            yield {"state": a, "highlight": (i,), "info": "found", "op": None}
+            return i
+        elif a[i] < target:
+            fib, fib1 = fib1, fib2
+            fib2 = fib - fib1
+            offset = i
+            yield {"state": a, "highlight": (offset + 1, min(offset + fib, n - 1)), "info": "move right", "op": None}
+        else:
+            fib, fib1 = fib2, fib1 - fib2
+            fib2 = fib - fib1
+            yield {"state": a, "highlight": (offset + 1, i - 1), "info": "move left", "op": None}
+    if fib1 and offset + 1 < n:
+        i = offset + 1
+        yield {"state": a, "highlight": (i,), "info": f"check {i}", "op": ("compare", i)}
+        if a[i] == target:
+            yield {"state": a, "highlight": (i,), "info": "found", "op": None}
+            return i
+    yield {"state": a, "highlight": (), "info": "not found", "op": None}
+    return None
@@ -3,17 +3,25 @@
 from typing import List, Generator, Dict
 
 
+ALGORITHM = {
+    "name": "Insertion Sort",
+    "input": "array",
+    "complexity": "O(n²)",
+    "renderer": "bars",
+}
+
+
 def insertion_sort(arr: List[int]) -> Generator[Dict, None, None]:
     a = arr.copy()
-    yield {"state": a.copy(), "highlight": (), "info": "start"}
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
     for i in range(1, len(a)):
         key = a[i]
         j = i - 1
-        yield {"state": a.copy(), "highlight": (i,), "info": f"take {i}"}
+        yield {"state": a, "highlight": (i,), "info": f"take {i}", "op": None, "pass": True}
         while j >= 0 and a[j] > key:
             a[j + 1] = a[j]
+            yield {"state": a, "highlight": (j + 1,), "info": "shift", "op": ("set", j + 1, a[j])}
             j -= 1
-            yield {"state": a.copy(), "highlight": (j + 1,), "info": "shift"}
         a[j + 1] = key
-        yield {"state": a.copy(), "highlight": (j + 1,), "info": f"placed at {j+1}"}
-    yield {"state": a.copy(), "highlight": (), "info": "done"}
+        yield {"state": a, "highlight": (j + 1,), "info": f"placed at {j+1}", "op": ("set", j + 1, key)}
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
@@ -0,0 +1,42 @@
+"""Interpolation Search (generator)
+
+Like binary search, but instead of the middle it probes where the target
+would sit if the values in the range were evenly spaced. On uniformly
+distributed keys that takes about ``log2(log2(n))`` probes; on skewed keys
+it can degrade to one probe per element.
+"""
+from typing import List, Generator, Dict, Optional
+
+ALGORITHM = {
+    "name": "Interpolation Search",
+    "input": "sorted_array",
+    "complexity": "O(log log n) average, O(n) worst",
+    "renderer": "bars",
+}
+
+
+def interpolation_search(arr: List[int], target: int) -> Generator[Dict, None, Optional[int]]:
+    a = arr
+    lo, hi = 0, len(a) - 1
+    yield {"state": a, "highlight": (lo, hi), "info": "start", "op": None}
+    while lo <= hi and a[lo] <= target <= a[hi]:
+        pos = probe_position(int(a[lo]), int(a[hi]), lo, hi, target)
+        yield {"state": a, "highlight": (pos,), "info": f"check {pos}", "op": ("compare", pos)}
+        if a[pos] == target:
+            yield {"state": a, "highlight": (pos,), "info": "found", "op": None}
+            return pos
+        elif a[pos] < target:
+            lo = pos + 1
+            yield {"state": a, "highlight": (lo, hi), "info": "move right", "op": None}
+        else:
+            hi = pos - 1
+            yield {"state": a, "highlight": (lo, hi), "info": "move left", "op": None}
+    yield {"state": a, "highlight": (), "info": "not found", "op": None}
+    return None
+
+
+def probe_position(lo_value: int, hi_value: int, lo: int, hi: int, target) -> int:
+    """Index in ``lo..hi`` where ``target`` falls between the two end values."""
+    if hi_value == lo_value:
+        return lo
+    return lo + int((target - lo_value) * (hi - lo) // (hi_value - lo_value))
@@ -0,0 +1,126 @@
+"""Introsort (generator)
+
+Quick sort that cannot go quadratic: ranges are partitioned (Lomuto) around
+the median of three randomly picked elements, but a range still being
+split more than ``2·log2(n)`` levels deep is heap sorted instead, and
+ranges of ``SMALL_RANGE`` elements or fewer are finished by insertion sort.
+Pass ``seed`` for reproducible runs. O(n log n) worst case.
+
+Subranges wait on an explicit stack; frames carry the ``range`` being
+worked on and its ``depth``.
+"""
+import random
+from typing import List, Generator, Dict, Optional, Tuple
+
+ALGORITHM = {
+    "name": "Introsort",
+    "input": "array",
+    "complexity": "O(n log n)",
+    "renderer": "bars",
+}
+
+# Ranges this short are insertion sorted
+SMALL_RANGE = 16
+
+
+def introsort(arr: List[int], seed: Optional[int] = None,
+              depth_limit: Optional[int] = None) -> Generator[Dict, None, None]:
+    a = arr.copy()
+    rng = random.Random(seed)
+    if depth_limit is None:
+        depth_limit = 2 * max(len(a), 1).bit_length()
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    stack = [(0, len(a) - 1, 1)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if lo >= hi:
+            continue
+        span = (lo, hi)
+        if hi - lo < SMALL_RANGE:
+            yield from _insertion_sort(a, lo, hi, depth)
+            continue
+        if depth > depth_limit:
+            yield from _heap_sort(a, lo, hi, depth)
+            continue
+        picks = sorted((rng.randint(lo, hi) for _ in range(3)), key=a.__getitem__)
+        p = picks[1]
+        if p != hi:
+            a[p], a[hi] = a[hi], a[p]
+            yield {"state": a, "highlight": (p, hi), "info": f"pivot {p} to {hi}", "op": ("swap", p, hi),
+                   "pass": True, "range": span, "depth": depth}
+        pivot = a[hi]
+        i = lo
+        for j in range(lo, hi):
+            yield {"state": a, "highlight": (i, j, hi), "info": f"compare {j} with pivot", "op": ("compare", j, hi),
+                   "pass": j == lo and p == hi, "range": span, "depth": depth}
+            if a[j] < pivot:
+                if i != j:
+                    a[i], a[j] = a[j], a[i]
+                    yield {"state": a, "highlight": (i, j, hi), "info": f"swapped {i} & {j}", "op": ("swap", i, j),
+                           "range": span, "depth": depth}
+                i += 1
+        if i != hi:
+            a[i], a[hi] = a[hi], a[i]
+            yield {"state": a, "highlight": (i, hi), "info": f"swapped {i} & {hi}", "op": ("swap", i, hi),
+                   "range": span, "depth": depth}
+        yield {"state": a, "highlight": (i,), "info": f"pivot placed at {i}", "op": None,
+               "range": span, "depth": depth}
+        stack.append((i + 1, hi, depth + 1))
+        stack.append((lo, i - 1, depth + 1))
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
+
+
+def _insertion_sort(a: List[int], lo: int, hi: int, depth: int) -> Generator[Dict, None, None]:
+    span = (lo, hi)
+    for k in range(lo + 1, hi + 1):
+        j = k
+        while j > lo:
+            yield {"state": a, "highlight": (j - 1, j), "info": f"compare {j - 1} and {j}",
+                   "op": ("compare", j - 1, j), "pass": k == lo + 1 and j == k, "range": span, "depth": depth}
+            if a[j - 1] <= a[j]:
+                break
+            a[j - 1], a[j] = a[j], a[j - 1]
+            yield {"state": a, "highlight": (j - 1, j), "info": f"swapped {j - 1} & {j}",
+                   "op": ("swap", j - 1, j), "range": span, "depth": depth}
+            j -= 1
+
+
+def _heap_sort(a: List[int], lo: int, hi: int, depth: int) -> Generator[Dict, None, None]:
+    """Heap sort ``a[lo..hi]`` in place: a max-heap rooted at ``lo``."""
+    span = (lo, hi)
+    size = hi - lo + 1
+    first = [True]
+
+    def sift(root: int, end: int) -> Generator[Dict, None, None]:
+        # children of heap node k (offset from lo) are 2k+1 and 2k+2
+        while True:
+            child = 2 * (root - lo) + 1 + lo
+            if child > end:
+                return
+            if child < end:
+                yield _frame(a, (child, child + 1), f"compare {child} and {child + 1}", ("compare", child, child + 1),
+                             span, depth, first)
+                if a[child] < a[child + 1]:
+                    child += 1
+            yield _frame(a, (root, child), f"compare {root} and {child}", ("compare", root, child),
+                         span, depth, first)
+            if a[root] >= a[child]:
+                return
+            a[root], a[child] = a[child], a[root]
+            yield _frame(a, (root, child), f"swapped {root} & {child}", ("swap", root, child), span, depth, first)
+            root = child
+
+    for root in range(lo + size // 2 - 1, lo - 1, -1):
+        yield from sift(root, hi)
+    for end in range(hi, lo, -1):
+        a[lo], a[end] = a[end], a[lo]
+        yield _frame(a, (lo, end), f"max to {end}", ("swap", lo, end), span, depth, first)
+        yield from sift(lo, end - 1)
+
+
+def _frame(a: List[int], highlight: Tuple, info: str, op: Tuple, span: Tuple[int, int], depth: int,
+           first: List[bool]) -> Dict:
+    frame = {"state": a, "highlight": highlight, "info": f"heap: {info}", "op": op, "pass": first[0],
+             "range": span, "depth": depth}
+    first[0] = False
+    return frame
@@ -0,0 +1,135 @@
+"""Jump point search generator for 4-connected grids with unit costs.
+
+A* over "jump points" only: from each expanded cell the search slides in a
+straight line until it hits the goal or a cell where a side opening appears
+next to a wall (a forced neighbour), and only those cells enter the heap.
+Vertical slides also probe sideways at every step, since on a 4-connected
+grid a shortest path may turn anywhere along them. The cells in between are
+never queued, which is where the savings over A* come from on open maps.
+
+Same grid and frame protocol as ``bfs_pathfinding``; ``visited`` and
+``frontier`` hold jump points, and the final path is filled back in cell by
+cell between them.
+"""
+from array import array
+from heapq import heappop, heappush
+from typing import Dict, Generator, List, Optional, Tuple
+
+from utils.grid import flat_walls, parent_array, rebuild_path, search_stats, to_index
+
+
+ALGORITHM = {
+    "name": "Jump Point Search",
+    "input": "grid",
+    "complexity": "O((V + E) log V)",
+    "renderer": "grid",
+}
+
+
+def _jump_row(walls: bytearray, cols: int, i: int, step: int, goal: int) -> int:
+    """Next jump point from ``i`` moving ``step`` (±1) along its row, or -1."""
+    size = len(walls)
+    c = i % cols
+    while True:
+        c += step
+        if c < 0 or c >= cols:
+            return -1
+        i += step
+        if walls[i]:
+            return -1
+        if i == goal:
+            return i
+        # an opening above or below where the previous cell had a wall
+        up, down = i - cols, i + cols
+        if (up >= 0 and not walls[up] and walls[up - step]) or \
+                (down < size and not walls[down] and walls[down - step]):
+            return i
+
+
+def _jump_col(walls: bytearray, cols: int, i: int, step: int, goal: int) -> int:
+    """Next jump point from ``i`` moving ``step`` (±cols) along its column, or -1."""
+    size = len(walls)
+    c = i % cols
+    while True:
+        i += step
+        if i < 0 or i >= size or walls[i]:
+            return -1
+        if i == goal:
+            return i
+        if (c > 0 and not walls[i - 1] and walls[i - 1 - step]) or \
+                (c < cols - 1 and not walls[i + 1] and walls[i + 1 - step]):
+            return i
+        if _jump_row(walls, cols, i, 1, goal) >= 0 or _jump_row(walls, cols, i, -1, goal) >= 0:
+            return i
+
+
+def _fill_path(jumps: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Every cell along the straight segments between consecutive jump points."""
+    path = jumps[:1]
+    for (r0, c0), (r1, c1) in zip(jumps, jumps[1:]):
+        dr, dc = (r1 > r0) - (r1 < r0), (c1 > c0) - (c1 < c0)
+        r, c = r0, c0
+        while (r, c) != (r1, c1):
+            r, c = r + dr, c + dc
+            path.append((r, c))
+    return path
+
+
+@search_stats
+def jump_point_search(grid: List[List[int]], start: Tuple[int, int],
+                      goal: Tuple[int, int]) -> Generator[Dict, None, Optional[List[Tuple[int, int]]]]:
+    rows, cols, walls = flat_walls(grid)
+    # expanded jump points; walls stay separate for the slides
+    done = bytearray(walls)
+    parent = parent_array(rows * cols)
+    dist = array("q", [-1]) * (rows * cols)
+    s, g = to_index(start, cols), to_index(goal, cols)
+    gr, gc = goal
+
+    def h(j: int) -> int:
+        r, c = divmod(j, cols)
+        return abs(r - gr) + abs(c - gc)
+
+    dist[s] = 0
+    heap = [(h(s), h(s), s)]
+    yield {"state": grid, "highlight": [tuple(start)], "info": "start", "visited": (), "frontier": (s,)}
+    while heap:
+        _, _, i = heappop(heap)
+        if done[i]:
+            continue
+        done[i] = 1
+        r, c = divmod(i, cols)
+        if i == g:
+            yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": ()}
+            path = _fill_path(rebuild_path(parent, g, cols))
+            yield {"state": grid, "highlight": path, "info": "goal", "visited": (), "frontier": (), "path": path}
+            return path
+        p = parent[i]
+        # (step, along the row?)
+        if p < 0:
+            moves = ((cols, False), (-cols, False), (1, True), (-1, True))
+        elif p // cols == r:
+            # moving along the row: straight on, or turn up or down
+            moves = ((cols, False), (-cols, False), (1 if p < i else -1, True))
+        else:
+            moves = ((cols if p < i else -cols, False), (1, True), (-1, True))
+        found = []
+        for step, along_row in moves:
+            if along_row:
+                j = _jump_row(walls, cols, i, step, g)
+            else:
+                j = _jump_col(walls, cols, i, step, g)
+            if j < 0 or done[j]:
+                continue
+            jr, jc = divmod(j, cols)
+            nd = dist[i] + abs(jr - r) + abs(jc - c)
+            if dist[j] < 0 or nd < dist[j]:
+                if dist[j] < 0:
+                    found.append(j)
+                dist[j] = nd
+                parent[j] = i
+                hj = h(j)
+                heappush(heap, (nd + hj, hj, j))
+        yield {"state": grid, "highlight": [(r, c)], "info": f"visit {r},{c}", "visited": (i,), "frontier": tuple(found)}
+    yield {"state": grid, "highlight": [], "info": "not found", "visited": (), "frontier": ()}
+    return None
@@ -1,30 +1,46 @@
 """Merge Sort (generator)
+
+Frames share the working list as ``state``; merged values are reported as
+``("set", index, value)`` ops. The first merge of each level of the merge
+tree (the one at the left end) marks its first compare as a ``pass``, so a
+run has about ``log2(n)`` passes.
 """
 from typing import List, Generator, Dict
 
 
+ALGORITHM = {
+    "name": "Merge Sort",
+    "input": "array",
+    "complexity": "O(n log n)",
+    "renderer": "bars",
+}
+
+
 def merge_sort(arr: List[int]) -> Generator[Dict, None, None]:
     a = arr.copy()
     yield from _merge_sort(a, 0, len(a) - 1)
 
 
-def _merge_sort(a: List[int], left: int, right: int) -> Generator[Dict, None, None]:
+def _merge_sort(a: List[int], left: int, right: int, first: bool = True) -> Generator[Dict, None, None]:
+    # ``first``: this range starts at the left end of its level, so its
+    # merge is the first of that level to run
     if left >= right:
         return
 
     mid = (left + right) // 2
-    yield from _merge_sort(a, left, mid)
-    yield from _merge_sort(a, mid + 1, right)
-    yield from _merge(a, left, mid, right)
-    yield {"state": a.copy(), "highlight": (), "info": f"merged {left}-{right}"}
+    yield from _merge_sort(a, left, mid, first)
+    yield from _merge_sort(a, mid + 1, right, False)
+    yield from _merge(a, left, mid, right, first)
+    yield {"state": a, "highlight": (left, right), "info": f"merged {left}-{right}", "op": None}
 
 
-def _merge(a: List[int], left: int, mid: int, right: int) -> Generator[Dict, None, None]:
+def _merge(a: List[int], left: int, mid: int, right: int, first: bool = True) -> Generator[Dict, None, None]:
     merged = []
     i, j = left, mid + 1
 
     while i <= mid and j <= right:
-        yield {"state": a.copy(), "highlight": (i, j), "info": f"compare {i} and {j}"}
+        yield {"state": a, "highlight": (i, j), "info": f"compare {i} and {j}", "op": ("compare", i, j),
+               "pass": first and i == left and j == mid + 1}
         if a[i] <= a[j]:
             merged.append(a[i])
             i += 1
@@ -42,4 +58,4 @@ def _merge(a: List[int], left: int, mid: int, right: int) -> Generator[Dict, Non
 
     for idx, val in enumerate(merged):
         a[left + idx] = val
-        yield {"state": a.copy(), "highlight": (left + idx,), "info": f"inserted {val} at {left + idx}"}
+        yield {"state": a, "highlight": (left + idx,), "info": f"inserted {val} at {left + idx}", "op": ("set", left + idx, val)}
@@ -0,0 +1,71 @@
+"""Parallel Merge Sort (generator)
+
+A teaching view of parallel sorting. The input is cut into ``workers``
+chunks of (nearly) equal size and every worker merge sorts its own chunk;
+then the sorted runs are merged pairwise, a tree of merges in which the
+``p``-th pair of a level goes to worker ``p``, until one run is left.
+
+Workers that run at the same time take turns, one frame each, as they would
+tick on a shared clock; each frame's info says which worker made it
+(``"worker 2: compare 5 and 6"``) and every chunk or merge opens with a note
+naming the range it covers. Frames share the working list as ``state``.
+
+``FAST_ENGINES["parallel_merge_sort"]`` in ``algorithms.fast_trace`` builds
+the same trace with the chunks and merges really running in a process pool.
+"""
+from typing import List, Generator, Dict, Iterable, Tuple
+
+from algorithms.merge_sort import _merge, _merge_sort
+
+ALGORITHM = {
+    "name": "Parallel Merge Sort",
+    "input": "array",
+    "complexity": "O(n log n)",
+    "renderer": "bars",
+}
+
+DEFAULT_WORKERS = 4
+
+
+def chunk_bounds(n: int, workers: int = DEFAULT_WORKERS) -> List[Tuple[int, int]]:
+    """Inclusive ``(lo, hi)`` of every chunk; at most ``workers``, none empty."""
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    k = min(workers, n)
+    return [(w * n // k, (w + 1) * n // k - 1) for w in range(k)]
+
+
+def parallel_merge_sort(arr: List[int], workers: int = DEFAULT_WORKERS) -> Generator[Dict, None, None]:
+    a = arr.copy()
+    runs = chunk_bounds(len(a), workers)
+    yield from _round_robin(_sorter(a, w, lo, hi) for w, (lo, hi) in enumerate(runs))
+    while len(runs) > 1:
+        pairs = list(zip(runs[0::2], runs[1::2]))
+        yield from _round_robin(_merger(a, p, left[0], left[1], right[1]) for p, (left, right) in enumerate(pairs))
+        runs = [(left[0], right[1]) for left, right in pairs] + runs[2 * len(pairs):]
+
+
+def _sorter(a: List[int], worker: int, lo: int, hi: int) -> Generator[Dict, None, None]:
+    yield {"state": a, "highlight": (lo, hi), "info": f"worker {worker}: sorts {lo}-{hi}", "op": None}
+    for frame in _merge_sort(a, lo, hi):
+        frame["info"] = f"worker {worker}: {frame['info']}"
+        yield frame
+
+
+def _merger(a: List[int], worker: int, lo: int, mid: int, hi: int) -> Generator[Dict, None, None]:
+    yield {"state": a, "highlight": (lo, hi), "info": f"worker {worker}: merges {lo}-{hi}", "op": None}
+    for frame in _merge(a, lo, mid, hi):
+        frame["info"] = f"worker {worker}: {frame['info']}"
+        yield frame
+    yield {"state": a, "highlight": (lo, hi), "info": f"worker {worker}: merged {lo}-{hi}", "op": None}
+
+
+def _round_robin(gens: Iterable[Generator[Dict, None, None]]) -> Generator[Dict, None, None]:
+    """One frame from each generator in turn, dropping those that finish."""
+    active = list(gens)
+    while active:
+        for gen in list(active):
+            try:
+                yield next(gen)
+            except StopIteration:
+                active.remove(gen)
@@ -0,0 +1,57 @@
+"""Quick Sort (generator)
+
+Lomuto partition around a random pivot. Pass ``seed`` for reproducible runs.
+Average O(n log n), worst case O(n²).
+
+Subranges wait on an explicit stack rather than in nested generators, so
+sorted inputs (n partitions deep) neither hit the recursion limit nor pay
+for a ``yield from`` chain on every frame. Partition frames carry the
+``range`` being partitioned and its ``depth``.
+"""
+import random
+from typing import List, Generator, Dict, Optional
+
+ALGORITHM = {
+    "name": "Quick Sort",
+    "input": "array",
+    "complexity": "O(n log n) average, O(n²) worst",
+    "renderer": "bars",
+}
+
+
+def quick_sort(arr: List[int], seed: Optional[int] = None) -> Generator[Dict, None, None]:
+    a = arr.copy()
+    rng = random.Random(seed)
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    stack = [(0, len(a) - 1, 1)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if lo >= hi:
+            continue
+        span = (lo, hi)
+        p = rng.randint(lo, hi)
+        if p != hi:
+            a[p], a[hi] = a[hi], a[p]
+            yield {"state": a, "highlight": (p, hi), "info": f"pivot {p} to {hi}", "op": ("swap", p, hi),
+                   "pass": True, "range": span, "depth": depth}
+        pivot = a[hi]
+        i = lo
+        for j in range(lo, hi):
+            yield {"state": a, "highlight": (j, hi), "info": f"compare {j} with pivot", "op": ("compare", j, hi),
+                   "pass": j == lo and p == hi, "range": span, "depth": depth}
+            if a[j] < pivot:
+                if i != j:
+                    a[i], a[j] = a[j], a[i]
+                    yield {"state": a, "highlight": (i, j), "info": f"swapped {i} & {j}", "op": ("swap", i, j),
+                           "range": span, "depth": depth}
+                i += 1
+        if i != hi:
+            a[i], a[hi] = a[hi], a[i]
+            yield {"state": a, "highlight": (i, hi), "info": f"swapped {i} & {hi}", "op": ("swap", i, hi),
+                   "range": span, "depth": depth}
+        yield {"state": a, "highlight": (i,), "info": f"pivot placed at {i}", "op": None,
+               "range": span, "depth": depth}
+        # left side first, as the recursive version did
+        stack.append((i + 1, hi, depth + 1))
+        stack.append((lo, i - 1, depth + 1))
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
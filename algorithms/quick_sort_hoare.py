@@ -0,0 +1,73 @@
+"""Quick Sort with Hoare partitioning (generator)
+
+The pivot, picked at random and moved to the front of its range, stays
+there while two pointers close in from both ends; the left one stops at
+values not below the pivot, the right one at values not above it, and the
+two are swapped. Stopping on equal values keeps partitions balanced when
+there are many duplicates. Pass ``seed`` for reproducible runs.
+Average O(n log n), worst case O(n²).
+
+Subranges wait on an explicit stack; frames highlight ``(left, right,
+pivot)`` and carry the ``range`` being partitioned and its ``depth``.
+"""
+import random
+from typing import List, Generator, Dict, Optional
+
+ALGORITHM = {
+    "name": "Quick Sort (Hoare)",
+    "input": "array",
+    "complexity": "O(n log n) average, O(n²) worst",
+    "renderer": "bars",
+}
+
+
+def quick_sort_hoare(arr: List[int], seed: Optional[int] = None) -> Generator[Dict, None, None]:
+    a = arr.copy()
+    rng = random.Random(seed)
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    stack = [(0, len(a) - 1, 1)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if lo >= hi:
+            continue
+        span = (lo, hi)
+        p = rng.randint(lo, hi)
+        if p != lo:
+            a[p], a[lo] = a[lo], a[p]
+            yield {"state": a, "highlight": (p, lo), "info": f"pivot {p} to {lo}", "op": ("swap", p, lo),
+                   "pass": True, "range": span, "depth": depth}
+        pivot = a[lo]
+        left, right = lo + 1, hi
+        first = p == lo
+        while left <= right:
+            while left <= right:
+                yield {"state": a, "highlight": (left, right, lo), "info": f"compare {left} with pivot",
+                       "op": ("compare", left, lo), "pass": first, "range": span, "depth": depth}
+                first = False
+                if a[left] >= pivot:
+                    break
+                left += 1
+            while left <= right:
+                yield {"state": a, "highlight": (left, right, lo), "info": f"compare {right} with pivot",
+                       "op": ("compare", right, lo), "pass": first, "range": span, "depth": depth}
+                first = False
+                if a[right] <= pivot:
+                    break
+                right -= 1
+            if left <= right:
+                if left != right:
+                    a[left], a[right] = a[right], a[left]
+                    yield {"state": a, "highlight": (left, right, lo), "info": f"swapped {left} & {right}",
+                           "op": ("swap", left, right), "range": span, "depth": depth}
+                left += 1
+                right -= 1
+        # everything after ``right`` is >= pivot, so the pivot belongs there
+        if right != lo:
+            a[lo], a[right] = a[right], a[lo]
+            yield {"state": a, "highlight": (lo, right), "info": f"swapped {lo} & {right}",
+                   "op": ("swap", lo, right), "range": span, "depth": depth}
+        yield {"state": a, "highlight": (right,), "info": f"pivot placed at {right}", "op": None,
+               "range": span, "depth": depth}
+        stack.append((right + 1, hi, depth + 1))
+        stack.append((lo, right - 1, depth + 1))
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
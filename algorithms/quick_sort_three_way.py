@@ -0,0 +1,63 @@
+"""Three-way Quick Sort (generator)
+
+Dijkstra's "Dutch national flag" partition: one pass splits a range into
+values below, equal to and above a random pivot, and only the outer two
+parts are sorted further, so inputs with few distinct values take
+O(n log k) instead of degrading towards O(n²). Pass ``seed`` for
+reproducible runs.
+
+While partitioning, ``a[lo:lt]`` is below the pivot, ``a[lt:i]`` equal to
+it (so ``a[lt]`` holds the pivot value) and ``a[gt+1:hi+1]`` above it.
+Frames highlight ``(lt, i, gt)`` and carry the ``range`` being
+partitioned and its ``depth``; subranges wait on an explicit stack.
+"""
+import random
+from typing import List, Generator, Dict, Optional
+
+ALGORITHM = {
+    "name": "Quick Sort (3-way)",
+    "input": "array",
+    "complexity": "O(n log n) average, O(n²) worst",
+    "renderer": "bars",
+}
+
+
+def quick_sort_three_way(arr: List[int], seed: Optional[int] = None) -> Generator[Dict, None, None]:
+    a = arr.copy()
+    rng = random.Random(seed)
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    stack = [(0, len(a) - 1, 1)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        if lo >= hi:
+            continue
+        span = (lo, hi)
+        p = rng.randint(lo, hi)
+        if p != lo:
+            a[p], a[lo] = a[lo], a[p]
+            yield {"state": a, "highlight": (p, lo), "info": f"pivot {p} to {lo}", "op": ("swap", p, lo),
+                   "pass": True, "range": span, "depth": depth}
+        pivot = a[lo]
+        lt, i, gt = lo, lo + 1, hi
+        while i <= gt:
+            yield {"state": a, "highlight": (lt, i, gt), "info": f"compare {i} with pivot",
+                   "op": ("compare", i, lt), "pass": i == lo + 1 and p == lo, "range": span, "depth": depth}
+            if a[i] < pivot:
+                a[lt], a[i] = a[i], a[lt]
+                yield {"state": a, "highlight": (lt, i, gt), "info": f"swapped {lt} & {i}",
+                       "op": ("swap", lt, i), "range": span, "depth": depth}
+                lt += 1
+                i += 1
+            elif a[i] > pivot:
+                if i != gt:
+                    a[i], a[gt] = a[gt], a[i]
+                    yield {"state": a, "highlight": (lt, i, gt), "info": f"swapped {i} & {gt}",
+                           "op": ("swap", i, gt), "range": span, "depth": depth}
+                gt -= 1
+            else:
+                i += 1
+        yield {"state": a, "highlight": (lt, gt), "info": f"pivot placed at {lt}..{gt}", "op": None,
+               "range": span, "depth": depth}
+        stack.append((gt + 1, hi, depth + 1))
+        stack.append((lo, lt - 1, depth + 1))
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
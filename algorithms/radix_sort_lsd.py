@@ -0,0 +1,46 @@
+"""LSD Radix Sort (generator)
+
+Sorts by one digit at a time, least significant first, with a stable
+counting pass per digit (see ``algorithms.counting_sort``): after the pass
+on digit ``p`` the values are in order of their last ``p + 1`` digits.
+``d`` passes of O(n + base) for keys of ``d`` digits. Digits are those of
+the values minus the smallest one, so negative numbers work.
+
+Each pass computes its digits and counts with NumPy. Large inputs get one
+frame per pass; inputs of up to ``DETAIL_LIMIT`` values (or any input with
+``detail=True``) also get a frame per value placed and per slot written.
+"""
+from typing import List, Generator, Dict, Optional
+
+import numpy as np
+
+from algorithms.counting_sort import _counting_pass, _int_values, _offset_keys, _wants_detail
+
+ALGORITHM = {
+    "name": "Radix Sort (LSD)",
+    "input": "array",
+    "complexity": "O(d·(n + b))",
+    "renderer": "bars",
+}
+
+
+def radix_sort_lsd(arr: List[int], base: int = 10, detail: Optional[bool] = None) -> Generator[Dict, None, None]:
+    if base < 2:
+        raise ValueError("base must be at least 2")
+    a = arr.copy()
+    values = _int_values(a, "radix sort")
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    if len(values) > 1:
+        detail = _wants_detail(detail, len(values))
+        keys = _offset_keys(values)
+        top = int(keys.max())
+        place, p = 1, 0
+        while True:
+            digits = (keys // np.uint64(place) % np.uint64(base)).astype(np.int64)
+            order = yield from _counting_pass(a, values, digits, base, detail, f"digit {p} (place {place:,})")
+            keys = keys[order]
+            if top // place < base:
+                break
+            place *= base
+            p += 1
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
@@ -0,0 +1,65 @@
+"""MSD Radix Sort (generator)
+
+Sorts by the most significant digit first: a counting pass splits the
+values into ``base`` buckets by that digit, then every bucket holding more
+than one value is split by the next digit, and so on. Buckets of one value
+are finished and take no further passes, so inputs whose values differ
+early in their digits stop after a few levels. Digits are those of the
+values minus the smallest one, so negative numbers work.
+
+Buckets are split a level at a time across the whole array (breadth
+first): one counting pass (see ``algorithms.counting_sort``), keyed by
+bucket and digit, covers every open bucket of a level. Frames carry the
+level as ``depth``. Large inputs get one frame per level; inputs of up to
+``DETAIL_LIMIT`` values (or any input with ``detail=True``) also get a
+frame per value placed and per slot written.
+"""
+from typing import List, Generator, Dict, Optional
+
+import numpy as np
+
+from algorithms.counting_sort import _counting_pass, _int_values, _offset_keys, _wants_detail
+
+ALGORITHM = {
+    "name": "Radix Sort (MSD)",
+    "input": "array",
+    "complexity": "O(d·(n + b))",
+    "renderer": "bars",
+}
+
+
+def radix_sort_msd(arr: List[int], base: int = 10, detail: Optional[bool] = None) -> Generator[Dict, None, None]:
+    if base < 2:
+        raise ValueError("base must be at least 2")
+    a = arr.copy()
+    values = _int_values(a, "radix sort")
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
+    if len(values) > 1:
+        detail = _wants_detail(detail, len(values))
+        keys = _offset_keys(values)
+        top = int(keys.max())
+        place = 1
+        while top // place >= base:
+            place *= base
+        # positions still being sorted, in order, and the bucket each belongs to
+        at = np.arange(len(values))
+        bucket = np.zeros(len(values), np.int64)
+        open_buckets, depth = 1, 1
+        while at.size and place:
+            digits = (keys[at] // np.uint64(place) % np.uint64(base)).astype(np.int64)
+            split = bucket * base + digits
+            size = open_buckets * base
+            order = yield from _counting_pass(a, values, split, size, detail,
+                                              f"place {place:,}, open buckets: {open_buckets:,}",
+                                              at, {"depth": depth})
+            keys[at] = keys[at[order]]
+            # the new buckets lie in key order; keep those with more than one value
+            sizes = np.bincount(split, minlength=size)
+            sizes = sizes[sizes > 0]
+            at = at[np.repeat(sizes > 1, sizes)]
+            sizes = sizes[sizes > 1]
+            open_buckets = len(sizes)
+            bucket = np.repeat(np.arange(open_buckets), sizes)
+            place //= base
+            depth += 1
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
@@ -0,0 +1,145 @@
+"""Algorithm registry with lazy imports.
+
+Each algorithm module declares its metadata as a plain dict literal::
+
+    ALGORITHM = {
+        "name": "Bubble Sort",
+        "input": "array",          # "array", "sorted_array" (+ target) or "grid"
+        "complexity": "O(n²)",
+        "renderer": "bars",        # "bars" or "grid"
+    }
+
+The registry reads that dict straight from the source with ``ast`` instead of
+importing the module, so listing algorithms stays cheap however many there
+are; a module is only imported when its generator is actually requested.
+
+Besides the modules in this package, other distributions can contribute
+algorithms through the ``algo_visualizer.algorithms`` entry point group, e.g.
+``heap_sort = "my_pkg.heap_sort:heap_sort"``; their modules declare the same
+``ALGORITHM`` dict.
+"""
+import ast
+import importlib
+import importlib.util
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+ENTRY_POINT_GROUP = "algo_visualizer.algorithms"
+METADATA_NAME = "ALGORITHM"
+INPUT_KINDS = ("array", "sorted_array", "grid")
+
+
+@dataclass(frozen=True)
+class AlgorithmSpec:
+    """Metadata for one algorithm; ``load()`` imports its generator."""
+
+    key: str
+    name: str
+    module: str
+    function: str
+    input_kind: str = "array"
+    complexity: str = ""
+    renderer: str = "bars"
+
+    def load(self) -> Callable:
+        return getattr(importlib.import_module(self.module), self.function)
+
+
+def read_metadata(path: str) -> Optional[Dict]:
+    """Return the module-level ``ALGORITHM`` dict of a source file, or None."""
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), filename=path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == METADATA_NAME for t in node.targets):
+            return ast.literal_eval(node.value)
+    return None
+
+
+def _spec(key: str, module: str, function: str, meta: Dict) -> AlgorithmSpec:
+    input_kind = meta.get("input", "array")
+    if input_kind not in INPUT_KINDS:
+        raise ValueError(f"{module}: unknown input kind {input_kind!r}")
+    return AlgorithmSpec(
+        key=key,
+        name=meta.get("name", key.replace("_", " ").title()),
+        module=module,
+        function=meta.get("function", function),
+        input_kind=input_kind,
+        complexity=meta.get("complexity", ""),
+        renderer=meta.get("renderer", "grid" if input_kind == "grid" else "bars"),
+    )
+
+
+def _scan_package() -> List[AlgorithmSpec]:
+    here = os.path.dirname(os.path.abspath(__file__))
+    specs = []
+    for filename in sorted(os.listdir(here)):
+        key, ext = os.path.splitext(filename)
+        if ext != ".py" or key.startswith("_") or key == "registry":
+            continue
+        meta = read_metadata(os.path.join(here, filename))
+        if meta is not None:
+            specs.append(_spec(key, f"algorithms.{key}", key, meta))
+    return specs
+
+
+def _entry_points():
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # Python < 3.8 without the backport
+        return []
+    eps = entry_points()
+    if hasattr(eps, "select"):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+
+def _scan_entry_points() -> List[AlgorithmSpec]:
+    specs = []
+    for ep in _entry_points():
+        module, _, function = ep.value.partition(":")
+        # find_spec locates the file without executing the module itself
+        found = importlib.util.find_spec(module)
+        if found is None or not found.origin:
+            continue
+        meta = read_metadata(found.origin) or {}
+        specs.append(_spec(ep.name, module, function or ep.name, meta))
+    return specs
+
+
+@lru_cache(maxsize=None)
+def _registry() -> Dict[str, AlgorithmSpec]:
+    registry = {}
+    for spec in _scan_package() + _scan_entry_points():
+        registry.setdefault(spec.key, spec)
+    return registry
+
+
+def available_algorithms(input_kinds=None) -> List[AlgorithmSpec]:
+    """All registered algorithms, optionally only those taking ``input_kinds``.
+
+    Ordered by input kind (arrays first) and then by display name.
+    """
+    specs = sorted(_registry().values(), key=lambda s: (INPUT_KINDS.index(s.input_kind), s.name))
+    if input_kinds is not None:
+        specs = [s for s in specs if s.input_kind in input_kinds]
+    return specs
+
+
+def get_algorithm(name: str) -> AlgorithmSpec:
+    """Look an algorithm up by key (``"bubble_sort"``) or display name."""
+    registry = _registry()
+    if name in registry:
+        return registry[name]
+    for spec in registry.values():
+        if spec.name == name:
+            return spec
+    raise KeyError(f"unknown algorithm: {name}")
+
+
+def refresh() -> None:
+    """Forget the cached scan, e.g. after installing a plugin."""
+    _registry.cache_clear()
@@ -0,0 +1,243 @@
+"""Batched lookups over one shared, sorted array.
+
+A ``SearchEngine`` holds a read-only view of a sorted NumPy array; it is not
+copied, and every lookup and step trace made through the engine reads that
+same buffer. ``lookup(targets, method)`` answers a whole batch of targets
+at once: the search runs in lockstep over NumPy vectors of per-target
+bounds, one round of probes per iteration. It returns the same index the
+method's generator would and how many probes (compare frames) it needed.
+``searchsorted`` gives ``np.searchsorted`` insertion points for the same
+batch.
+
+``timeline(target, method)`` plays one target step by step: it runs the
+registered generator over the shared array and records it into a
+:class:`~utils.search_trace.SearchTrace`, which never copies the array either.
+"""
+from dataclasses import dataclass
+from typing import Callable, Dict, Generator, Optional, Sequence
+
+import numpy as np
+
+from algorithms.binary_search import binary_search
+from algorithms.exponential_search import exponential_search
+from algorithms.fibonacci_search import fibonacci_search
+from algorithms.interpolation_search import interpolation_search
+from utils.search_trace import WINDOW, SearchTrace
+from utils.timeline import Timeline
+
+
+@dataclass(frozen=True)
+class Lookup:
+    """Results of one method for a batch of targets, aligned with ``targets``.
+
+    ``index`` is where the target was found, or -1; ``probes`` how many
+    elements were compared with it.
+    """
+
+    targets: np.ndarray
+    index: np.ndarray
+    probes: np.ndarray
+
+    @property
+    def found(self) -> np.ndarray:
+        return self.index >= 0
+
+
+def _bisect(a: np.ndarray, targets: np.ndarray, rows: np.ndarray, lo: np.ndarray, hi: np.ndarray,
+            index: np.ndarray, probes: np.ndarray) -> None:
+    """Binary search ``a[lo..hi]`` for ``targets[rows]``; ``lo``/``hi`` align with ``rows``."""
+    keep = lo <= hi
+    rows, lo, hi = rows[keep], lo[keep], hi[keep]
+    while rows.size:
+        mid = (lo + hi) // 2
+        value, target = a[mid], targets[rows]
+        probes[rows] += 1
+        hit = value == target
+        index[rows[hit]] = mid[hit]
+        lo = np.where(value < target, mid + 1, lo)
+        hi = np.where(value > target, mid - 1, hi)
+        keep = ~hit & (lo <= hi)
+        rows, lo, hi = rows[keep], lo[keep], hi[keep]
+
+
+def _binary(a: np.ndarray, targets: np.ndarray, index: np.ndarray, probes: np.ndarray) -> None:
+    rows = np.arange(len(targets))
+    _bisect(a, targets, rows, np.zeros_like(rows), np.full_like(rows, len(a) - 1), index, probes)
+
+
+def _exponential(a: np.ndarray, targets: np.ndarray, index: np.ndarray, probes: np.ndarray) -> None:
+    n = len(a)
+    if not n:
+        return
+    probes += 1
+    index[targets == a[0]] = 0
+    rows = np.flatnonzero(a[0] < targets)
+    bound = np.ones_like(rows)
+    # rows still galloping; finished ones move to ``done_rows``
+    done_rows, done_bound = [], []
+    while rows.size:
+        at_end = bound >= n
+        done_rows.append(rows[at_end])
+        done_bound.append(bound[at_end])
+        rows, bound = rows[~at_end], bound[~at_end]
+        value = a[bound]
+        probes[rows] += 1
+        hit = value == targets[rows]
+        index[rows[hit]] = bound[hit]
+        above = value > targets[rows]
+        done_rows.append(rows[above])
+        done_bound.append(bound[above])
+        more = ~hit & ~above
+        rows, bound = rows[more], bound[more] * 2
+    rows, bound = np.concatenate(done_rows), np.concatenate(done_bound)
+    _bisect(a, targets, rows, bound // 2 + 1, np.minimum(bound, n) - 1, index, probes)
+
+
+def _interpolation(a: np.ndarray, targets: np.ndarray, index: np.ndarray, probes: np.ndarray) -> None:
+    n = len(a)
+    if not n:
+        return
+    exact = all(x.dtype.kind == "i" or x.dtype in (np.uint8, np.uint16, np.uint32) for x in (a, targets))
+    if not exact or (int(a[-1]) - int(a[0])) * max(n - 1, 1) >= 2 ** 63:
+        # ``(target - a[lo]) * (hi - lo)`` could overflow int64; use Python ints
+        _by_steps(interpolation_search, a, targets, index, probes)
+        return
+    a, targets = a.astype(np.int64, copy=False), targets.astype(np.int64, copy=False)
+    rows = np.arange(len(targets))
+    lo, hi = np.zeros_like(rows), np.full_like(rows, n - 1)
+    while True:
+        target = targets[rows]
+        # lo and hi may have stepped past the ends; those rows are dropped below
+        lo_value, hi_value = a[np.minimum(lo, n - 1)], a[np.maximum(hi, 0)]
+        keep = (lo <= hi) & (lo_value <= target) & (target <= hi_value)
+        rows, lo, hi, target, lo_value, hi_value = (x[keep] for x in (rows, lo, hi, target, lo_value, hi_value))
+        if not rows.size:
+            return
+        flat = hi_value == lo_value
+        width = np.where(flat, 1, hi_value - lo_value)
+        pos = np.where(flat, lo, lo + (target - lo_value) * (hi - lo) // width)
+        value = a[pos]
+        probes[rows] += 1
+        hit = value == target
+        index[rows[hit]] = pos[hit]
+        lo = np.where(value < target, pos + 1, lo)
+        hi = np.where(value > target, pos - 1, hi)
+        rows, lo, hi = rows[~hit], lo[~hit], hi[~hit]
+
+
+def _fibonacci(a: np.ndarray, targets: np.ndarray, index: np.ndarray, probes: np.ndarray) -> None:
+    n = len(a)
+    fib2, fib1 = 0, 1
+    fib = fib1 + fib2
+    while fib < n:
+        fib2, fib1 = fib1, fib
+        fib = fib1 + fib2
+    rows = np.arange(len(targets))
+    fib, fib1, fib2 = (np.full_like(rows, f) for f in (fib, fib1, fib2))
+    offset = np.full_like(rows, -1)
+    # rows out of probes; they get one last check at offset + 1
+    tail_rows, tail_offset = [], []
+    while rows.size:
+        out = fib <= 1
+        tail_rows.append(rows[out & (fib1 > 0)])
+        tail_offset.append(offset[out & (fib1 > 0)])
+        rows, fib, fib1, fib2, offset = (x[~out] for x in (rows, fib, fib1, fib2, offset))
+        i = np.minimum(offset + fib2, n - 1)
+        value, target = a[i], targets[rows]
+        probes[rows] += 1
+        hit = value == target
+        index[rows[hit]] = i[hit]
+        below, above = value < target, value > target
+        fib, fib1 = (np.where(below, fib1, np.where(above, fib2, fib)),
+                     np.where(below, fib2, np.where(above, fib1 - fib2, fib1)))
+        fib2 = fib - fib1
+        offset = np.where(below, i, offset)
+        rows, fib, fib1, fib2, offset = (x[~hit] for x in (rows, fib, fib1, fib2, offset))
+    rows, last = np.concatenate(tail_rows), np.concatenate(tail_offset) + 1
+    rows, last = rows[last < n], last[last < n]
+    probes[rows] += 1
+    hit = a[last] == targets[rows]
+    index[rows[hit]] = last[hit]
+
+
+def _by_steps(algo: Callable, a: np.ndarray, targets: np.ndarray, index: np.ndarray, probes: np.ndarray) -> None:
+    """Run the generator once per target, counting its compare frames."""
+    for row, target in enumerate(targets.tolist()):
+        steps = algo(a, target)
+        while True:
+            try:
+                frame = next(steps)
+            except StopIteration as stop:
+                index[row] = -1 if stop.value is None else stop.value
+                break
+            probes[row] += frame["op"] is not None
+
+
+# registry key of each search generator -> its batched version
+METHODS: Dict[str, Callable] = {
+    "binary_search": _binary,
+    "exponential_search": _exponential,
+    "interpolation_search": _interpolation,
+    "fibonacci_search": _fibonacci,
+}
+GENERATORS: Dict[str, Callable] = {
+    "binary_search": binary_search,
+    "exponential_search": exponential_search,
+    "interpolation_search": interpolation_search,
+    "fibonacci_search": fibonacci_search,
+}
+
+
+class SearchEngine:
+    """Lookups over one sorted array, shared read-only by every search.
+
+    ``values`` should be a sorted 1-D NumPy array; the engine keeps a
+    read-only view of it (other sequences are converted once).
+    """
+
+    def __init__(self, values: Sequence):
+        values = np.asarray(values)
+        if values.ndim != 1:
+            raise ValueError("expected a 1-D array")
+        if values.dtype.kind not in "iuf":
+            raise ValueError(f"unsupported array type {values.dtype}")
+        if len(values) > 1 and np.any(values[1:] < values[:-1]):
+            raise ValueError("values must be sorted")
+        self.values = values.view()
+        self.values.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def searchsorted(self, targets, side: str = "left") -> np.ndarray:
+        """Insertion points of ``targets`` that keep the array sorted."""
+        return np.searchsorted(self.values, targets, side=side)
+
+    def lookup(self, targets, method: str = "binary_search") -> Lookup:
+        """Search every target with ``method`` (a key of ``METHODS``)."""
+        if method not in METHODS:
+            raise ValueError(f"unknown search method: {method}")
+        targets = np.asarray(targets).reshape(-1)
+        index = np.full(len(targets), -1, dtype=np.int64)
+        probes = np.zeros(len(targets), dtype=np.int64)
+        if len(targets):
+            METHODS[method](self.values, targets, index, probes)
+        return Lookup(targets, index, probes)
+
+    def compare(self, targets) -> Dict[str, Lookup]:
+        """``lookup`` of the same targets with every method."""
+        return {method: self.lookup(targets, method) for method in METHODS}
+
+    def steps(self, target, method: str = "binary_search") -> Generator[Dict, None, Optional[int]]:
+        """The method's generator over the shared array."""
+        if method not in GENERATORS:
+            raise ValueError(f"unknown search method: {method}")
+        return GENERATORS[method](self.values, target)
+
+    def new_trace(self, window: int = WINDOW) -> SearchTrace:
+        """An empty trace over the shared array, for a ``Timeline`` to record into."""
+        return SearchTrace(self.values, window)
+
+    def timeline(self, target, method: str = "binary_search", window: int = WINDOW) -> Timeline:
+        """A lazy timeline of one target's search, showing ``window`` values per frame."""
+        return Timeline(self.steps(target, method), trace=self.new_trace(window))
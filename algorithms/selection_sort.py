@@ -3,18 +3,27 @@
 from typing import List, Generator, Dict
 
 
+ALGORITHM = {
+    "name": "Selection Sort",
+    "input": "array",
+    "complexity": "O(n²)",
+    "renderer": "bars",
+}
+
+
 def selection_sort(arr: List[int]) -> Generator[Dict, None, None]:
     a = arr.copy()
     n = len(a)
-    yield {"state": a.copy(), "highlight": (), "info": "start"}
+    yield {"state": a, "highlight": (), "info": "start", "op": None}
     for i in range(n):
         min_idx = i
         for j in range(i + 1, n):
-            yield {"state": a.copy(), "highlight": (min_idx, j), "info": f"compare {min_idx} and {j}"}
+            yield {"state": a, "highlight": (min_idx, j), "info": f"compare {min_idx} and {j}", "op": ("compare", min_idx, j),
+                   "pass": j == i + 1}
             if a[j] < a[min_idx]:
                 min_idx = j
-                yield {"state": a.copy(), "highlight": (min_idx,), "info": f"new min {min_idx}"}
+                yield {"state": a, "highlight": (min_idx,), "info": f"new min {min_idx}", "op": None}
         if min_idx != i:
             a[i], a[min_idx] = a[min_idx], a[i]
-            yield {"state": a.copy(), "highlight": (i, min_idx), "info": f"swapped {i} & {min_idx}"}
-    yield {"state": a.copy(), "highlight": (), "info": "done"}
+            yield {"state": a, "highlight": (i, min_idx), "info": f"swapped {i} & {min_idx}", "op": ("swap", i, min_idx)}
+    yield {"state": a, "highlight": (), "info": "done", "op": None}
@@ -0,0 +1,298 @@
+"""Benchmark runner: trace generation, rendering and memory.
+
+Measures, for every registered algorithm and a grid of input sizes and
+distributions:
+
+- ``generators``: frames per second of the generator, consumed without
+  recording (and of its NumPy engine in ``algorithms.fast_trace``, if any);
+- ``memory``: peak Python/NumPy allocation while recording a full trace, and
+  the size of the resulting trace;
+- ``rendering``: milliseconds per frame of ``draw_state_fig`` (reusing one
+  ``BarRenderer``, and building a fresh figure per frame) and of the pyplot
+  ``draw_state``, each including the Agg rasterization.
+
+Results are written as JSON; ``--compare`` prints the change against an
+earlier results file so regressions show up between versions.
+
+Usage::
+
+    python -m benchmarks.bench -o bench.json
+    python -m benchmarks.bench --sizes 100,1000 --algorithms bubble_sort,merge_sort
+    python -m benchmarks.bench --quick -o new.json --compare bench.json
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Sequence
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.pyplot as plt
+import numpy as np
+
+from algorithms.fast_trace import FAST_ENGINES
+from algorithms.registry import AlgorithmSpec, available_algorithms
+from utils.draw_helpers import BarRenderer, draw_state, draw_state_fig
+from utils.trace import record_trace
+
+DISTRIBUTIONS = ("random", "sorted", "reversed", "few_unique")
+GRID_DISTRIBUTIONS = ("open", "walls")
+SIZES = (100, 500, 1000)
+QUICK_SIZES = (50, 200)
+RENDER_SIZES = (10, 50, 500, 5000)
+RENDER_FRAMES = 30
+# Generators whose run is quadratic in n are skipped above this size.
+QUADRATIC_LIMIT = 2000
+
+
+def make_array(n: int, distribution: str, rng: random.Random) -> List[int]:
+    if distribution == "random":
+        return [rng.randint(0, 10 * n) for _ in range(n)]
+    if distribution == "sorted":
+        return list(range(n))
+    if distribution == "reversed":
+        return list(range(n, 0, -1))
+    if distribution == "few_unique":
+        return [rng.randint(0, 4) for _ in range(n)]
+    raise ValueError(f"unknown distribution: {distribution}")
+
+
+def make_grid(n: int, distribution: str, rng: random.Random):
+    """Square grid with about ``n`` cells; start and goal in opposite corners."""
+    side = max(2, int(round(n ** 0.5)))
+    grid = [[0] * side for _ in range(side)]
+    if distribution == "walls":
+        for r in range(side):
+            for c in range(side):
+                grid[r][c] = 1 if rng.random() < 0.25 else 0
+    elif distribution != "open":
+        raise ValueError(f"unknown distribution: {distribution}")
+    grid[0][0] = grid[side - 1][side - 1] = 0
+    return grid, (0, 0), (side - 1, side - 1)
+
+
+def make_args(spec: AlgorithmSpec, n: int, distribution: str, rng: random.Random) -> tuple:
+    """Positional arguments for ``spec``'s generator."""
+    if spec.input_kind == "grid":
+        return make_grid(n, distribution, rng)
+    data = make_array(n, distribution, rng)
+    if spec.input_kind == "sorted_array":
+        data.sort()
+        return data, rng.choice(data)
+    return (data,)
+
+
+def _is_quadratic(spec: AlgorithmSpec) -> bool:
+    return spec.complexity.startswith("O(n²)")
+
+
+def _timed(fn: Callable[[], int]) -> Dict:
+    start = time.perf_counter()
+    frames = fn()
+    seconds = time.perf_counter() - start
+    return {"frames": frames, "seconds": seconds, "frames_per_sec": frames / seconds if seconds else None}
+
+
+def _consume(gen) -> int:
+    count = 0
+    for _ in gen:
+        count += 1
+    return count
+
+
+def bench_generators(specs: Sequence[AlgorithmSpec], sizes: Sequence[int], seed: int) -> List[Dict]:
+    results = []
+    for spec in specs:
+        algo = spec.load()
+        distributions = GRID_DISTRIBUTIONS if spec.input_kind == "grid" else DISTRIBUTIONS
+        for n in sizes:
+            if _is_quadratic(spec) and n > QUADRATIC_LIMIT:
+                continue
+            for distribution in distributions:
+                args = make_args(spec, n, distribution, random.Random(seed))
+                row = {"algorithm": spec.key, "n": n, "distribution": distribution, "engine": "generator"}
+                row.update(_timed(lambda: _consume(algo(*args))))
+                results.append(row)
+                if spec.key in FAST_ENGINES:
+                    row = dict(row, engine="fast")
+                    row.update(_timed(lambda: len(FAST_ENGINES[spec.key](*args))))
+                    results.append(row)
+    return results
+
+
+def bench_memory(specs: Sequence[AlgorithmSpec], sizes: Sequence[int], seed: int) -> List[Dict]:
+    results = []
+    for spec in specs:
+        algo = spec.load()
+        distributions = GRID_DISTRIBUTIONS if spec.input_kind == "grid" else DISTRIBUTIONS
+        for n in sizes:
+            if _is_quadratic(spec) and n > QUADRATIC_LIMIT:
+                continue
+            for distribution in distributions:
+                args = make_args(spec, n, distribution, random.Random(seed))
+                tracemalloc.start()
+                try:
+                    trace = record_trace(algo(*args))
+                    _, peak = tracemalloc.get_traced_memory()
+                finally:
+                    tracemalloc.stop()
+                results.append({
+                    "algorithm": spec.key, "n": n, "distribution": distribution,
+                    "frames": len(trace), "peak_bytes": peak, "trace_bytes": trace.nbytes(),
+                })
+    return results
+
+
+def _render_states(n: int, frames: int, seed: int):
+    rng = random.Random(seed)
+    state = make_array(n, "random", rng)
+    for k in range(frames):
+        i, j = rng.randrange(n), rng.randrange(n)
+        state[i], state[j] = state[j], state[i]
+        yield list(state), (i, j), f"frame {k}"
+
+
+def bench_rendering(sizes: Sequence[int], frames: int, seed: int) -> List[Dict]:
+    results = []
+    for n in sizes:
+        renderer = BarRenderer()
+
+        def retained(state, highlight, info):
+            draw_state_fig(state, highlight, info, renderer=renderer).canvas.draw()
+
+        def fresh(state, highlight, info):
+            FigureCanvasAgg(draw_state_fig(state, highlight, info)).draw()
+
+        def pyplot(state, highlight, info):
+            draw_state(state, highlight, info, pause=0)
+            plt.gcf().canvas.draw()
+
+        FigureCanvasAgg(renderer.fig)
+        plt.figure()
+        for name, render in (("draw_state_fig", retained), ("draw_state_fig_fresh", fresh), ("draw_state", pyplot)):
+            states = list(_render_states(n, frames + 1, seed))
+            render(*states[0])  # first frame builds the figure
+            start = time.perf_counter()
+            for state, highlight, info in states[1:]:
+                render(state, highlight, info)
+            seconds = time.perf_counter() - start
+            results.append({"function": name, "n": n, "frames": frames, "ms_per_frame": 1000 * seconds / frames})
+        plt.close("all")
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(algorithms: Optional[Sequence[str]] = None, sizes: Sequence[int] = SIZES,
+        render_sizes: Sequence[int] = RENDER_SIZES, render_frames: int = RENDER_FRAMES, seed: int = 0,
+        sections: Sequence[str] = ("generators", "memory", "rendering")) -> Dict:
+    """Run the selected benchmark sections and return the results document."""
+    specs = available_algorithms()
+    if algorithms:
+        specs = [s for s in specs if s.key in algorithms or s.name in algorithms]
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+    }
+    if "generators" in sections:
+        results["generators"] = bench_generators(specs, sizes, seed)
+    if "memory" in sections:
+        results["memory"] = bench_memory(specs, sizes, seed)
+    if "rendering" in sections:
+        results["rendering"] = bench_rendering(render_sizes, render_frames, seed)
+    return results
+
+
+# metric per section where bigger is better (+) or worse (-)
+_METRICS = {
+    "generators": ("frames_per_sec", 1, ("algorithm", "n", "distribution", "engine")),
+    "memory": ("peak_bytes", -1, ("algorithm", "n", "distribution")),
+    "rendering": ("ms_per_frame", -1, ("function", "n")),
+}
+
+
+def compare(new: Dict, old: Dict, threshold: float = 0.1) -> List[str]:
+    """One line per measurement that got worse by more than ``threshold``."""
+    lines = []
+    for section, (metric, sign, keys) in _METRICS.items():
+        before = {tuple(r[k] for k in keys): r[metric] for r in old.get(section, [])}
+        for row in new.get(section, []):
+            key = tuple(row[k] for k in keys)
+            if not before.get(key) or row[metric] is None:
+                continue
+            change = row[metric] / before[key] - 1
+            if sign * change < -threshold:
+                label = " ".join(str(k) for k in key)
+                lines.append(f"{section}: {label}: {metric} {before[key]:.4g} -> {row[metric]:.4g} ({change:+.0%})")
+    return lines
+
+
+def _print_summary(results: Dict) -> None:
+    for row in results.get("generators", []):
+        print(f"{row['algorithm']:>20} {row['engine']:>9} n={row['n']:<6} {row['distribution']:>10}: "
+              f"{row['frames']:>9} frames {row['frames_per_sec']:>12,.0f} frames/s")
+    for row in results.get("memory", []):
+        print(f"{row['algorithm']:>20} n={row['n']:<6} {row['distribution']:>10}: "
+              f"peak {row['peak_bytes'] / 1e6:8.2f} MB, trace {row['trace_bytes'] / 1e6:8.2f} MB")
+    for row in results.get("rendering", []):
+        print(f"{row['function']:>20} n={row['n']:<6}: {row['ms_per_frame']:8.2f} ms/frame")
+
+
+def _ints(text: str) -> List[int]:
+    return [int(x) for x in text.split(",") if x.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark trace generation, rendering and memory.")
+    parser.add_argument("-o", "--output", help="write results JSON here")
+    parser.add_argument("--algorithms", help="comma separated registry keys (default: all)")
+    parser.add_argument("--sizes", type=_ints, default=SIZES, help="input sizes, e.g. 100,500,1000")
+    parser.add_argument("--render-sizes", type=_ints, default=RENDER_SIZES, help="bar counts for rendering")
+    parser.add_argument("--render-frames", type=int, default=RENDER_FRAMES)
+    parser.add_argument("--sections", default="generators,memory,rendering")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="small sizes, for a fast sanity run")
+    parser.add_argument("--compare", metavar="OLD_JSON", help="report regressions against an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change counted as a regression")
+    args = parser.parse_args(argv)
+
+    sizes, render_sizes = (QUICK_SIZES, (10, 50)) if args.quick else (args.sizes, args.render_sizes)
+    algorithms = [a.strip() for a in args.algorithms.split(",")] if args.algorithms else None
+    results = run(algorithms, sizes, render_sizes, args.render_frames, args.seed,
+                  [s.strip() for s in args.sections.split(",")])
+    _print_summary(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+        print(f"wrote {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Cold start of the Streamlit app and the command line tools.
+
+Every measurement starts a fresh interpreter, as a new server process or a
+scaled-up pod does, and reports seconds for:
+
+- ``imports``: the modules ``main.py`` imports at the top;
+- ``first_run``: the app's first script run after them, up to a served page;
+- ``rerun``: a later run of the same session (the fastest of a few), which is
+  what every widget interaction costs;
+- ``first_frame``: submitting the default input and rendering its first frame,
+  once the renderers the first run preloads in the background are in;
+- ``cli_imports``: the modules behind ``python -m utils.instrumentation`` and
+  ``python -m utils.trace_file``.
+
+``heavy_modules`` lists modules from ``HEAVY_MODULES`` (matplotlib) that the
+startup imports pulled in; the app and the CLIs load them on first use only.
+``BUDGET`` holds the limits ``--check`` enforces, a few times the timings
+on a development machine so that only real regressions trip it.
+``tests/test_startup.py`` always checks the timings against three
+times the budget, since timings vary between machines, and against the
+budget itself when ``ALGO_VIS_CHECK_STARTUP=1`` is set.
+
+Usage::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --check
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Sequence
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "main.py")
+CLI_MODULES = ("utils.instrumentation", "utils.trace_file")
+HEAVY_MODULES = ("matplotlib",)
+
+# seconds
+BUDGET = {
+    "imports": 2.0,
+    "first_run": 1.5,
+    "rerun": 0.3,
+    "first_frame": 3.0,
+    "cli_imports": 1.0,
+}
+
+_PROBE = """
+import importlib, json, sys, threading, time
+sys.path.insert(0, {root!r})
+heavy = {heavy!r}
+t = time.perf_counter()
+for name in {modules!r}:
+    importlib.import_module(name)
+result = {{"imports": time.perf_counter() - t,
+          "heavy_modules": sorted(m for m in heavy if m in sys.modules)}}
+if {app!r}:
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file({app!r}, default_timeout=120)
+    t = time.perf_counter()
+    at.run()
+    result["first_run"] = time.perf_counter() - t
+    # a visitor reads the page first; let the renderer preload finish meanwhile
+    for thread in threading.enumerate():
+        if thread.name == "preload-renderers":
+            thread.join()
+    reruns = []
+    for _ in range(3):
+        t = time.perf_counter()
+        at.run()
+        reruns.append(time.perf_counter() - t)
+    result["rerun"] = min(reruns)
+    submit = next(b for b in at.button if "Generate" in b.label)
+    t = time.perf_counter()
+    submit.click().run()
+    result["first_frame"] = time.perf_counter() - t
+    result["errors"] = [str(e.value) for e in at.exception] + [str(e.value) for e in at.error]
+print(json.dumps(result))
+"""
+
+
+def app_imports(path: str = APP) -> List[str]:
+    """Modules a script imports at module level, in order."""
+    with open(path, encoding="utf-8") as fh:
+        tree = ast.parse(fh.read(), path)
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return names
+
+
+def _probe(modules: Sequence[str], app: str = "") -> Dict:
+    code = _PROBE.format(root=ROOT, heavy=tuple(HEAVY_MODULES), modules=list(modules), app=app)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=ROOT, timeout=300)
+    if out.returncode:
+        raise RuntimeError(f"startup probe failed:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def measure() -> Dict:
+    """Startup timings of the app and the CLIs, each from a fresh interpreter."""
+    result = _probe(app_imports(), APP)
+    cli = _probe(CLI_MODULES)
+    result["cli_imports"] = cli["imports"]
+    result["cli_heavy_modules"] = cli["heavy_modules"]
+    return result
+
+
+def over_budget(result: Dict, budget: Dict[str, float] = BUDGET) -> List[str]:
+    """One line per timing above its budget or heavy module loaded at startup."""
+    lines = [f"{name}: {result[name]:.3f} s > {limit:.3f} s budget"
+             for name, limit in budget.items() if result.get(name, 0) > limit]
+    for key in ("heavy_modules", "cli_heavy_modules"):
+        if result.get(key):
+            lines.append(f"{key}: {', '.join(result[key])} imported at startup")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold start of the Streamlit app and the CLIs.")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a timing is over budget")
+    args = parser.parse_args(argv)
+    result = measure()
+    print(json.dumps(result, indent=2))
+    problems = over_budget(result)
+    for line in problems:
+        print("OVER BUDGET", line)
+    return 1 if args.check and problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+"""Run a quick sort variant through the sorting visualizer.
+
+    python -m examples.run_quick_sort_demo [quick_sort|quick_sort_hoare|quick_sort_three_way|introsort]
+"""
+import random
+import sys
+
+from algorithms.registry import get_algorithm
+from visualizers.sorting_visualizer import visualize_sort
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    key = argv[0] if argv else "quick_sort_hoare"
+    rng = random.Random(42)
+    arr = [rng.randint(1, 100) for _ in range(15)]
+    print("Original array:", arr)
+    visualize_sort(get_algorithm(key).load()(arr, seed=42), arr)
+
+
+if __name__ == '__main__':
+    main()
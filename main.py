@@ -1,54 +1,216 @@
+import io
+import json
+import os
 import time
 import random
+import numpy as np
 import streamlit as st
-import matplotlib.pyplot as plt
-
-from algorithms.bubble_sort import bubble_sort
-from algorithms.insertion_sort import insertion_sort
-from algorithms.selection_sort import selection_sort
-from algorithms.binary_search import binary_search
-from algorithms.merge_sort import merge_sort
-
-
-ALGOS = {
-    "Bubble Sort": bubble_sort,
-    "Insertion Sort": insertion_sort,
-    "Selection Sort": selection_sort,
-    "Merge Sort": merge_sort,
-}
-
-
-def draw_state_fig(state, highlight=(), info="", bar_color="#4C78A8", highlight_color="#EE994F"):
-    """Draws a bar chart with axis labels, title, and highlight indices."""
-    plt.style.use('seaborn-v0_8-darkgrid')
-    fig, ax = plt.subplots(figsize=(9, 4))
-    # If state is a grid (list of lists), flatten for now
-    if not isinstance(state, (list, tuple)) or (len(state) and isinstance(state[0], (list, tuple))):
-        # Fallback: show a simple text when non-list state
-        ax.text(0.5, 0.5, str(state), ha='center', va='center')
-        ax.set_xticks([])
-        ax.set_yticks([])
+
+from algorithms.registry import available_algorithms
+from algorithms.search_engine import METHODS
+from utils.app_resources import (browser_payload, frame_budget, get_frame_cache, get_race_pool, get_search_engine,
+                                 get_trace_cache, preload_renderers)
+from utils.algo_interface import input_fingerprint
+from utils.frame_cache import FramePrefetcher, frame_key
+from utils.grid import parse_grid, random_grid
+from utils.grid_trace import is_grid_frame
+from utils.input_data import (DATASETS, MAX_VALUES, RAW_DTYPES, estimate_frames, generate, max_input_size,
+                              parse_text, preview, read_upload)
+from utils.instrumentation import RunMetrics, instrument
+from utils.level_of_detail import DURATION, EVERY_FRAME, EVERY_K, FRAME_BUDGET, LEVELS, level_of_detail
+from utils.race import Race
+from utils.timeline import Timeline
+from visualizers.browser_player import player_html
+
+# Figures are only ever rendered to PNG here. Set before matplotlib is first
+# imported, so the backend is chosen once per process, without probing for a GUI.
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+# Input kinds the web demo has widgets for; modules are imported on selection
+SUPPORTED_INPUTS = ("array", "sorted_array", "grid")
+ALGOS = {spec.name: spec for spec in available_algorithms(SUPPORTED_INPUTS)}
+
+
+PLOT_STYLE = 'seaborn-v0_8-darkgrid'
+
+# Largest grid (rows × cols) the web demo accepts
+GRID_CELL_LIMIT = 1_000_000
+
+DEFAULT_MAZE = """S.......#.
+.######.#.
+......#.#.
+.####.#...
+....#.###.
+###.#.....
+....####.#
+.##......G"""
+
+
+TYPED_INPUT = "Typed"
+UPLOADED_INPUT = "Upload"
+GENERATED_INPUT = "Generated"
+UPLOAD_TYPES = ["csv", "txt", "npy", "bin", "raw"]
+
+# Frames rendered ahead of the current one while it is on screen
+PREFETCH_FRAMES = 16
+
+SERVER_PLAYBACK = "Server (frame by frame)"
+BROWSER_PLAYBACK = "Browser (whole animation)"
+
+# Race panels per row
+RACE_COLUMNS = 3
+
+# Batch search: most targets per submission, and rows listed per target
+MAX_BATCH_TARGETS = 1_000_000
+BATCH_ROWS = 1000
+
+
+def render_png(frames, i, colors, renderers):
+    """Render frame ``i`` of a timeline or sampled view to PNG bytes.
+
+    Grid frames go to a ``GridRenderer``, which patches its raster from the
+    trace; everything else is drawn as bars. ``renderers`` holds one of each,
+    created on first use.
+    """
+    # matplotlib is imported with the first rendered frame rather than at startup
+    from utils.draw_helpers import BarRenderer
+    from visualizers.pathfinding_visualizer import GridRenderer
+
+    frame = frames[i]
+    if is_grid_frame(frame):
+        if 'grid' not in renderers:
+            renderers['grid'] = GridRenderer(style=PLOT_STYLE)
+        renderer = renderers['grid']
+        renderer.set_colors(*colors)
+        renderer.show(frames.trace, frame.get('step', i), frame.get('info'))
+        return renderer.to_png()
+    if 'bars' not in renderers:
+        renderers['bars'] = BarRenderer(style=PLOT_STYLE)
+    return render_frame_png(frame, colors, renderers['bars'])
+
+
+def render_frame_png(frame, colors, renderer):
+    """Render one frame dict to PNG bytes with the given (bar, highlight) colors."""
+    from utils.draw_helpers import draw_state_fig
+
+    fig = draw_state_fig(
+        frame.get('state', []),
+        frame.get('highlight', ()),
+        frame.get('info', 'Algorithm Step'),
+        bar_color=colors[0],
+        highlight_color=colors[1],
+        renderer=renderer,
+        style=PLOT_STYLE,
+        offset=frame.get('offset', 0),
+    )
+    if fig is renderer.fig:
+        return renderer.to_png()
+    import matplotlib.pyplot as plt
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    plt.close(fig)
+    return buf.getvalue()
+
+
+def load_array_input(source, text, upload, raw_dtype, dataset, size, seed):
+    """The submitted array as an ``int64`` NumPy array, from the selected source."""
+    if source == UPLOADED_INPUT:
+        if upload is None:
+            raise ValueError("choose a file to upload")
+        return read_upload(upload, upload.name, raw_dtype)
+    if source == GENERATED_INPUT:
+        return generate(dataset, int(size), int(seed))
+    return parse_text(text)
+
+
+def batch_targets(text, count, values, seed):
+    """Typed batch targets, then ``count`` random ones between the smallest and largest value."""
+    typed = parse_text(text, MAX_BATCH_TARGETS)
+    if not count or not len(values):
+        return typed
+    drawn = np.random.default_rng(seed).integers(values[0], values[-1], int(count), endpoint=True)
+    return np.concatenate([typed, drawn])[:MAX_BATCH_TARGETS]
+
+
+def run_batch(engine, targets):
+    """Every search method over ``targets``: a summary per method and the first ``BATCH_ROWS`` rows."""
+    names = {spec.key: spec.name for spec in ALGOS.values()}
+    summary = {"method": [], "found": [], "mean probes": [], "max probes": [], "time (ms)": []}
+    rows = {"target": targets[:BATCH_ROWS], "insertion point": engine.searchsorted(targets[:BATCH_ROWS])}
+    for method in METHODS:
+        started = time.perf_counter()
+        lookup = engine.lookup(targets, method)
+        elapsed = time.perf_counter() - started
+        summary["method"].append(names.get(method, method))
+        summary["found"].append(int(lookup.found.sum()))
+        summary["mean probes"].append(round(float(lookup.probes.mean()), 2) if len(targets) else 0.0)
+        summary["max probes"].append(int(lookup.probes.max()) if len(targets) else 0)
+        summary["time (ms)"].append(round(elapsed * 1000, 1))
+        rows[f"{names.get(method, method)} index"] = lookup.index[:BATCH_ROWS]
+        rows[f"{names.get(method, method)} probes"] = lookup.probes[:BATCH_ROWS]
+    return {"targets": len(targets), "summary": summary, "rows": rows}
+
+
+def new_timeline(frames, profile=False, **kwargs):
+    """A ``Timeline`` over ``frames``, instrumented when ``profile`` is set.
+
+    The first frame is generated here: generators check their input before
+    yielding it, so a bad run raises ``ValueError`` now, before it is cached.
+    """
+    if not profile:
+        timeline = Timeline(frames, **kwargs)
     else:
-        # Updated colored bars: Replaced the gradient colors with a uniform color based on bar_color:
-        bars = ax.bar(range(len(state)), state, color=bar_color, edgecolor='black')
-
-        if highlight:
-            for idx in (highlight if isinstance(highlight, (list, tuple)) else [highlight]):
-                if isinstance(idx, int) and 0 <= idx < len(bars):
-                    bars[idx].set_color(highlight_color)
-        ax.set_xlabel('Index')
-        ax.set_ylabel('Value')
-        ax.set_xticks(range(len(state)))
-        ax.set_xlim(-0.5, max(len(state) - 0.5, 0.5))
-        ax.set_ylim(0, max(state) * 1.1 if state else 1)
-        # annotate bar values for clarity
-        for rect, val in zip(bars, state):
-            height = rect.get_height()
-            ax.annotate(f'{val}', xy=(rect.get_x() + rect.get_width() / 2, height),
-                        xytext=(0, 3), textcoords='offset points', ha='center', va='bottom', fontsize=8)
-    ax.set_title(info, fontsize=12)
-    plt.tight_layout()
-    return fig
+        metrics = RunMetrics()
+        timeline = Timeline(instrument(frames, metrics), metrics=metrics, **kwargs)
+    timeline.has_frame(0)
+    return timeline
+
+
+def make_prefetcher(timeline, cache):
+    """Background renderer for one run; owns its own figures."""
+    renderers = {}
+
+    def render(key):
+        _, i, colors = key
+        if not timeline.has_frame(i):
+            return None
+        return render_png(timeline, i, colors, renderers)
+
+    return FramePrefetcher(cache, render)
+
+
+def playback_key():
+    """Fingerprint of what playback steps through: the run plus its level of detail."""
+    run_key = st.session_state.get('run_key', '')
+    lod = st.session_state.get('lod')
+    return run_key if lod is None else f"{run_key}|{lod[0]}|{lod[1]}|{lod[2]}"
+
+
+def playback_frames():
+    """The timeline, or a sampled view of its full trace at the chosen level of detail."""
+    timeline = st.session_state.frames
+    lod = st.session_state.get('lod')
+    if isinstance(timeline, Race):
+        # races play every frame of every lane and render without prefetching
+        return timeline
+    if timeline is None or lod is None:
+        frames = timeline
+    else:
+        key = playback_key()
+        if st.session_state.get('view_key') != key:
+            with st.spinner("Sampling frames..."):
+                st.session_state.view = level_of_detail(timeline.run_to_end(), lod[0], lod[1], fps=lod[2] or 2.0)
+            st.session_state.view_key = key
+            st.session_state.idx = min(st.session_state.idx, len(st.session_state.view) - 1)
+        frames = st.session_state.view
+    # the prefetcher renders from whatever playback currently shows
+    if frames is not None and st.session_state.get('prefetch_key') != playback_key():
+        if st.session_state.get('prefetcher') is not None:
+            st.session_state.prefetcher.shutdown()
+        st.session_state.prefetcher = make_prefetcher(frames, get_frame_cache())
+        st.session_state.prefetch_key = playback_key()
+    return frames
 
 
 st.set_page_config(page_title="Algorithm Visualizer", layout="wide")
@@ -63,73 +225,218 @@ with st.sidebar:
     with st.form("visualization_form"):
         algo_name = st.selectbox(
             "🔧 Select Algorithm", 
-            list(ALGOS.keys()) + ["Binary Search"],
+            list(ALGOS.keys()),
             help="Choose the algorithm you want to visualize"
         )
         
-        st.markdown("**📝 Array Input**")
-        arr_text = st.text_input(
-            "Enter numbers separated by commas", 
-            value="5,2,4,1,3",
-            placeholder="e.g., 5,2,4,1,3",
-            help="Enter integers separated by commas"
-        )
+        spec = ALGOS[algo_name]
+        if spec.input_kind == "grid":
+            st.markdown("**🧭 Grid Input**")
+            grid_source = st.radio("Grid", ["Maze", "Random"], horizontal=True)
+            maze_text = st.text_area(
+                "Maze",
+                value=DEFAULT_MAZE,
+                height=180,
+                help="One row per line: '#' wall, '.' open, 'S' start, 'G' goal",
+            )
+            size_cols = st.columns(2)
+            with size_cols[0]:
+                grid_rows = st.number_input("Rows", min_value=2, max_value=1000, value=40)
+            with size_cols[1]:
+                grid_cols = st.number_input("Columns", min_value=2, max_value=1000, value=60)
+            density = st.slider("Wall density", 0.0, 0.6, 0.25, help="Share of random cells that are walls")
+        else:
+            st.markdown("**📝 Array Input**")
+            array_source = st.radio("Source", [TYPED_INPUT, UPLOADED_INPUT, GENERATED_INPUT], horizontal=True)
+            arr_text = st.text_input(
+                "Enter numbers separated by commas", 
+                value="5,2,4,1,3",
+                placeholder="e.g., 5,2,4,1,3",
+                help="Enter integers separated by commas"
+            )
+            with st.expander("📁 Upload a file"):
+                upload = st.file_uploader(
+                    "CSV, NPY or raw binary",
+                    type=UPLOAD_TYPES,
+                    help="CSV/text: integers separated by commas or whitespace. Raw: packed little-endian integers",
+                )
+                raw_dtype = st.selectbox("Raw binary type", RAW_DTYPES, index=RAW_DTYPES.index("int32"))
+            with st.expander("🎲 Generate a dataset"):
+                dataset = st.selectbox("Dataset", DATASETS)
+                dataset_size = st.number_input("Size", min_value=1, max_value=MAX_VALUES, value=1000)
+                dataset_seed = st.number_input("Seed", min_value=0, value=0)
+            race_with = []
+            if spec.input_kind == "array":
+                race_with = st.multiselect(
+                    "🏁 Race against",
+                    [name for name, other in ALGOS.items() if other.input_kind == "array" and name != algo_name],
+                    help="Play other algorithms on the same input side by side",
+                )
         
-        # Additional input for binary search
+        st.caption(f"Complexity: {spec.complexity}")
+        profile = st.checkbox(
+            "📈 Collect metrics",
+            help="Count operations, track recursion depth and time each phase of the run",
+        )
+        # profiled runs are cached apart from plain ones
+        profile_params = {"profile": True} if profile else {}
+
+        # Additional input for search algorithms
         target = None
-        if algo_name == "Binary Search":
+        batch_text, batch_random = "", 0
+        if spec.input_kind == "sorted_array":
             target = st.number_input(
                 "🎯 Target value to search for", 
                 value=5,
                 help="The number you want to find in the array"
             )
+            batch_text = st.text_input(
+                "🎯 Batch targets",
+                placeholder="e.g. 3, 17, 42",
+                help="More values to look up at once with every search method",
+            )
+            batch_random = st.number_input(
+                "Random batch targets",
+                min_value=0,
+                max_value=MAX_BATCH_TARGETS,
+                value=0,
+                help="Also look up this many random values between the smallest and largest element",
+            )
         
         # Submit button with better styling
         submitted = st.form_submit_button("🚀 Generate Visualization", use_container_width=True)
         
         # Process form submission with better error handling
-        if submitted:
+        if submitted and spec.input_kind == "grid":
+            try:
+                if grid_source == "Random":
+                    grid = random_grid(int(grid_rows), int(grid_cols), density, seed=random.randrange(2 ** 32))
+                    start, goal = (0, 0), (int(grid_rows) - 1, int(grid_cols) - 1)
+                    grid[0][0] = grid[-1][-1] = 0
+                else:
+                    grid, start, goal = parse_grid(maze_text)
+                if len(grid) * len(grid[0]) > GRID_CELL_LIMIT:
+                    st.error(f"❌ Grid too large! Please use at most {GRID_CELL_LIMIT:,} cells")
+                else:
+                    run_key = input_fingerprint(algo_name, np.asarray(grid, dtype=np.uint8), start=start, goal=goal,
+                                                **profile_params)
+                    st.session_state.frames = get_trace_cache().get_or_create(
+                        run_key, lambda: new_timeline(spec.load()(grid, start, goal), profile, start=start, goal=goal),
+                        metadata={"algorithm": algo_name, "n": len(grid) * len(grid[0])})
+                    st.session_state.run_key = run_key
+                    st.session_state.input_kind = spec.input_kind
+                    st.session_state.idx = 0
+                    st.session_state.playing = False
+                    st.success(f"✅ {len(grid)}×{len(grid[0])} grid ready! Frames are generated as playback runs.")
+            except ValueError as e:
+                st.error(f"❌ Invalid grid: {e}")
+            except Exception as e:
+                st.error(f"❌ An error occurred: {str(e)}")
+        elif submitted:
             try:
                 # Parse and validate array input
-                arr = [int(x.strip()) for x in arr_text.split(",") if x.strip() != '']
+                values = load_array_input(array_source, arr_text, upload, raw_dtype, dataset, dataset_size,
+                                          dataset_seed)
+                racers = [algo_name] + [name for name in race_with if name != algo_name]
+                # the size limit comes from how many frames the run would record
+                budget = frame_budget()
+                needed = sum(estimate_frames(ALGOS[name].complexity, len(values)) for name in racers)
                 
-                if not arr:
+                if not len(values):
                     st.error("❌ Please enter at least one number")
-                elif len(arr) > 50:
-                    st.error("❌ Array too large! Please use 50 or fewer elements")
+                elif needed > budget:
+                    limit = min(max_input_size(ALGOS[name].complexity, budget // len(racers)) for name in racers)
+                    st.error(f"❌ Array too large for this run! Please use {limit:,} or fewer elements")
                 else:
                     # Generate algorithm frames
                     with st.spinner(f"Generating {algo_name} visualization..."):
-                        if algo_name == "Binary Search":
-                            # Sort array for binary search
-                            sorted_arr = sorted(arr)
-                            st.info(f"🔄 Array sorted for binary search: {sorted_arr}")
-                            st.session_state.frames = list(binary_search(sorted_arr, int(target)))
+                        # identical runs share one cached timeline across sessions
+                        traces = get_trace_cache()
+                        st.session_state.search_batch = None
+                        st.session_state.search_window = False
+                        if len(racers) > 1:
+                            # every lane runs to the end, in parallel worker processes
+                            race = Race.generate([ALGOS[name].key for name in racers], values.tolist(),
+                                                 executor=get_race_pool(), cache=traces)
+                            st.session_state.frames = race
+                            run_key = "race|" + "|".join(lane.run_key for lane in race.lanes)
+                        elif spec.input_kind == "sorted_array":
+                            # every search over this input reads one shared, read-only sorted array
+                            sorted_values = np.sort(values)
+                            engine = get_search_engine(input_fingerprint("sorted_array", sorted_values), sorted_values)
+                            st.info(f"🔄 Array sorted for {algo_name}: {preview(engine.values)}")
+                            run_key = input_fingerprint(algo_name, engine.values, target=int(target), **profile_params)
+                            st.session_state.frames = traces.get_or_create(
+                                run_key,
+                                lambda: new_timeline(spec.load()(engine.values, int(target)), profile,
+                                                     trace=engine.new_trace()),
+                                metadata={"algorithm": algo_name, "n": len(values), "target": int(target)})
+                            st.session_state.search_window = len(engine) > engine.new_trace().window
+                            targets = batch_targets(batch_text, batch_random, engine.values, dataset_seed)
+                            if len(targets):
+                                st.session_state.search_batch = run_batch(engine, targets)
                         else:
-                            st.session_state.frames = list(ALGOS[algo_name](arr.copy()))
+                            arr = values.tolist()
+                            run_key = input_fingerprint(algo_name, arr, **profile_params)
+                            st.session_state.frames = traces.get_or_create(
+                                run_key, lambda: new_timeline(spec.load()(arr.copy()), profile),
+                                metadata={"algorithm": algo_name, "n": len(arr)})
+                        st.session_state.run_key = run_key
+                        st.session_state.input_kind = "race" if len(racers) > 1 else spec.input_kind
+                        st.session_state.input_values = values
                         
                         # Reset playback state
                         st.session_state.idx = 0
                         st.session_state.playing = False
                         
-                        st.success(f"✅ Generated {len(st.session_state.frames)} animation frames!")
+                        if len(racers) > 1:
+                            st.success(f"✅ Race ready! {len(racers)} algorithms side by side.")
+                        else:
+                            st.success("✅ Visualization ready! Frames are generated as playback runs.")
                         
-            except ValueError:
-                st.error("❌ Invalid input! Please enter only integers separated by commas")
+            except ValueError as e:
+                st.error(f"❌ Invalid input: {e}")
             except Exception as e:
                 st.error(f"❌ An error occurred: {str(e)}")
     
-    # Display array info outside form
-    try:
-        arr = [int(x.strip()) for x in arr_text.split(",") if x.strip() != '']
-        if arr:
-            st.info(f"📊 Array size: **{len(arr)}**")
-            st.write(f"Array preview: `{arr}`")
-        else:
-            st.warning("⚠️ Array is empty")
-    except Exception:
-        st.error("❌ Invalid array format - use comma separated integers")
-        arr = []
+    # Runs on disk: spilled by the trace cache or precomputed offline with
+    # `python -m utils.trace_file ... --dir $ALGO_VIS_TRACE_DIR`
+    store = get_trace_cache().store
+    saved = store.entries() if store is not None else []
+    if saved:
+        with st.expander("📂 Saved runs"):
+            runs = {}
+            for key, info in saved:
+                meta = info.get("metadata", {})
+                label = f"{meta.get('algorithm', 'Unknown')} · n={meta.get('n', '?')} · {info['frames']:,} frames · {key[:8]}"
+                runs[label] = (key, info)
+            choice = st.selectbox("Run", list(runs))
+            if st.button("📥 Load run", use_container_width=True):
+                key, info = runs[choice]
+                timeline = get_trace_cache().get(key)
+                if timeline is None:
+                    st.error("❌ Could not open that trace file")
+                else:
+                    st.session_state.frames = timeline
+                    st.session_state.run_key = key
+                    st.session_state.input_kind = "grid" if info["trace"] == "grid" else "array"
+                    st.session_state.input_values = None
+                    st.session_state.idx = 0
+                    st.session_state.playing = False
+                    st.success(f"✅ Loaded {info['frames']:,} frames")
+
+    # The submitted array, parsed once in the form
+    values = st.session_state.get('input_values')
+    if values is not None and st.session_state.get('input_kind') != "grid":
+        st.info(f"📊 Array size: **{len(values):,}**")
+        st.write(f"Array preview: `{preview(values)}`")
+    batch = st.session_state.get('search_batch')
+    if batch is not None and st.session_state.get('input_kind') == "sorted_array":
+        with st.expander(f"🎯 Batch lookups ({batch['targets']:,} targets)", expanded=True):
+            st.dataframe(batch["summary"], hide_index=True)
+            shown = min(batch["targets"], BATCH_ROWS)
+            st.caption(f"First {shown:,} targets; indices are -1 where a target is missing")
+            st.dataframe(batch["rows"], hide_index=True)
 
     # Speed control configuration
     st.subheader("Playback Speed")
@@ -159,13 +466,38 @@ with st.sidebar:
         with col:
             if st.button(f"{speed_val}x", key=f"preset_{i}"):
                 st.session_state.multiplier = speed_val
+
+    # Browser playback ships the whole trace once instead of one rerun per frame
+    playback_mode = st.radio(
+        "🎞️ Playback mode",
+        [SERVER_PLAYBACK, BROWSER_PLAYBACK],
+        help="Browser mode sends the whole animation to your browser once and plays it there",
+    )
+
+    # Long runs: show one frame per pass, every K-th frame or a fixed budget
+    lod_level = st.selectbox(
+        "🔍 Level of detail",
+        LEVELS,
+        help="Skip frames on long runs; shown frames count the operations they skip",
+    )
+    lod_value = None
+    if lod_level == EVERY_K:
+        lod_value = st.number_input("Show every K-th frame", min_value=1, value=10)
+    elif lod_level == FRAME_BUDGET:
+        lod_value = st.number_input("Frames to show", min_value=2, value=200)
+    elif lod_level == DURATION:
+        lod_value = st.number_input("Play in (seconds)", min_value=1, value=60)
+    playback_fps = 1000.0 / max(100, base_delay_ms / st.session_state.multiplier)
+    # only the duration level depends on the playback speed
+    lod_fps = playback_fps if lod_level == DURATION else None
+    st.session_state.lod = None if lod_level == EVERY_FRAME else (lod_level, lod_value, lod_fps)
     st.markdown("---")
     
     # Initialize session state variables
     if 'playing' not in st.session_state:
         st.session_state.playing = False
     if 'frames' not in st.session_state:
-        st.session_state.frames = []
+        st.session_state.frames = None
     if 'idx' not in st.session_state:
         st.session_state.idx = 0
 
@@ -181,86 +513,203 @@ with st.sidebar:
 
     
     # Animation status indicator
-    if st.session_state.frames:
+    timeline = playback_frames()
+    if timeline is not None:
         status = "🔴 Playing..." if st.session_state.playing else "⏸️ Paused"
         st.markdown(f"**Status:** {status}")
     
-    # Playback control buttons
-    control_cols = st.columns(4)
-    with control_cols[0]:
-        play_disabled = not st.session_state.frames or st.session_state.idx >= len(st.session_state.frames) - 1
-        if st.button("▶️ Play", disabled=play_disabled):
-            st.session_state.playing = True
-    with control_cols[1]:
-        if st.button("⏸️ Pause"):
-            st.session_state.playing = False
-    with control_cols[2]:
-        step_disabled = not st.session_state.frames or st.session_state.idx >= len(st.session_state.frames) - 1
-        if st.button("⏭️ Step", disabled=step_disabled):
-            st.session_state.playing = False
-            max_idx = max(len(st.session_state.frames) - 1, 0)
-            st.session_state.idx = min(st.session_state.idx + 1, max_idx)
-    with control_cols[3]:
-        if st.button("🔄 Reset", disabled=not st.session_state.frames):
-            st.session_state.idx = 0
-            st.session_state.playing = False
+    # Playback control buttons; grid runs and races always play on the server
+    is_grid = st.session_state.get('input_kind') == "grid"
+    is_race = st.session_state.get('input_kind') == "race"
+    # searches over long arrays show a window of it per frame
+    is_window = st.session_state.get('input_kind') == "sorted_array" and st.session_state.get('search_window', False)
+    server_only = is_grid or is_race or is_window
+    if is_race and st.session_state.lod is not None:
+        st.caption("Races play every frame.")
+    if playback_mode == BROWSER_PLAYBACK and not server_only:
+        st.session_state.playing = False
+        st.caption("Use the player controls under the chart.")
+    else:
+        control_cols = st.columns(4)
+        with control_cols[0]:
+            at_end = timeline is None or not timeline.has_frame(st.session_state.idx + 1)
+            if st.button("▶️ Play", disabled=at_end):
+                st.session_state.playing = True
+                # the playback clock starts on the next frame
+                st.session_state.play_anchor = None
+                st.session_state.skipped = 0
+        with control_cols[1]:
+            if st.button("⏸️ Pause"):
+                st.session_state.playing = False
+        with control_cols[2]:
+            if st.button("⏭️ Step", disabled=at_end):
+                st.session_state.playing = False
+                if timeline.has_frame(st.session_state.idx + 1):
+                    st.session_state.idx += 1
+        with control_cols[3]:
+            if st.button("🔄 Reset", disabled=timeline is None):
+                st.session_state.idx = 0
+                st.session_state.playing = False
 
     # Progress indicator (moved to main area)
-    if not st.session_state.frames:
+    if timeline is None:
         st.info("🎬 Generate visualization frames to start animation")
 
 # Main visualization display area
 st.header("Visualization")
 
-# Progress bar container (above the graph)
-progress_container = st.container()
-graph_container = st.container()
+# Progress bar, graph and metrics containers; created inside the fragment below
+progress_container = graph_container = metrics_container = None
 
 def update_progress_bar():
     """Update the progress bar with current frame information."""
-    if st.session_state.frames:
-        total_frames = len(st.session_state.frames)
+    timeline = playback_frames()
+    if timeline is not None and timeline.has_frame(st.session_state.idx):
+        # The total is only known once the generator has finished; until then
+        # measure progress against the frames generated so far.
+        total_frames = timeline.total
+        known_frames = timeline.known_length
         current_frame = st.session_state.idx + 1
-        progress_value = st.session_state.idx / max(total_frames - 1, 1)
+        progress_value = st.session_state.idx / max(known_frames - 1, 1)
         percentage = int(progress_value * 100)
+        frame_label = f"{current_frame}/{total_frames}" if total_frames is not None else f"{current_frame}/{known_frames}+"
         
         with progress_container:
             # Progress header with percentage
-            st.markdown(f"### 📊 Progress: {percentage}%")
+            if total_frames is not None:
+                st.markdown(f"### 📊 Progress: {percentage}%")
+            else:
+                st.markdown("### 📊 Progress: generating…")
             
             # Progress bar with frame counter
             prog_col1, prog_col2 = st.columns([5, 1])
             with prog_col1:
                 st.progress(progress_value)
             with prog_col2:
-                st.metric("Frame", f"{current_frame}/{total_frames}")
+                st.metric("Frame", frame_label)
             
+            if isinstance(timeline, Race):
+                st.markdown("---")
+                return
+
             # Current step information
-            if st.session_state.frames and 0 <= st.session_state.idx < len(st.session_state.frames):
-                current_info = st.session_state.frames[st.session_state.idx].get('info', 'Algorithm Step')
-                st.info(f"� **Current Step:** {current_info}")
+            current = timeline[st.session_state.idx]
+            current_info = current.get('info', 'Algorithm Step')
+            st.info(f"� **Current Step:** {current_info}")
+            if 'step' in current:
+                full = st.session_state.frames.total
+                st.caption(f"Step {current['step'] + 1:,} of {full:,} in the full run")
             
             st.markdown("---")  # Visual separator
 
+def render_race_at(race, tick: int):
+    """Render every lane of a race at ``tick`` as a grid of panels with live counters."""
+    colors = (
+        st.session_state.get("bar_color", "#4C78A8"),
+        st.session_state.get("highlight_color", "#EE994F"),
+    )
+    cache = get_frame_cache()
+    # one set of renderers per lane: lanes are drawn on parallel threads
+    if 'race_renderers' not in st.session_state:
+        st.session_state.race_renderers = {}
+    for lane in race.lanes:
+        st.session_state.race_renderers.setdefault(lane.key, {})
+    renderers = st.session_state.race_renderers
+
+    def render_lane(lane, step):
+        return cache.get_or_render(
+            frame_key(lane.run_key, step, colors),
+            lambda: render_png(lane.timeline, step, colors, renderers[lane.key]),
+        )
+
+    pngs = race.render(tick, render_lane)
+    counters = race.counters(tick)
+    frames = race.frames_at(tick)
+    with graph_container:
+        for row in range(0, len(race.lanes), RACE_COLUMNS):
+            cols = st.columns(RACE_COLUMNS)
+            for col, lane, png, counts, frame in zip(cols, race.lanes[row:], pngs[row:], counters[row:], frames[row:]):
+                with col:
+                    st.markdown(f"**{lane.name}**")
+                    st.image(png)
+                    metric_cols = st.columns(3)
+                    metric_cols[0].metric("Comparisons", f"{counts['compare']:,}")
+                    metric_cols[1].metric("Swaps", f"{counts['swap']:,}")
+                    metric_cols[2].metric("Writes", f"{counts['set']:,}")
+                    if tick >= lane.steps - 1:
+                        st.caption(f"🏁 Finished in {lane.steps:,} steps")
+                    else:
+                        st.caption(frame.get('info', 'Algorithm Step'))
+
+
+def render_metrics(frames, i: int):
+    """Live counters and timings of a run generated with "Collect metrics"."""
+    timeline = st.session_state.frames
+    metrics = getattr(timeline, 'metrics', None)
+    if metrics is None:
+        return
+    # sampled views point back to the full trace
+    step = frames[i].get('step', i)
+    with metrics_container:
+        with st.expander("📈 Metrics", expanded=True):
+            cols = st.columns(4)
+            if st.session_state.get('input_kind') != "grid":
+                counts = metrics.ops_until(timeline.trace, step + 1)
+                cols[0].metric("Comparisons", f"{counts['compare']:,}")
+                cols[1].metric("Swaps", f"{counts['swap']:,}")
+                cols[2].metric("Writes", f"{counts['set']:,}")
+            cols[3].metric("Recursion depth", f"{metrics.depths[step]}", help=f"Deepest: {metrics.max_depth}")
+            work_ms = metrics.work_seconds * 1000
+            record_ms = metrics.record_seconds * 1000
+            time_cols = st.columns(3)
+            time_cols[0].metric("Algorithm time", f"{work_ms:.1f} ms", help="Time spent inside the generator")
+            time_cols[1].metric("Recording time", f"{record_ms:.1f} ms", help="Time spent recording its frames")
+            time_cols[2].metric("Phases", f"{len(metrics.phase_starts):,}")
+            state = "" if metrics.done else " so far"
+            st.caption(f"Times cover the {metrics.frames:,} frames generated{state}.")
+            st.download_button(
+                "📥 Metrics report (JSON)",
+                json.dumps(metrics.report(), indent=2),
+                file_name="metrics.json",
+                mime="application/json",
+            )
+
+
 def render_frame_at(i: int):
     """Render the visualization frame at the given index."""
     # Update progress bar first
     update_progress_bar()
     
-    if st.session_state.frames and 0 <= i < len(st.session_state.frames):
+    timeline = playback_frames()
+    if isinstance(timeline, Race) and timeline.has_frame(i):
         try:
-            frame = st.session_state.frames[i]
-            fig = draw_state_fig(
-                frame.get('state', []),
-                frame.get('highlight', ()),
-                frame.get('info', 'Algorithm Step'),
-                bar_color=st.session_state.get("bar_color", "#4C78A8"),
-                highlight_color=st.session_state.get("highlight_color", "#EE994F"),
+            render_race_at(timeline, i)
+        except Exception as e:
+            with graph_container:
+                st.error(f"Error rendering frame: {str(e)}")
+    elif timeline is not None and timeline.has_frame(i):
+        try:
+            # One set of renderers per session: their figures are reused across reruns
+            if 'renderers' not in st.session_state:
+                st.session_state.renderers = {}
+            colors = (
+                st.session_state.get("bar_color", "#4C78A8"),
+                st.session_state.get("highlight_color", "#EE994F"),
+            )
+            cache = get_frame_cache()
+            run_key = playback_key()
+            png = cache.get_or_render(
+                frame_key(run_key, i, colors),
+                lambda: render_png(timeline, i, colors, st.session_state.renderers),
             )
 
             with graph_container:
-                st.pyplot(fig)
-            plt.close(fig)
+                st.image(png)
+            render_metrics(timeline, i)
+            # Render the next frames while this one is shown
+            prefetcher = st.session_state.get('prefetcher')
+            if prefetcher is not None:
+                prefetcher.schedule(frame_key(run_key, k, colors) for k in range(i + 1, i + 1 + PREFETCH_FRAMES))
         except Exception as e:
             with graph_container:
                 st.error(f"Error rendering frame: {str(e)}")
@@ -268,26 +717,98 @@ def render_frame_at(i: int):
         with progress_container:
             st.info("🎯 Select an algorithm and click 'Visualize!' to see the animation")
 
-# Display current frame or welcome message
-render_frame_at(st.session_state.idx)
+def render_browser_player():
+    """Send the whole trace to the browser once and let it play there."""
+    payload = browser_payload(st.session_state.get('run_key', ''), st.session_state.frames)
+    html = player_html(
+        payload,
+        bar_color=st.session_state.get("bar_color", "#4C78A8"),
+        highlight_color=st.session_state.get("highlight_color", "#EE994F"),
+        fps=playback_fps,
+    )
+    with graph_container:
+        # st.iframe replaces components.v1.html on newer Streamlit releases
+        if hasattr(st, "iframe"):
+            st.iframe(html, height=430)
+        else:
+            import streamlit.components.v1 as components
+            components.html(html, height=430)
+
 
-# Auto-advancing playback with smooth progress updates
-if st.session_state.playing and st.session_state.frames:
-    # Compute delay in seconds
-    delay = max(0.1, base_delay_ms / (1000.0 * st.session_state.multiplier))
-    
-    # Auto-advance to next frame
-    if st.session_state.idx < len(st.session_state.frames) - 1:
-        # Wait for the specified delay
-        time.sleep(delay)
-        # Advance to next frame
-        st.session_state.idx += 1
-        # Trigger rerun to update display
-        st.rerun()
-    else:
-        # Animation completed
+def advance_playback():
+    """Move to the frame that is due by the wall clock, skipping frames if rendering fell behind.
+
+    The clock starts when Play is pressed and restarts when the speed changes.
+    """
+    frames = playback_frames()
+    now = time.monotonic()
+    anchor = st.session_state.get('play_anchor')
+    if anchor is None or anchor[2] != playback_fps:
+        anchor = st.session_state.play_anchor = (now, st.session_state.idx, playback_fps)
+    started, first, fps = anchor
+    due = first + int((now - started) * fps)
+    if due > st.session_state.idx:
+        if not frames.has_frame(due):
+            due = max(frames.known_length - 1, st.session_state.idx)
+        st.session_state.skipped = st.session_state.get('skipped', 0) + max(due - st.session_state.idx - 1, 0)
+        st.session_state.idx = due
+    if not frames.has_frame(st.session_state.idx + 1):
         st.session_state.playing = False
-        st.session_state.idx = len(st.session_state.frames) - 1
-        with st.sidebar:
-            st.success("🎉 Animation Complete!")
+        st.session_state.finished = True
+
+
+# Announce the end of a run that finished during the last fragment rerun
+if st.session_state.pop('finished', False):
+    with st.sidebar:
+        st.success("🎉 Animation Complete!")
+    if is_race:
+        st.toast(f"🏁 {st.session_state.frames.standings()[0].name} finished first! 🎉")
+    elif is_grid:
+        found = st.session_state.frames.result is not None
+        st.toast("✅ Path found! 🎉" if found else "🚧 No path to the goal")
+    elif st.session_state.get('input_kind') == "sorted_array":
+        result = st.session_state.frames.result
+        st.toast(f"🎯 Found at index {result:,}! 🎉" if result is not None else "🔍 Target not in the array")
+    else:
         st.toast("✅ Array sorted successfully! 🎉")
+
+
+@st.fragment(run_every=1.0 / playback_fps if st.session_state.playing else None)
+def visualization():
+    """Progress, the current frame and metrics.
+
+    While playing, the browser reruns only this fragment once per frame
+    interval, so no server thread sleeps between frames and Pause takes
+    effect on its next click.
+    """
+    global progress_container, graph_container, metrics_container
+    progress_container = st.container()
+    graph_container = st.container()
+    metrics_container = st.container()
+    playing = st.session_state.playing and st.session_state.frames is not None
+    if playing:
+        advance_playback()
+
+    # Display current frame or welcome message
+    if playback_mode == BROWSER_PLAYBACK and st.session_state.frames is not None and not server_only:
+        render_browser_player()
+    else:
+        if playback_mode == BROWSER_PLAYBACK and server_only:
+            kind = "Races" if is_race else "Grid runs" if is_grid else "Searches over long arrays"
+            with progress_container:
+                st.info(f"{kind} play frame by frame on the server.")
+        render_frame_at(st.session_state.idx)
+        skipped = st.session_state.get('skipped', 0)
+        if playing and skipped:
+            with progress_container:
+                plural = "s" if skipped != 1 else ""
+                st.caption(f"⏩ {skipped:,} frame{plural} skipped to keep up with {st.session_state.multiplier}x")
+
+    if st.session_state.get('finished'):
+        # rerun the whole page to update the controls and announce the end
+        st.rerun()
+
+
+visualization()
+# the page is out; load the renderers before the first frame asks for them
+preload_renderers()
@@ -1,8 +1,47 @@
+import random
+import sys
 import unittest
+from unittest import mock
+
+import numpy as np
+
 from algorithms.bubble_sort import bubble_sort
 from algorithms.insertion_sort import insertion_sort
 from algorithms.selection_sort import selection_sort
 from algorithms.binary_search import binary_search
+from algorithms.exponential_search import exponential_search
+from algorithms.fibonacci_search import fibonacci_search
+from algorithms.interpolation_search import interpolation_search
+from algorithms.quick_sort import quick_sort
+from algorithms.quick_sort_hoare import quick_sort_hoare
+from algorithms.quick_sort_three_way import quick_sort_three_way
+from algorithms.introsort import introsort
+from algorithms.parallel_merge_sort import chunk_bounds, parallel_merge_sort
+from algorithms.counting_sort import MAX_RANGE, counting_sort
+from algorithms.radix_sort_lsd import radix_sort_lsd
+from algorithms.radix_sort_msd import radix_sort_msd
+from algorithms.bucket_sort import bucket_index, bucket_sort
+from algorithms.bfs_pathfinding import bfs_pathfinding
+from algorithms.astar_pathfinding import astar_pathfinding
+from algorithms.dijkstra_pathfinding import dijkstra_pathfinding
+from algorithms.bidirectional_bfs import bidirectional_bfs
+from algorithms.jump_point_search import jump_point_search
+from utils.grid import random_grid
+from utils.trace import record_trace
+
+GRID_SEARCHES = (astar_pathfinding, dijkstra_pathfinding, bidirectional_bfs, jump_point_search)
+QUICK_SORTS = (quick_sort, quick_sort_hoare, quick_sort_three_way, introsort)
+COUNTING_SORTS = (counting_sort, radix_sort_lsd, radix_sort_msd, bucket_sort)
+
+
+def run(gen):
+    """Frames of a generator plus its return value."""
+    frames = []
+    while True:
+        try:
+            frames.append(next(gen))
+        except StopIteration as stop:
+            return frames, stop.value
 
 
 class TestAlgorithms(unittest.TestCase):
@@ -28,6 +67,281 @@ class TestAlgorithms(unittest.TestCase):
         # last 'found' frame has info 'found'
         self.assertTrue(any(f['info']=='found' for f in frames))
 
+    def test_bfs_pathfinding(self):
+        grid = [[0, 0, 0, 0],
+                [1, 1, 0, 1],
+                [0, 0, 0, 0],
+                [0, 1, 1, 0]]
+        frames, path = run(bfs_pathfinding(grid, (0, 0), (3, 0)))
+        self.assertEqual(path, [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2), (2, 1), (2, 0), (3, 0)])
+        self.assertEqual(frames[-1]['path'], path)
+        # deltas: every cell is discovered once and expanded at most once
+        found = [i for f in frames for i in f['frontier']]
+        expanded = [i for f in frames for i in f['visited']]
+        self.assertEqual(len(found), len(set(found)))
+        self.assertTrue(set(expanded) <= set(found))
+        self.assertNotIn(4, found)  # wall at (1, 0)
+
+    def test_bfs_pathfinding_unreachable(self):
+        frames, path = run(bfs_pathfinding([[0, 1], [1, 0]], (0, 0), (1, 1)))
+        self.assertIsNone(path)
+        self.assertEqual(frames[-1]['info'], 'not found')
+
+    def test_bfs_pathfinding_large_grid(self):
+        n = 300
+        frames, path = run(bfs_pathfinding([[0] * n for _ in range(n)], (0, 0), (n - 1, n - 1)))
+        self.assertEqual(len(path), 2 * n - 1)
+        self.assertEqual(len(frames), n * n + 2)
+
+    def test_grid_searches_match_bfs(self):
+        for seed in range(60):
+            grid = random_grid(12, 15, 0.3, seed=seed)
+            start, goal = (seed % 12, 0), (11 - seed % 12, 14)
+            grid[start[0]][start[1]] = grid[goal[0]][goal[1]] = 0
+            _, shortest = run(bfs_pathfinding(grid, start, goal))
+            for search in GRID_SEARCHES:
+                with self.subTest(search=search.__name__, seed=seed):
+                    frames, path = run(search(grid, start, goal))
+                    if shortest is None:
+                        self.assertIsNone(path)
+                        continue
+                    self.assertEqual(len(path), len(shortest))
+                    self.assertEqual((path[0], path[-1]), (start, goal))
+                    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+                        self.assertEqual(abs(r0 - r1) + abs(c0 - c1), 1)
+                        self.assertEqual(grid[r1][c1], 0)
+                    self.assertEqual(frames[-1]['path'], path)
+
+    def test_search_stats(self):
+        n = 60
+        grid = [[0] * n for _ in range(n)]
+        expanded = {}
+        for search in (bfs_pathfinding,) + GRID_SEARCHES:
+            frames, _ = run(search(grid, (0, 0), (n - 1, n - 1)))
+            stats = frames[-1]['stats']
+            self.assertEqual(stats['expanded'], sum(len(f['visited']) for f in frames))
+            self.assertGreater(stats['seconds'], 0)
+            expanded[search.__name__] = stats['expanded']
+        self.assertLess(expanded['astar_pathfinding'], expanded['bfs_pathfinding'] // 10)
+        self.assertLess(expanded['jump_point_search'], expanded['astar_pathfinding'])
+
+    def test_weighted_cells(self):
+        # the direct route along the top row is expensive; the detour is cheaper
+        grid = [[0] * 5 for _ in range(3)]
+        weights = [[1, 9, 9, 9, 1],
+                   [1, 1, 1, 1, 1],
+                   [1, 1, 1, 1, 1]]
+        for search in (astar_pathfinding, dijkstra_pathfinding):
+            _, path = run(search(grid, (0, 0), (0, 4), weights=weights))
+            self.assertEqual(sum(weights[r][c] for r, c in path[1:]), 6)
+        with self.assertRaises(ValueError):
+            list(dijkstra_pathfinding(grid, (0, 0), (0, 4), weights=[[0] * 5] * 3))
+
+
+class TestQuickSorts(unittest.TestCase):
+    INPUTS = {
+        'random': random.Random(1).choices(range(100), k=60),
+        'duplicates': random.Random(2).choices(range(3), k=60),
+        'sorted': list(range(60)),
+        'reversed': list(range(60, 0, -1)),
+        'tiny': [1],
+        'empty': [],
+    }
+
+    def test_sorts_in_place_without_copies(self):
+        for algo in QUICK_SORTS:
+            for name, arr in self.INPUTS.items():
+                with self.subTest(algo=algo.__name__, input=name):
+                    frames = list(algo(arr, seed=0))
+                    self.assertEqual(frames[-1]['state'], sorted(arr))
+                    self.assertTrue(all(f['state'] is frames[0]['state'] for f in frames))
+                    for f in frames[1:-1]:
+                        lo, hi = f['range']
+                        self.assertTrue(all(lo <= k <= hi for k in f['highlight']))
+
+    def test_seed_reproduces_trace(self):
+        arr = self.INPUTS['random']
+        for algo in QUICK_SORTS:
+            with self.subTest(algo=algo.__name__):
+                first = [(f['info'], f['op']) for f in algo(arr, seed=7)]
+                self.assertEqual(first, [(f['info'], f['op']) for f in algo(arr, seed=7)])
+                self.assertNotEqual(first, [(f['info'], f['op']) for f in algo(arr, seed=8)])
+
+    def test_deep_partitions_do_not_recurse(self):
+        # sorted input with a fixed last-element pivot would recurse n deep
+        arr = list(range(2000))
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            for algo in QUICK_SORTS:
+                with self.subTest(algo=algo.__name__):
+                    *_, last = algo(arr, seed=0)
+                    self.assertEqual(last['state'], arr)
+        finally:
+            sys.setrecursionlimit(limit)
+
+    def test_three_way_groups_equal_keys(self):
+        arr = self.INPUTS['duplicates']
+        passes = sum(1 for f in quick_sort_three_way(arr, seed=0) if f.get('pass'))
+        self.assertLessEqual(passes, 3)
+
+    def test_introsort_falls_back_to_heap_sort(self):
+        arr = self.INPUTS['random']
+        frames = list(introsort(arr, seed=0, depth_limit=0))
+        self.assertEqual(frames[-1]['state'], sorted(arr))
+        self.assertTrue(frames[1]['info'].startswith('heap:'))
+        self.assertFalse(any(f['info'].startswith('heap:') for f in introsort(arr, seed=0)))
+
+
+class TestParallelMergeSort(unittest.TestCase):
+    def test_chunks(self):
+        self.assertEqual(chunk_bounds(10, 4), [(0, 1), (2, 4), (5, 6), (7, 9)])
+        self.assertEqual(chunk_bounds(2, 4), [(0, 0), (1, 1)])
+        self.assertEqual(chunk_bounds(0, 4), [])
+        with self.assertRaises(ValueError):
+            chunk_bounds(10, 0)
+
+    def test_workers_take_turns_on_their_ranges(self):
+        arr = random.Random(3).choices(range(50), k=30)
+        frames = list(parallel_merge_sort(arr, workers=3))
+        self.assertEqual(frames[-1]['state'], sorted(arr))
+        self.assertEqual([f['info'] for f in frames[:3]],
+                         ['worker 0: sorts 0-9', 'worker 1: sorts 10-19', 'worker 2: sorts 20-29'])
+        # until the first merge, every op stays inside the range of the worker that made it
+        chunk_ops = frames[:next(k for k, f in enumerate(frames) if 'merges' in f['info'])]
+        for f in chunk_ops:
+            if f['op']:
+                lo, hi = chunk_bounds(30, 3)[int(f['info'].split(':')[0].split()[1])]
+                self.assertTrue(lo <= f['op'][1] <= hi)
+        merges = [f['info'] for f in frames if 'merges' in f['info']]
+        self.assertEqual(merges, ['worker 0: merges 0-19', 'worker 0: merges 0-29'])
+
+
+class TestCountingSorts(unittest.TestCase):
+    INPUTS = {
+        'random': random.Random(1).choices(range(1000), k=60),
+        'negative': random.Random(2).choices(range(-500, 500), k=60),
+        'duplicates': random.Random(3).choices(range(3), k=60),
+        'reversed': list(range(60, 0, -1)),
+        'tiny': [1],
+        'empty': [],
+    }
+
+    def test_sorts_in_place(self):
+        for algo in COUNTING_SORTS:
+            for name, arr in self.INPUTS.items():
+                for detail in (True, False):
+                    with self.subTest(algo=algo.__name__, input=name, detail=detail):
+                        frames = list(algo(arr, detail=detail))
+                        self.assertEqual(frames[-1]['state'], sorted(arr))
+                        self.assertTrue(all(f['state'] is frames[0]['state'] for f in frames))
+                        self.assertEqual(record_trace(algo(arr, detail=detail)).final_state(), sorted(arr))
+
+    def test_wide_values(self):
+        arr = [2 ** 62, -2 ** 62, 5, 0, 2 ** 62, -1]
+        for algo in (radix_sort_lsd, radix_sort_msd, bucket_sort):
+            with self.subTest(algo=algo.__name__):
+                self.assertEqual(list(algo(arr))[-1]['state'], sorted(arr))
+        # bad input fails before the first frame
+        for gen in (counting_sort([0, MAX_RANGE]), radix_sort_lsd(arr, base=1), radix_sort_msd([0.5, 1]),
+                    bucket_sort(['a'])):
+            with self.assertRaises(ValueError):
+                next(gen)
+
+    def test_one_frame_per_pass(self):
+        arr = random.Random(4).choices(range(1000), k=5000)
+        for algo, passes in ((counting_sort, 1), (radix_sort_lsd, 3), (bucket_sort, 2)):
+            with self.subTest(algo=algo.__name__):
+                frames = list(algo(arr))
+                self.assertEqual(len(frames), passes + 2)
+                self.assertTrue(all(f['pass'] and 'op' not in f for f in frames[1:-1]))
+        # buckets of one value need no more digits
+        self.assertEqual(len(list(radix_sort_msd([300, 100, 200, 0], detail=False))), 3)
+        self.assertEqual(len(list(radix_sort_lsd([300, 100, 200, 0], detail=False))), 5)
+
+    def test_detail_frames_replay(self):
+        arr = self.INPUTS['negative']
+        for algo in COUNTING_SORTS:
+            with self.subTest(algo=algo.__name__):
+                expected = [list(f['state']) for f in algo(arr, detail=True)]
+                self.assertEqual([f['state'] for f in record_trace(algo(arr, detail=True))], expected)
+        frames = list(radix_sort_lsd([21, 3, 12], detail=True))
+        self.assertEqual(frames[1]['info'], 'digit 0 (place 1): counts [1, 0, 0, 0, 0, 0, 0, 0, 1, 1]')
+        self.assertEqual(frames[2]['info'], '21 (key 8) goes to 1')
+        for f in bucket_sort(self.INPUTS['duplicates'], buckets=4, detail=True):
+            if 'range' in f:
+                lo, hi = f['range']
+                self.assertTrue(all(lo <= k <= hi for k in f['highlight']))
+
+    def test_wide_keys_are_sorted_by_counting(self):
+        rng = random.Random(6)
+        inputs = {
+            'ints': [rng.randrange(10 ** 12) for _ in range(70000)],
+            'floats': [rng.gauss(0, 1e6) for _ in range(70000)],
+        }
+        argsort = np.argsort
+        sorted_dtypes = set()
+
+        def counting_argsort(keys, **kwargs):
+            sorted_dtypes.add(np.asarray(keys).dtype)
+            return argsort(keys, **kwargs)
+
+        # bucket keys (one bucket per value) and MSD's bucket-and-digit keys outgrow 16 bits
+        with mock.patch.object(np, 'argsort', counting_argsort):
+            for algo, arr in ((bucket_sort, inputs['ints']), (bucket_sort, inputs['floats']),
+                              (radix_sort_msd, inputs['ints'])):
+                with self.subTest(algo=algo.__name__, floats=isinstance(arr[0], float)):
+                    self.assertEqual(list(algo(arr, detail=False))[-1]['state'], sorted(arr))
+        self.assertEqual(sorted_dtypes, {np.dtype(np.uint8), np.dtype(np.uint16)})
+
+    def test_bucket_index_keeps_order(self):
+        values = np.array(sorted(random.Random(5).choices(range(-10 ** 12, 10 ** 12), k=500)))
+        index = bucket_index(values, 37)
+        self.assertEqual(index.min(), 0)
+        self.assertEqual(index.max(), 36)
+        self.assertTrue(np.all(np.diff(index) >= 0))
+
+
+class TestSearches(unittest.TestCase):
+    SEARCHES = (binary_search, exponential_search, interpolation_search, fibonacci_search)
+
+    def run_search(self, search, arr, target):
+        gen = search(arr, target)
+        frames = []
+        while True:
+            try:
+                frames.append(next(gen))
+            except StopIteration as stop:
+                return stop.value, frames
+
+    def test_every_target(self):
+        rng = random.Random(5)
+        arrays = [[], [4], sorted(rng.choices(range(20), k=30)), sorted(rng.sample(range(1000), 50)),
+                  sorted(int(1.4 ** rng.uniform(0, 30)) for _ in range(40))]
+        for arr in arrays:
+            for target in set(arr) | {-1, 0, 5, 21, 999, 10 ** 6} | {v + 1 for v in arr}:
+                for search in self.SEARCHES:
+                    with self.subTest(search=search.__name__, n=len(arr), target=target):
+                        result, frames = self.run_search(search, arr, target)
+                        if target in arr:
+                            self.assertEqual(arr[result], target)
+                            self.assertEqual(frames[-1]['info'], 'found')
+                        else:
+                            self.assertIsNone(result)
+                            self.assertEqual(frames[-1]['info'], 'not found')
+                        self.assertTrue(all(f['state'] is arr for f in frames))
+                        self.assertTrue(all(0 <= f['op'][1] < len(arr) for f in frames if f['op']))
+
+    def test_probe_counts(self):
+        arr = list(range(0, 2048, 2))
+        probes = {search.__name__: sum(f['op'] is not None for f in self.run_search(search, arr, 6)[1])
+                  for search in self.SEARCHES}
+        # a target near the front: exponential search gallops there in a few probes
+        self.assertLess(probes['exponential_search'], probes['binary_search'])
+        # evenly spaced keys: interpolation lands on the target at once
+        self.assertEqual(probes['interpolation_search'], 1)
+        self.assertLessEqual(probes['fibonacci_search'], 16)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,38 @@
+import json
+import unittest
+from benchmarks.bench import compare, make_array, run
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_small_run(self):
+        results = run(['bubble_sort', 'binary_search', 'bfs_pathfinding'], sizes=(20,), render_sizes=(5,),
+                      render_frames=2)
+        json.dumps(results)
+        gens = {(r['algorithm'], r['engine'], r['distribution']) for r in results['generators']}
+        self.assertIn(('bubble_sort', 'fast', 'few_unique'), gens)
+        self.assertIn(('bfs_pathfinding', 'generator', 'walls'), gens)
+        bubble = [r for r in results['generators'] if r['algorithm'] == 'bubble_sort']
+        self.assertEqual(len({r['frames'] for r in bubble if r['distribution'] == 'sorted'}), 1)
+        self.assertTrue(all(r['peak_bytes'] > 0 for r in results['memory']))
+        self.assertEqual({r['function'] for r in results['rendering']},
+                         {'draw_state_fig', 'draw_state_fig_fresh', 'draw_state'})
+
+    def test_distributions(self):
+        import random
+        self.assertEqual(make_array(5, 'reversed', random.Random(0)), [5, 4, 3, 2, 1])
+        self.assertLessEqual(len(set(make_array(100, 'few_unique', random.Random(0)))), 5)
+
+    def test_compare_flags_regressions(self):
+        old = {'rendering': [{'function': 'draw_state', 'n': 10, 'ms_per_frame': 10.0}],
+               'generators': [{'algorithm': 'a', 'n': 1, 'distribution': 'random', 'engine': 'generator',
+                               'frames_per_sec': 100.0}]}
+        new = {'rendering': [{'function': 'draw_state', 'n': 10, 'ms_per_frame': 15.0}],
+               'generators': [{'algorithm': 'a', 'n': 1, 'distribution': 'random', 'engine': 'generator',
+                               'frames_per_sec': 120.0}]}
+        lines = compare(new, old)
+        self.assertEqual(len(lines), 1)
+        self.assertIn('draw_state', lines[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import json
+import unittest
+from algorithms.merge_sort import merge_sort
+from utils.trace import SET, SWAP, record_trace
+from visualizers.browser_player import decode_payload, player_html, trace_payload
+
+
+class TestBrowserPlayer(unittest.TestCase):
+    def test_payload_replays_to_trace_states(self):
+        arr = [7, -2, 5, 5, 0, 9, 1]
+        trace = record_trace(merge_sort(arr))
+        payload = json.loads(json.dumps(trace_payload(trace)))
+        cols = decode_payload(payload)
+        state = list(cols['initial'])
+        for k in range(payload['length']):
+            kind, i, j = cols['kinds'][k], cols['first'][k], cols['second'][k]
+            if kind == SWAP:
+                state[i], state[j] = state[j], state[i]
+            elif kind == SET:
+                state[i] = cols['values'][j]
+            self.assertEqual(state, trace[k]['state'])
+            self.assertEqual(payload['infos'][cols['info_ids'][k]], trace[k]['info'])
+
+    def test_html_embeds_payload_safely(self):
+        trace = record_trace([{'state': [1, 2], 'highlight': (), 'info': '</script>'}])
+        html = player_html(trace_payload(trace))
+        self.assertEqual(html.count('</script>'), 1)
+        self.assertIn('<\\/script>', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+from matplotlib.colors import to_rgba
+from utils.draw_helpers import BarRenderer
+
+
+class TestBarRenderer(unittest.TestCase):
+    def test_updates_bars_in_place(self):
+        renderer = BarRenderer(bar_color='blue', highlight_color='red')
+        fig = renderer.update([3, 1, 2], (0, 2), 'first')
+        bars = renderer._bars
+        self.assertIs(renderer.update([1, 3, 2], (1,), 'second'), fig)
+        self.assertIs(renderer._bars, bars)
+        tops = [path.vertices[1, 1] for path in bars.get_paths()]
+        self.assertEqual(tops, [1, 3, 2])
+        faces = bars.get_facecolor()
+        self.assertTrue(np.allclose(faces[1], to_rgba('red')))
+        self.assertTrue(np.allclose(faces[0], to_rgba('blue')))
+        self.assertEqual([t.get_text() for t in renderer._labels], ['1', '3', '2'])
+        self.assertEqual(renderer.ax.get_title(), 'second')
+        self.assertTrue(renderer.to_png().startswith(b'\x89PNG'))
+
+    def test_skips_labels_for_large_arrays(self):
+        renderer = BarRenderer(annotate_limit=10)
+        renderer.update(list(range(50)), (3,), '')
+        self.assertEqual(renderer._labels, [])
+        self.assertEqual(len(renderer._bars.get_paths()), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+from PIL import Image
+from visualizers.export import export_animation, main
+
+
+class TestExport(unittest.TestCase):
+    def test_gif_in_process_and_pool(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for workers in (1, 2):
+                path = os.path.join(tmp, f'bubble{workers}.gif')
+                count = export_animation('bubble_sort', [3, 1, 2], path, fps=5, workers=workers,
+                                         chunk_size=2, figsize=(3, 2))
+                with Image.open(path) as im:
+                    self.assertEqual(im.n_frames, count)
+                    self.assertEqual(im.info['duration'], 200)
+
+    def test_cli_with_target(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'search.gif')
+            self.assertEqual(main(['binary_search', '1,3,5,7', '--target', '7', '-o', path, '--workers', '1']), 0)
+            self.assertTrue(os.path.getsize(path) > 0)
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            export_animation('bubble_sort', [2, 1], 'out.avi')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from algorithms.bubble_sort import bubble_sort
+from algorithms.fast_trace import FAST_ENGINES
+from algorithms.insertion_sort import insertion_sort
+from algorithms.merge_sort import merge_sort
+from algorithms.parallel_merge_sort import parallel_merge_sort
+from algorithms.quick_sort import quick_sort
+from algorithms.selection_sort import selection_sort
+from utils.trace import record_trace
+
+GENERATORS = {
+    'bubble_sort': bubble_sort,
+    'insertion_sort': insertion_sort,
+    'selection_sort': selection_sort,
+    'merge_sort': merge_sort,
+    'quick_sort': quick_sort,
+}
+
+
+def ops(trace):
+    return [(trace.op_at(k), trace.highlight_at(k), trace.info_at(k)) for k in range(len(trace))]
+
+
+class TestFastTrace(unittest.TestCase):
+    def check(self, arr, seed=0):
+        self.check_parallel(arr, workers=3)
+        for key, algo in GENERATORS.items():
+            params = {'seed': seed} if key == 'quick_sort' else {}
+            expected = record_trace(algo(arr, **params))
+            fast = FAST_ENGINES[key](arr, **params)
+            self.assertEqual(ops(fast), ops(expected), key)
+            self.assertEqual(fast.op_counts(), expected.op_counts(), key)
+            self.assertEqual(fast.final_state(), expected.final_state(), key)
+            self.assertEqual(list(fast.pass_starts), list(expected.pass_starts), key)
+            if len(expected):
+                mid = len(expected) // 2
+                self.assertEqual(fast[mid]['state'], expected[mid]['state'], key)
+
+    def check_parallel(self, arr, workers, executor=None):
+        expected = record_trace(parallel_merge_sort(arr, workers=workers))
+        fast = FAST_ENGINES['parallel_merge_sort'](arr, workers=workers, executor=executor)
+        self.assertEqual(ops(fast), ops(expected))
+        self.assertEqual(list(fast.pass_starts), list(expected.pass_starts))
+        self.assertEqual(fast.final_state(), sorted(arr))
+        if len(expected):
+            mid = len(expected) // 2
+            self.assertEqual(fast[mid]['state'], expected[mid]['state'])
+
+    def test_parallel_merge_sort_in_worker_processes(self):
+        rng = random.Random(7)
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            for n, workers in ((1, 4), (9, 4), (100, 1), (100, 4), (257, 5)):
+                with self.subTest(n=n, workers=workers):
+                    self.check_parallel([rng.randint(0, 20) for _ in range(n)], workers, executor=pool)
+
+    def test_matches_generators(self):
+        rng = random.Random(3)
+        for n in (0, 1, 2, 5, 17, 40, 90):
+            # narrow value ranges give plenty of ties
+            for top in (3, 1000):
+                self.check([rng.randint(0, top) for _ in range(n)], seed=n)
+
+    def test_sorted_reversed_and_floats(self):
+        self.check(list(range(50)))
+        self.check(list(range(50, 0, -1)))
+        rng = random.Random(4)
+        self.check([rng.uniform(-5, 5) for _ in range(60)])
+
+    def test_every_state_replays(self):
+        rng = random.Random(5)
+        arr = [rng.randint(0, 99) for _ in range(120)]
+        expected = record_trace(merge_sort(arr))
+        self.assertEqual([f['state'] for f in FAST_ENGINES['merge_sort'](arr)], [f['state'] for f in expected])
+        expected = record_trace(quick_sort(arr, seed=1))
+        self.assertEqual([f['state'] for f in FAST_ENGINES['quick_sort'](arr, seed=1)],
+                         [f['state'] for f in expected])
+
+    def test_large_input(self):
+        rng = random.Random(6)
+        arr = [rng.randint(0, 10 ** 6) for _ in range(1500)]
+        trace = FAST_ENGINES['bubble_sort'](arr)
+        self.assertEqual(trace.final_state(), sorted(arr))
+        self.assertEqual(trace.op_counts()['compare'], 1500 * 1499 // 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from utils.algo_interface import input_fingerprint
+from utils.frame_cache import FrameCache, FramePrefetcher, frame_key
+
+
+class TestFrameCache(unittest.TestCase):
+    def test_lru_eviction_by_bytes(self):
+        cache = FrameCache(max_bytes=30)
+        cache.put('a', b'x' * 10)
+        cache.put('b', b'x' * 10)
+        cache.put('c', b'x' * 10)
+        self.assertEqual(cache.get('a'), b'x' * 10)  # 'a' is now most recent
+        cache.put('d', b'x' * 10)
+        self.assertNotIn('b', cache)
+        self.assertIn('a', cache)
+        self.assertEqual(cache.nbytes, 30)
+        cache.put('huge', b'x' * 31)
+        self.assertNotIn('huge', cache)
+
+    def test_prefetcher_fills_cache(self):
+        cache = FrameCache()
+        rendered = []
+
+        def render(key):
+            rendered.append(key)
+            return str(key[1]).encode()
+
+        prefetcher = FramePrefetcher(cache, render)
+        keys = [frame_key('run', i, ('red', 'blue')) for i in range(5)]
+        prefetcher.schedule(keys)
+        prefetcher.wait()
+        prefetcher.schedule(keys)
+        prefetcher.wait()
+        prefetcher.shutdown()
+        self.assertEqual(sorted(rendered), keys)
+        self.assertEqual(cache.get(keys[3]), b'3')
+
+    def test_fingerprint(self):
+        self.assertEqual(input_fingerprint('Bubble Sort', [1, 2]), input_fingerprint('Bubble Sort', [1, 2]))
+        self.assertNotEqual(input_fingerprint('Bubble Sort', [1, 2]), input_fingerprint('Merge Sort', [1, 2]))
+        self.assertNotEqual(input_fingerprint('Binary Search', [1, 2], target=1),
+                            input_fingerprint('Binary Search', [1, 2], target=2))
+
+
+if __name__ == '__main__':
+    unittest.main()
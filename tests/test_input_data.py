@@ -0,0 +1,77 @@
+import io
+import unittest
+
+import numpy as np
+
+from utils.input_data import (DATASETS, MAX_VALUES, estimate_frames, generate, max_input_size, parse_text,
+                              preview, read_csv, read_npy, read_raw, read_upload)
+
+
+class TestParsing(unittest.TestCase):
+    def test_text(self):
+        self.assertEqual(parse_text("5, 2,4\n1 -3,,").tolist(), [5, 2, 4, 1, -3])
+        self.assertEqual(len(parse_text("  ")), 0)
+        for bad in ("1,x", "1.5", "99999999999999999999"):
+            with self.assertRaises(ValueError):
+                parse_text(bad)
+        with self.assertRaises(ValueError):
+            parse_text("1,2,3", max_values=2)
+
+    def test_csv_in_chunks(self):
+        data = np.random.default_rng(0).integers(-10 ** 6, 10 ** 6, 500)
+        text = "value\n" + "\n".join(f"{v}," for v in data)
+        for chunk in (1, 7, 1 << 20):
+            with self.subTest(chunk=chunk):
+                values = read_csv(io.BytesIO(text.encode()), chunk_bytes=chunk)
+                np.testing.assert_array_equal(values, data)
+        with self.assertRaises(ValueError):
+            read_csv(io.BytesIO(text.encode()), max_values=499, chunk_bytes=64)
+        with self.assertRaises(ValueError):
+            read_csv(io.BytesIO(b"1,2\n1e3"))
+
+    def test_npy_and_raw(self):
+        data = np.array([[3, -1], [2, 0]], dtype=np.int16)
+        buf = io.BytesIO()
+        np.save(buf, data)
+        buf.seek(0)
+        self.assertEqual(read_upload(buf, "data.NPY").tolist(), [3, -1, 2, 0])
+        buf = io.BytesIO()
+        np.save(buf, np.array([1.0, 2.5]))
+        buf.seek(0)
+        with self.assertRaises(ValueError):
+            read_npy(buf)
+        raw = np.array([7, -8, 9], dtype="<i4").tobytes()
+        self.assertEqual(read_upload(io.BytesIO(raw), "data.bin").tolist(), [7, -8, 9])
+        with self.assertRaises(ValueError):
+            read_raw(io.BytesIO(raw[:-1]), "int32")
+        with self.assertRaises(ValueError):
+            read_raw(io.BytesIO(raw), "int32", max_values=2)
+
+
+class TestDatasets(unittest.TestCase):
+    def test_generate(self):
+        for kind in DATASETS:
+            with self.subTest(kind=kind):
+                values = generate(kind, 1000, seed=4)
+                self.assertEqual((len(values), values.dtype), (1000, np.int64))
+                np.testing.assert_array_equal(values, generate(kind, 1000, seed=4))
+        self.assertLess(np.count_nonzero(np.diff(generate("nearly sorted", 1000, seed=1)) < 0), 100)
+        self.assertEqual(len(np.unique(generate("few unique", 1000))), 5)
+        with self.assertRaises(ValueError):
+            generate("random", MAX_VALUES + 1)
+
+    def test_budget(self):
+        self.assertEqual(estimate_frames("O(n²)", 100), 10000)
+        budget = 10 ** 6
+        n = max_input_size("O(n²)", budget)
+        self.assertEqual(n, 1000)
+        self.assertGreater(max_input_size("O(n log n) average, O(n²) worst", budget), 20000)
+        self.assertEqual(max_input_size("O(log n)", budget), MAX_VALUES)
+
+    def test_preview(self):
+        self.assertEqual(preview([1, 2, 3]), "[1, 2, 3]")
+        self.assertEqual(preview(range(5), limit=2), "[0, 1, …]")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import json
+import os
+import tempfile
+import unittest
+
+from algorithms.binary_search import binary_search
+from algorithms.bubble_sort import bubble_sort
+from algorithms.merge_sort import merge_sort
+from algorithms.quick_sort import quick_sort
+from utils import instrumentation
+from utils.instrumentation import RunMetrics, instrument, op_counts_until
+from utils.timeline import Timeline
+from utils.trace import record_trace
+
+DATA = [9, 4, 7, 1, 8, 2, 6, 3]
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_frames_and_result_unchanged(self):
+        metrics = RunMetrics()
+        timeline = Timeline(instrument(binary_search([1, 3, 5, 7, 9], 7), metrics), metrics=metrics)
+        self.assertEqual(list(timeline), list(record_trace(binary_search([1, 3, 5, 7, 9], 7))))
+        self.assertEqual(timeline.result, 3)
+        self.assertTrue(metrics.done)
+        self.assertGreater(metrics.record_seconds, 0)
+
+    def test_counts_match_trace(self):
+        for algo in (bubble_sort, merge_sort):
+            with self.subTest(algo=algo.__name__):
+                metrics = RunMetrics()
+                trace = Timeline(instrument(algo(list(DATA)), metrics), metrics=metrics).run_to_end()
+                ops = [f['op'][0] if f['op'] else 'note' for f in algo(list(DATA))]
+                self.assertEqual(metrics.ops, {name: ops.count(name) for name in metrics.ops})
+                self.assertEqual(metrics.frames, len(trace))
+                phases = metrics.phases()
+                self.assertEqual([p["start"] for p in phases], [0] + [s for s in trace.pass_starts if s])
+                self.assertEqual(sum(p["frames"] for p in phases), len(trace))
+                self.assertEqual(sum(p["ops"]["compare"] for p in phases), metrics.ops["compare"])
+                json.dumps(metrics.report())
+
+    def test_recursion_depth(self):
+        metrics = RunMetrics()
+        list(instrument(merge_sort(list(DATA)), metrics))
+        # merge_sort -> three halvings -> _merge
+        self.assertEqual(metrics.max_depth, 4)
+        self.assertEqual(len(metrics.depths), metrics.frames)
+        metrics = RunMetrics()
+        list(instrument(bubble_sort(list(DATA)), metrics))
+        self.assertEqual(metrics.max_depth, 0)
+        # quick sort keeps its own stack and reports depth on each frame
+        metrics = RunMetrics()
+        frames = list(instrument(quick_sort(list(DATA), seed=0), metrics))
+        self.assertEqual(metrics.max_depth, max(f.get('depth', 0) for f in frames))
+        self.assertGreater(metrics.max_depth, 1)
+
+    def test_op_counts_until(self):
+        trace = record_trace(bubble_sort(list(DATA)))
+        self.assertEqual(op_counts_until(trace, len(trace)), trace.op_counts())
+        # the first frame is recorded as a note
+        self.assertEqual(op_counts_until(trace, 2)["compare"], 1)
+        self.assertEqual(sum(op_counts_until(trace, 0).values()), 0)
+        metrics = RunMetrics()
+        trace = Timeline(instrument(merge_sort(list(DATA)), metrics)).run_to_end()
+        # merge sort opens with a comparison
+        self.assertEqual(metrics.ops_until(trace, 1)["compare"], 1)
+        self.assertEqual(metrics.ops_until(trace, len(trace)), metrics.ops)
+
+    def test_uninstrumented_timeline(self):
+        self.assertIsNone(Timeline(bubble_sort([2, 1])).metrics)
+
+    def test_cli_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'report.json')
+            instrumentation.main(['merge_sort', '--random', '32', '-o', path])
+            with open(path) as fh:
+                report = json.load(fh)
+        self.assertEqual((report['algorithm'], report['n'], report['max_depth']), ('Merge Sort', 32, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import math
+import random
+import unittest
+from algorithms.binary_search import binary_search
+from algorithms.bubble_sort import bubble_sort
+from algorithms.merge_sort import merge_sort
+from utils.level_of_detail import (DURATION, EVERY_K, FRAME_BUDGET, PER_PASS, budget, every,
+                                   level_of_detail, per_pass)
+from utils.trace import record_trace
+
+
+class TestLevelOfDetail(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(2)
+        self.arr = [rng.randint(0, 50) for _ in range(30)]
+        self.trace = record_trace(bubble_sort(self.arr))
+
+    def test_every_k(self):
+        view = every(self.trace, 10)
+        self.assertEqual(view.step_at(0), 0)
+        self.assertEqual(view.step_at(1), 9)
+        self.assertEqual(view[-1]['state'], sorted(self.arr))
+        self.assertEqual(view[1]['state'], self.trace[9]['state'])
+        self.assertEqual(view[1]['ops']['compare'] + view[1]['ops']['swap'], 9)
+
+    def test_counts_cover_every_frame(self):
+        for view in (every(self.trace, 7), per_pass(self.trace), budget(self.trace, 40)):
+            totals = view.op_counts.sum(axis=0).tolist()
+            self.assertEqual(dict(zip(self.trace.op_counts(), totals)), self.trace.op_counts())
+
+    def test_per_pass(self):
+        view = per_pass(self.trace)
+        # start, the end of each pass but the last, and the final frame
+        self.assertEqual(len(view), len(self.arr))
+        after_first_pass = view[1]
+        self.assertEqual(after_first_pass['state'][-1], max(self.arr))
+        self.assertIn('compares', after_first_pass['info'])
+
+    def test_per_pass_merge_sort(self):
+        # a pass per level of the merge tree, not per merge
+        for n in (30, 1024, 1025):
+            with self.subTest(n=n):
+                merges = per_pass(record_trace(merge_sort(list(range(n, 0, -1)))))
+                self.assertEqual(len(merges), 1 + math.ceil(math.log2(n)))
+                self.assertEqual(merges[-1]['state'], list(range(1, n + 1)))
+
+    def test_per_pass_without_passes(self):
+        trace = record_trace(binary_search(list(range(20)), 7))
+        self.assertEqual(len(per_pass(trace)), len(trace))
+
+    def test_budget_and_duration(self):
+        self.assertEqual(len(budget(self.trace, 25)), 25)
+        self.assertEqual(len(level_of_detail(self.trace, DURATION, 10, fps=3)), 30)
+        self.assertEqual(len(level_of_detail(self.trace, FRAME_BUDGET, 10 ** 6)), len(self.trace))
+        self.assertEqual(level_of_detail(self.trace, EVERY_K, 5).step_at(1), 4)
+        self.assertEqual(len(level_of_detail(self.trace, PER_PASS)), len(self.arr))
+        with self.assertRaises(ValueError):
+            level_of_detail(self.trace, EVERY_K)
+
+
+if __name__ == '__main__':
+    unittest.main()
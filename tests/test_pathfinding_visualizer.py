@@ -0,0 +1,112 @@
+import unittest
+
+import matplotlib
+matplotlib.use("Agg")
+import numpy as np
+
+from algorithms.bfs_pathfinding import bfs_pathfinding
+from utils.grid import parse_grid, random_grid
+from utils.grid_trace import CURRENT, FRONTIER, GOAL, PATH, START, VISITED, WALL, GridTrace
+from utils.level_of_detail import every
+from utils.timeline import Timeline
+from visualizers.pathfinding_visualizer import GridRenderer
+
+MAZE = """S..#
+.#..
+.#.#
+...G"""
+
+
+def maze_trace():
+    grid, start, goal = parse_grid(MAZE)
+    return GridTrace.from_frames(bfs_pathfinding(grid, start, goal), start, goal)
+
+
+class TestParseGrid(unittest.TestCase):
+    def test_parse(self):
+        grid, start, goal = parse_grid(MAZE)
+        self.assertEqual(grid[0], [0, 0, 0, 1])
+        self.assertEqual((start, goal), ((0, 0), (3, 3)))
+
+    def test_default_endpoints(self):
+        grid, start, goal = parse_grid("..\n#.")
+        self.assertEqual((start, goal), ((0, 0), (1, 1)))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_grid("..\n.")
+        with self.assertRaises(ValueError):
+            parse_grid("x.")
+
+    def test_random_grid(self):
+        grid = random_grid(20, 30, 0.3, seed=1)
+        self.assertEqual((len(grid), len(grid[0])), (20, 30))
+        self.assertEqual(grid, random_grid(20, 30, 0.3, seed=1))
+
+
+class TestGridTrace(unittest.TestCase):
+    def test_frames_round_trip(self):
+        grid, start, goal = parse_grid(MAZE)
+        frames = list(bfs_pathfinding(grid, start, goal))
+        trace = GridTrace.from_frames(frames, start, goal)
+        self.assertEqual(len(trace), len(frames))
+        for k, frame in enumerate(frames):
+            self.assertEqual(trace[k], frame)
+
+    def test_raster_matches_replay(self):
+        trace = maze_trace()
+        cells = np.array(trace.walls) * WALL
+        for k, frame in enumerate(trace):
+            cells[list(frame["frontier"])] = FRONTIER
+            cells[list(frame["visited"])] = VISITED
+            if "path" in frame:
+                cells[[r * trace.cols + c for r, c in frame["path"]]] = PATH
+            np.testing.assert_array_equal(trace.raster_at(k).reshape(-1), cells)
+
+    def test_timeline_records_grid_trace(self):
+        grid, start, goal = parse_grid(MAZE)
+        timeline = Timeline(bfs_pathfinding(grid, start, goal), start=start, goal=goal)
+        trace = timeline.run_to_end()
+        self.assertIsInstance(trace, GridTrace)
+        self.assertEqual(timeline.result, trace.path)
+        # grid traces have no op columns; sampling still works
+        self.assertEqual(every(trace, 3)[-1]["path"], trace.path)
+
+
+class TestGridRenderer(unittest.TestCase):
+    def test_incremental_matches_rebuild(self):
+        trace = maze_trace()
+        forward = GridRenderer()
+        for k in range(len(trace)):
+            forward.show(trace, k)
+        jumping = GridRenderer()
+        for k in (len(trace) - 1, 2, len(trace) - 1):
+            jumping.show(trace, k)
+        np.testing.assert_array_equal(forward._raster, jumping._raster)
+
+    def test_marks(self):
+        trace = maze_trace()
+        renderer = GridRenderer()
+        renderer.show(trace, 3)
+        raster = renderer._raster
+        self.assertEqual(raster[0, 0], START)
+        self.assertEqual(raster[3, 3], GOAL)
+        r, c = divmod(trace.current[3], trace.cols)
+        self.assertEqual(raster[r, c], CURRENT)
+        # marks are restored when moving on
+        renderer.show(trace, 4)
+        self.assertEqual(renderer._raster[r, c], VISITED)
+        title = renderer.fig.axes[0].get_title().splitlines()
+        self.assertEqual(title, [trace.info_at(4), f"{trace.visited_end[4]} cells expanded"])
+        # the search's own time shows once its last frame is reached
+        renderer.show(trace, -1)
+        self.assertRegex(renderer.fig.axes[0].get_title(), r"cells expanded in \d+\.\d ms$")
+
+    def test_png(self):
+        renderer = GridRenderer()
+        renderer.show(maze_trace(), -1)
+        self.assertTrue(renderer.to_png().startswith(b"\x89PNG"))
+
+
+if __name__ == "__main__":
+    unittest.main()
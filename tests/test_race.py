@@ -0,0 +1,72 @@
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from algorithms.bubble_sort import bubble_sort
+from algorithms.insertion_sort import insertion_sort
+from algorithms.merge_sort import merge_sort
+from utils.race import Race
+from utils.trace import record_trace
+from utils.trace_cache import TraceCache
+
+DATA = [9, 4, 7, 1, 8, 2, 6, 3, 5, 0]
+KEYS = ("bubble_sort", "insertion_sort", "merge_sort")
+
+
+class TestRace(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            cls.race = Race.generate(KEYS, DATA, executor=pool)
+        cls.refs = [record_trace(algo(list(DATA))) for algo in (bubble_sort, insertion_sort, merge_sort)]
+
+    def test_lanes_match_single_runs(self):
+        for lane, ref in zip(self.race.lanes, self.refs):
+            self.assertEqual(list(lane.timeline), list(ref))
+        self.assertEqual(self.race.total, max(len(ref) for ref in self.refs))
+
+    def test_lock_step(self):
+        race = self.race
+        last = race.total - 1
+        for tick in (0, 5, last):
+            for frame, ref in zip(race.frames_at(tick), self.refs):
+                # finished lanes hold their last frame
+                self.assertEqual(frame, ref[min(tick, len(ref) - 1)])
+        self.assertFalse(race.has_frame(race.total))
+        self.assertEqual([f['state'] for f in race.frames_at(last)], [sorted(DATA)] * 3)
+
+    def test_counters(self):
+        for counts, ref in zip(self.race.counters(10), self.refs):
+            self.assertEqual(counts, record_trace(ref[:11]).op_counts())
+        for counts, ref in zip(self.race.counters(self.race.total - 1), self.refs):
+            self.assertEqual(counts, ref.op_counts())
+        self.assertEqual([lane.steps for lane in self.race.standings()], sorted(len(ref) for ref in self.refs))
+
+    def test_render_every_lane_off_the_caller_thread(self):
+        threads = set()
+
+        def render(lane, step):
+            threads.add(threading.get_ident())
+            return f"{lane.key}:{step}".encode()
+
+        pngs = self.race.render(3, render)
+        self.race.shutdown()
+        self.assertEqual(pngs, [f"{key}:3".encode() for key in KEYS])
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_cached_lanes_are_reused(self):
+        cache = TraceCache()
+        with ThreadPoolExecutor() as pool:
+            first = Race.generate(KEYS[:2], DATA, executor=pool, cache=cache)
+            second = Race.generate(KEYS, DATA, executor=pool, cache=cache)
+        self.assertIs(second.lanes[0].timeline, first.lanes[0].timeline)
+        self.assertEqual(cache.hits, 2)
+        self.assertEqual(len(cache), 3)
+
+    def test_array_algorithms_only(self):
+        with self.assertRaises(ValueError):
+            Race.generate(("bubble_sort", "binary_search"), DATA)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import sys
+import unittest
+from algorithms.registry import available_algorithms, get_algorithm, read_metadata
+from utils.trace import record_trace
+
+
+class TestRegistry(unittest.TestCase):
+    def test_discovers_all_algorithms(self):
+        keys = {spec.key for spec in available_algorithms()}
+        self.assertTrue({'bubble_sort', 'insertion_sort', 'selection_sort', 'merge_sort',
+                         'quick_sort', 'binary_search', 'bfs_pathfinding'} <= keys)
+        self.assertEqual(get_algorithm('Binary Search').input_kind, 'sorted_array')
+        self.assertEqual(get_algorithm('bfs_pathfinding').renderer, 'grid')
+        self.assertNotIn('bfs_pathfinding', {s.key for s in available_algorithms(('array',))})
+        with self.assertRaises(KeyError):
+            get_algorithm('bogo_sort')
+
+    def test_listing_does_not_import(self):
+        spec = get_algorithm('quick_sort')
+        sys.modules.pop(spec.module, None)
+        available_algorithms()
+        self.assertNotIn(spec.module, sys.modules)
+        self.assertEqual(spec.load().__name__, 'quick_sort')
+        self.assertIn(spec.module, sys.modules)
+
+    def test_metadata_is_read_from_source(self):
+        import algorithms.merge_sort as mod
+        self.assertEqual(read_metadata(mod.__file__), mod.ALGORITHM)
+
+    def test_quick_sort(self):
+        arr = [5, 1, 4, 1, 3, 9, 2, 2]
+        trace = record_trace(get_algorithm('quick_sort').load()(arr, seed=3))
+        self.assertEqual(trace.final_state(), sorted(arr))
+        self.assertEqual([f['info'] for f in trace],
+                         [f['info'] for f in record_trace(get_algorithm('quick_sort').load()(arr, seed=3))])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import random
+import unittest
+
+import numpy as np
+
+from algorithms.search_engine import GENERATORS, METHODS, SearchEngine
+from utils.search_trace import SearchTrace
+from utils.trace import record_trace
+
+
+def run(gen):
+    probes = 0
+    while True:
+        try:
+            probes += next(gen)['op'] is not None
+        except StopIteration as stop:
+            return (-1 if stop.value is None else stop.value), probes
+
+
+class TestSearchEngine(unittest.TestCase):
+    def test_lookup_matches_generators(self):
+        rng = random.Random(2)
+        arrays = [[], [3], [5, 5, 5], sorted(rng.choices(range(40), k=60)), sorted(rng.sample(range(10 ** 4), 300)),
+                  sorted(int(1.3 ** rng.uniform(0, 60)) for _ in range(200))]
+        for arr in arrays:
+            engine = SearchEngine(np.array(arr, dtype=np.int64))
+            targets = np.array(sorted(set(arr) | {v + 1 for v in arr} | {-5, 0, 7, 10 ** 9}), dtype=np.int64)
+            for method in METHODS:
+                with self.subTest(n=len(arr), method=method):
+                    lookup = engine.lookup(targets, method)
+                    expected = [run(GENERATORS[method](arr, t)) for t in targets.tolist()]
+                    self.assertEqual(list(zip(lookup.index.tolist(), lookup.probes.tolist())), expected)
+                    self.assertEqual(lookup.found.tolist(), [t in arr for t in targets.tolist()])
+
+    def test_interpolation_without_overflow(self):
+        arr = [-2 ** 62, -5, 0, 3, 2 ** 62]
+        engine = SearchEngine(np.array(arr, dtype=np.int64))
+        lookup = engine.lookup(arr + [1], 'interpolation_search')
+        self.assertEqual(lookup.index.tolist(), [0, 1, 2, 3, 4, -1])
+
+    def test_shares_the_array(self):
+        values = np.arange(0, 10 ** 6, 2)
+        engine = SearchEngine(values)
+        self.assertTrue(np.shares_memory(engine.values, values))
+        self.assertFalse(engine.values.flags.writeable)
+        self.assertTrue(values.flags.writeable)
+        targets = np.array([0, 7, 999_998, 123_456])
+        np.testing.assert_array_equal(engine.searchsorted(targets), np.searchsorted(values, targets))
+        with self.assertRaises(ValueError):
+            SearchEngine([3, 1, 2])
+        with self.assertRaises(ValueError):
+            engine.lookup(targets, 'linear_search')
+
+    def test_windowed_timeline(self):
+        values = np.arange(0, 10 ** 6, 2)
+        engine = SearchEngine(values)
+        timeline = engine.timeline(123_456, 'binary_search', window=100)
+        trace = timeline.run_to_end()
+        self.assertEqual(timeline.result, 61_728)
+        self.assertIs(trace.state_at(-1), engine.values)
+        self.assertLess(trace.nbytes(), 4096)
+        found = trace[-1]
+        self.assertEqual(found['info'], 'found')
+        self.assertEqual(len(found['state']), 100)
+        self.assertEqual(found['state'][found['highlight'][0]], 123_456)
+        self.assertEqual(found['offset'] + found['highlight'][0], 61_728)
+        self.assertEqual(trace.probes(), trace.op_counts()['compare'])
+        with self.assertRaises(ValueError):
+            SearchTrace(engine.values).record({'state': engine.values, 'op': ('swap', 0, 1)})
+
+    def test_short_arrays_play_as_before(self):
+        arr = [1, 3, 5, 7, 9]
+        engine = SearchEngine(arr)
+        for method, search in GENERATORS.items():
+            with self.subTest(method=method):
+                trace = engine.timeline(7, method).run_to_end()
+                self.assertEqual(list(trace), list(record_trace(search(arr, 7))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import unittest
+
+from benchmarks.startup import BUDGET, app_imports, measure, over_budget
+
+# the default check allows this many times BUDGET, so slow or busy machines
+# pass and only gross regressions fail it
+SLACK = 3
+
+
+class TestStartup(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.result = measure()
+
+    def test_app_runs(self):
+        self.assertEqual(self.result['errors'], [])
+        self.assertIn('streamlit', app_imports())
+
+    def test_heavy_modules_load_on_first_use(self):
+        self.assertEqual(self.result['heavy_modules'], [])
+        self.assertEqual(self.result['cli_heavy_modules'], [])
+
+    def test_over_budget_report(self):
+        self.assertEqual(over_budget({'rerun': BUDGET['rerun'] + 1, 'heavy_modules': []}),
+                         [f"rerun: {BUDGET['rerun'] + 1:.3f} s > {BUDGET['rerun']:.3f} s budget"])
+
+    def test_within_slack_of_budget(self):
+        self.assertEqual(over_budget(self.result, {name: SLACK * limit for name, limit in BUDGET.items()}), [])
+
+    @unittest.skipUnless(os.environ.get('ALGO_VIS_CHECK_STARTUP') == '1', 'set ALGO_VIS_CHECK_STARTUP=1 to check timings')
+    def test_within_budget(self):
+        self.assertEqual(over_budget(self.result), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
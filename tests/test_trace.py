@@ -0,0 +1,125 @@
+import random
+import unittest
+from algorithms.bubble_sort import bubble_sort
+from algorithms.insertion_sort import insertion_sort
+from algorithms.selection_sort import selection_sort
+from algorithms.merge_sort import merge_sort
+from algorithms.binary_search import binary_search
+from utils.timeline import Timeline
+from utils.trace import Trace, record_trace
+
+
+def snapshot(gen):
+    """Reference frames: copy every state as the generators used to."""
+    return [dict(f, state=list(f['state'])) for f in gen]
+
+
+class TestTrace(unittest.TestCase):
+    def assertMatches(self, trace, expected):
+        self.assertEqual(len(trace), len(expected))
+        for k, frame in enumerate(expected):
+            got = trace[k]
+            self.assertEqual(got['state'], frame['state'], k)
+            self.assertEqual(got['highlight'], tuple(frame['highlight']), k)
+            self.assertEqual(got['info'], frame['info'], k)
+        self.assertEqual([f['state'] for f in trace], [f['state'] for f in expected])
+
+    def test_sorts_replay_exactly(self):
+        rng = random.Random(7)
+        arr = [rng.randint(0, 20) for _ in range(25)]
+        for algo in (bubble_sort, insertion_sort, selection_sort, merge_sort):
+            expected = snapshot(algo(arr))
+            # a small interval exercises keyframe seeking
+            self.assertMatches(record_trace(algo(arr), keyframe_interval=16), expected)
+            self.assertEqual(record_trace(algo(arr)).final_state(), sorted(arr))
+
+    def test_binary_search(self):
+        arr = list(range(0, 40, 3))
+        for target in (0, 9, 10, 39):
+            self.assertMatches(record_trace(binary_search(arr, target)), snapshot(binary_search(arr, target)))
+
+    def test_frames_without_ops_are_diffed(self):
+        frames = [
+            {'state': [3, 1, 2], 'highlight': (), 'info': 'start'},
+            {'state': [1, 1, 2], 'highlight': (0,), 'info': 'write'},
+            {'state': [2, 3, 1], 'highlight': (), 'info': 'shuffle'},
+            {'state': [2, 3, 1], 'highlight': (0, 1, 2), 'info': 'all'},
+        ]
+        trace = record_trace(frames)
+        self.assertMatches(trace, frames)
+        self.assertEqual(trace[-1]['highlight'], (0, 1, 2))
+
+    def test_loaded_states_keep_their_values(self):
+        frames = [
+            {'state': [3, 1, 2], 'highlight': (), 'info': 'start'},
+            {'state': [1, 2, 3], 'highlight': (), 'info': 'ints'},
+            {'state': [2 ** 70, 1, 0.5], 'highlight': (), 'info': 'big and float'},
+        ]
+        trace = record_trace(frames)
+        self.assertMatches(trace, frames)
+        self.assertEqual([type(v) for v in trace[1]['state']], [int] * 3)
+
+    def test_trace_is_smaller_than_copies(self):
+        arr = list(range(200, 0, -1))
+        trace = record_trace(bubble_sort(arr))
+        self.assertEqual(trace.op_counts()['compare'], 200 * 199 // 2)
+        self.assertLess(trace.nbytes(), len(trace) * len(arr) * 8 // 20)
+
+    def test_empty(self):
+        self.assertEqual(len(record_trace(iter(()))), 0)
+        self.assertEqual(len(Trace([1, 2])), 0)
+        with self.assertRaises(IndexError):
+            Trace([1, 2])[0]
+
+
+class TestTimeline(unittest.TestCase):
+    def test_generates_lazily(self):
+        pulled = []
+
+        def frames():
+            for k in range(1000):
+                pulled.append(k)
+                yield {'state': [k], 'highlight': (), 'info': str(k)}
+
+        timeline = Timeline(frames(), lookahead=8)
+        self.assertEqual(timeline[0]['info'], '0')
+        self.assertLessEqual(len(pulled), 10)
+        self.assertIsNone(timeline.total)
+        self.assertEqual(timeline[500]['state'], [500])
+        self.assertLess(len(pulled), 520)
+        # seeking back replays from the trace, not the generator
+        self.assertEqual(timeline[3]['info'], '3')
+        self.assertFalse(timeline.has_frame(1000))
+        self.assertEqual(timeline.total, 1000)
+
+    def test_matches_full_run(self):
+        arr = [9, 3, 7, 1, 8, 2]
+        expected = snapshot(insertion_sort(arr))
+        timeline = Timeline(insertion_sort(arr), lookahead=2, keyframe_interval=4)
+        self.assertEqual(timeline[len(expected) - 1]['state'], sorted(arr))
+        self.assertEqual([f['state'] for f in timeline], [f['state'] for f in expected])
+        with self.assertRaises(IndexError):
+            timeline[len(expected)]
+
+    def test_keeps_generator_result(self):
+        timeline = Timeline(binary_search([1, 3, 5, 7], 5))
+        self.assertEqual(len(timeline.run_to_end()), timeline.total)
+        self.assertEqual(timeline.result, 2)
+
+    def test_failed_generator_is_not_done(self):
+        def frames():
+            yield {'state': [1], 'highlight': (), 'info': 'start'}
+            raise ValueError('bad input')
+
+        timeline = Timeline(frames(), lookahead=0)
+        self.assertTrue(timeline.has_frame(0))
+        for _ in range(2):
+            with self.assertRaisesRegex(ValueError, 'bad input'):
+                timeline.has_frame(1)
+        self.assertFalse(timeline.done)
+        self.assertIsNone(timeline.total)
+        self.assertEqual(timeline[0]['info'], 'start')
+
+
+if __name__ == '__main__':
+    unittest.main()
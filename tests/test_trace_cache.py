@@ -0,0 +1,170 @@
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from algorithms.bfs_pathfinding import bfs_pathfinding
+from algorithms.bubble_sort import bubble_sort
+from algorithms.merge_sort import merge_sort
+from utils.algo_interface import input_fingerprint
+from utils.timeline import GROW_CHECK, Timeline
+from utils.trace_cache import DiskTraceStore, TraceCache
+
+
+def finished(data):
+    timeline = Timeline(bubble_sort(list(data)))
+    timeline.run_to_end()
+    return timeline
+
+
+class TestTraceCache(unittest.TestCase):
+    def test_identical_runs_share_one_timeline(self):
+        cache = TraceCache()
+        key = input_fingerprint('Bubble Sort', [5, 2, 4, 1, 3])
+        made = []
+
+        def make():
+            made.append(1)
+            return Timeline(bubble_sort([5, 2, 4, 1, 3]))
+
+        first = cache.get_or_create(key, make)
+        second = cache.get_or_create(input_fingerprint('Bubble Sort', [5, 2, 4, 1, 3]), make)
+        self.assertIs(first, second)
+        self.assertEqual(len(made), 1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_concurrent_sessions(self):
+        cache = TraceCache()
+        results = []
+
+        def session():
+            timeline = cache.get_or_create('key', lambda: Timeline(merge_sort(list(range(200, 0, -1)))))
+            results.append(timeline)
+            list(timeline)
+
+        threads = [threading.Thread(target=session) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len({id(t) for t in results}), 1)
+        self.assertEqual(results[0].trace.final_state(), list(range(1, 201)))
+
+    def test_lru_eviction_by_trace_bytes(self):
+        size = finished(range(30, 0, -1)).nbytes()
+        cache = TraceCache(max_bytes=int(2.5 * size))
+        for key in 'abc':
+            cache.put(key, finished(range(30, 0, -1)))
+        self.assertNotIn('a', cache)
+        cache.get('b')  # 'b' is now most recent
+        cache.put('d', finished(range(30, 0, -1)))
+        self.assertEqual([k for k in 'abcd' if k in cache], ['b', 'd'])
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+
+    def test_runs_are_evicted_as_they_grow(self):
+        size = finished(range(30, 0, -1)).nbytes()
+        cache = TraceCache(max_bytes=4 * size)
+        for key in 'ab':
+            timeline = Timeline(bubble_sort(list(range(200, 0, -1))))
+            timeline.has_frame(0)
+            cache.put(key, timeline)
+        self.assertEqual(len(cache), 2)
+        # playback alone, with no new run stored, brings the cache back under its bound
+        timeline.has_frame(2 * GROW_CHECK)
+        self.assertEqual([k for k in 'ab' if k in cache], ['b'])
+        self.assertIsNone(cache.get('a'))
+
+    def test_runs_grow_concurrently(self):
+        # each run's on_grow sizes the other while it records keyframes
+        cache = TraceCache(max_bytes=1 << 40)
+        timelines = [Timeline(bubble_sort(list(range(200, 0, -1))), keyframe_interval=4) for _ in range(2)]
+        for key, timeline in zip('ab', timelines):
+            timeline.has_frame(0)
+            cache.put(key, timeline)
+        errors = []
+
+        def grow(timeline):
+            try:
+                timeline.run_to_end()
+            except Exception as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=grow, args=(t,)) for t in timelines]
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            with mock.patch('utils.timeline.GROW_CHECK', 1):
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+        finally:
+            sys.setswitchinterval(interval)
+        self.assertEqual(errors, [])
+        self.assertEqual([t.trace.final_state() for t in timelines], [list(range(1, 201))] * 2)
+        self.assertEqual(len(cache), 2)
+
+    def test_most_recent_run_is_kept(self):
+        cache = TraceCache(max_bytes=1)
+        cache.put('big', finished(range(50, 0, -1)))
+        self.assertIn('big', cache)
+
+    def test_spill_to_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = DiskTraceStore(tmp)
+            cache = TraceCache(max_bytes=1, store=store)
+            grid = [[0, 0, 0], [1, 1, 0], [0, 0, 0]]
+            grid_run = Timeline(bfs_pathfinding(grid, (0, 0), (2, 0)))
+            grid_run.run_to_end()
+            cache.put('sort', finished([3, 1, 2]), metadata={'algorithm': 'Bubble Sort'})
+            cache.put('grid', grid_run)
+            self.assertNotIn('sort', cache)
+            self.assertIn('sort', store)
+            (key, info), = store.entries()
+            self.assertEqual((key, info['metadata']), ('sort', {'algorithm': 'Bubble Sort'}))
+            reloaded = cache.get('sort')
+            self.assertEqual(cache.disk_hits, 1)
+            self.assertTrue(reloaded.done)
+            self.assertEqual(list(reloaded), list(finished([3, 1, 2])))
+            grid_back = cache.get('grid')
+            self.assertEqual(list(grid_back), list(grid_run))
+            self.assertEqual(grid_back.result, grid_run.result)
+
+    def test_unfinished_runs_are_not_spilled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = DiskTraceStore(tmp)
+            cache = TraceCache(max_bytes=1, store=store)
+            running = Timeline(bubble_sort([3, 2, 1]))
+            running.has_frame(0)
+            cache.put('running', running)
+            cache.put('next', finished([2, 1]))
+            self.assertNotIn('running', store)
+            self.assertIsNone(cache.get('running'))
+
+    def test_failed_runs_are_dropped(self):
+        cache = TraceCache()
+
+        def failing():
+            yield {'state': [1], 'highlight': (), 'info': 'start'}
+            raise ValueError('bad input')
+
+        timeline = cache.get_or_create('run', lambda: Timeline(failing()))
+        with self.assertRaises(ValueError):
+            timeline.run_to_end()
+        made = cache.get_or_create('run', lambda: finished([2, 1]))
+        self.assertIsNot(made, timeline)
+        self.assertTrue(made.done)
+
+    def test_store_trim(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = DiskTraceStore(tmp, max_bytes=1)
+            store.save('a', finished([2, 1]))
+            self.assertEqual(store.nbytes(), 0)
+            store.max_bytes = None
+            store.save('b', finished([2, 1]))
+            self.assertIn('b', store)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+
+from algorithms.binary_search import binary_search
+from algorithms.bfs_pathfinding import bfs_pathfinding
+from algorithms.bubble_sort import bubble_sort
+from algorithms.fast_trace import FAST_ENGINES
+from algorithms.merge_sort import merge_sort
+from utils import trace_file
+from utils.grid_trace import GridTrace
+from utils.trace import record_trace
+from utils.trace_file import (MappedGridTrace, MappedTrace, open_trace, save_trace, trace_file_info,
+                              write_trace_file)
+
+DATA = [9, 4, 7, 1, 8, 2, 6, 3, 5, 0, 4, 4]
+
+
+class TestTraceFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'run.trace')
+        # small spill chunks so recording goes through the temporary files
+        self._chunk = trace_file.SPILL_CHUNK
+        trace_file.SPILL_CHUNK = 7
+
+    def tearDown(self):
+        trace_file.SPILL_CHUNK = self._chunk
+        self.tmp.cleanup()
+
+    def test_streamed_run_matches_recorded_trace(self):
+        for algo in (bubble_sort, merge_sort):
+            with self.subTest(algo=algo.__name__):
+                ref = record_trace(algo(list(DATA)), keyframe_interval=10)
+                count = write_trace_file(self.path, algo(list(DATA)), {'algorithm': algo.__name__},
+                                         keyframe_interval=10)
+                trace = open_trace(self.path)
+                self.assertIsInstance(trace, MappedTrace)
+                self.assertEqual(count, len(ref))
+                self.assertEqual(list(trace), list(ref))
+                self.assertEqual(list(trace.pass_starts), list(ref.pass_starts))
+                self.assertEqual(trace.final_state(), sorted(DATA))
+                self.assertEqual(trace.metadata, {'algorithm': algo.__name__})
+
+    def test_random_access(self):
+        ref = FAST_ENGINES['bubble_sort'](list(range(60, 0, -1)))
+        save_trace(self.path, ref, metadata={'n': 60})
+        trace = open_trace(self.path)
+        for k in (0, 1, len(ref) // 3, len(ref) - 1, -1):
+            self.assertEqual(trace[k], ref[k])
+        info = trace_file_info(self.path)
+        self.assertEqual((info['frames'], info['metadata']), (len(ref), {'n': 60}))
+
+    def test_result_is_kept(self):
+        write_trace_file(self.path, binary_search([1, 3, 5, 7, 9], 7))
+        self.assertEqual(open_trace(self.path).result, 3)
+
+    def test_grid_run(self):
+        grid = [[0, 0, 0, 0], [1, 1, 0, 1], [0, 0, 0, 0]]
+        frames = list(bfs_pathfinding(grid, (0, 0), (2, 0)))
+        ref = GridTrace.from_frames(frames, (0, 0), (2, 0))
+        write_trace_file(self.path, bfs_pathfinding(grid, (0, 0), (2, 0)), start=(0, 0), goal=(2, 0))
+        trace = open_trace(self.path)
+        self.assertIsInstance(trace, MappedGridTrace)
+        # everything but the measured search time
+        self.assertEqual(list(trace)[:-1], list(ref)[:-1])
+        self.assertEqual(trace.stats['expanded'], ref.stats['expanded'])
+        self.assertEqual(trace.raster_at(-1).tolist(), ref.raster_at(-1).tolist())
+        self.assertEqual(trace.result, ref.path)
+
+    def test_read_only(self):
+        write_trace_file(self.path, bubble_sort([2, 1]))
+        with self.assertRaises(TypeError):
+            open_trace(self.path).record({'state': [1, 2], 'op': None})
+
+    def test_non_numeric_states_are_rejected(self):
+        with self.assertRaises(TypeError):
+            write_trace_file(self.path, bubble_sort(['b', 'a']))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_not_a_trace_file(self):
+        with open(self.path, 'wb') as fh:
+            fh.write(b'\0' * 64)
+        with self.assertRaises(ValueError):
+            open_trace(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,201 @@
+import http.client
+import json
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+import uvicorn
+from websockets.exceptions import ConnectionClosedError
+from websockets.sync.client import connect
+
+from algorithms.bubble_sort import bubble_sort
+from algorithms.quick_sort import quick_sort
+from utils.trace import record_trace
+from utils.trace_server import RunRequest, create_app
+
+# params of the wrong type, which generators only trip over at their first frame
+BADLY_TYPED = ({'algorithm': 'quick_sort', 'data': [3, 1, 2], 'params': {'seed': [1]}},
+               {'algorithm': 'radix_sort_lsd', 'data': [3, 1, 2], 'params': {'base': 'x'}})
+
+
+def failing(*args, **kwargs):
+    """Three frames of bubble sort, then an error."""
+    for k, frame in enumerate(bubble_sort([3, 2, 1])):
+        if k == 3:
+            raise RuntimeError('lost the array')
+        yield frame
+
+
+def replay(messages):
+    """Frames rebuilt from a ``deltas`` stream, as ``(state, highlight, info)``."""
+    start = messages[0]
+    state = list(start['initial'])
+    frames = []
+    for message in messages[1:]:
+        for frame in message.get('frames', ()) if message['type'] == 'chunk' else ():
+            op = frame['op']
+            if 'state' in frame:
+                state = list(frame['state'])
+            elif op and op[0] == 'swap':
+                state[op[1]], state[op[2]] = state[op[2]], state[op[1]]
+            elif op and op[0] == 'set':
+                state[op[1]] = op[2]
+            frames.append((list(state), tuple(frame['highlight']), frame['info']))
+    return frames
+
+
+class TestTraceServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        cls.port = sock.getsockname()[1]
+        cls.server = uvicorn.Server(uvicorn.Config(create_app(workers=2), log_level='warning'))
+        cls.thread = threading.Thread(target=cls.server.run, kwargs={'sockets': [sock]}, daemon=True)
+        cls.thread.start()
+        while not cls.server.started:
+            time.sleep(0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.should_exit = True
+        cls.thread.join(10)
+
+    def request(self, method, path, body=None):
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        conn.request(method, path, None if body is None else json.dumps(body), {'Content-Type': 'application/json'})
+        response = conn.getresponse()
+        return response.status, response.read()
+
+    def stream(self, body):
+        status, data = self.request('POST', '/stream', body)
+        self.assertEqual(status, 200, data)
+        return [json.loads(line) for line in data.splitlines()]
+
+    def wait_for(self, condition, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, 'timed out')
+            time.sleep(0.05)
+
+    def streams(self):
+        return json.loads(self.request('GET', '/status')[1])['streams']
+
+    def test_lists_algorithms(self):
+        status, data = self.request('GET', '/algorithms')
+        self.assertEqual(status, 200)
+        keys = {entry['key']: entry['input'] for entry in json.loads(data)}
+        self.assertEqual(keys['bubble_sort'], 'array')
+        self.assertEqual(keys['binary_search'], 'sorted_array')
+        self.assertEqual(keys['bfs_pathfinding'], 'grid')
+
+    def test_deltas_replay_the_run(self):
+        data = [9, 3, 7, 1, 8, 2, 2, 5]
+        for key, algo, params in (('bubble_sort', bubble_sort, {}), ('quick_sort', quick_sort, {'seed': 4})):
+            with self.subTest(algorithm=key):
+                messages = self.stream({'algorithm': key, 'data': data, 'chunk': 5, 'params': params})
+                self.assertEqual(messages[0]['type'], 'start')
+                self.assertEqual(messages[-1]['type'], 'end')
+                chunks = [m for m in messages if m['type'] == 'chunk']
+                self.assertTrue(all(len(m['frames']) <= 5 for m in chunks))
+                self.assertEqual([m['first'] for m in chunks], list(range(0, 5 * len(chunks), 5)))
+                expected = [(f['state'], f['highlight'], f['info']) for f in record_trace(algo(data, **params))]
+                self.assertEqual(replay(messages), expected)
+                self.assertEqual(messages[-1]['total'], len(expected))
+
+    def test_frames_search_and_grid(self):
+        messages = self.stream({'algorithm': 'binary_search', 'data': '7,1,5,3', 'target': 5, 'format': 'frames'})
+        frames = [f for m in messages[1:-1] for f in m['frames']]
+        self.assertTrue(all(f['state'] == [1, 3, 5, 7] for f in frames))
+        self.assertEqual(messages[-1]['result'], 2)
+        messages = self.stream({'algorithm': 'bfs_pathfinding', 'grid': [[0, 0, 1], [1, 0, 0], [1, 1, 0]],
+                                'goal': [2, 2], 'max_frames': 3})
+        self.assertEqual(messages[0]['grid'], [[0, 0, 1], [1, 0, 0], [1, 1, 0]])
+        self.assertEqual(messages[-1], {'type': 'end', 'total': 3, 'result': None, 'truncated': True})
+        self.assertEqual(messages[1]['frames'][1]['visited'], [0])
+
+    def test_bad_requests(self):
+        for body in ({'algorithm': 'nope'}, {'algorithm': 'bubble_sort', 'data': [1, 'x']},
+                     {'algorithm': 'bubble_sort', 'chunk': 0}, {'algorithm': 'binary_search', 'data': [1]},
+                     {'algorithm': 'bfs_pathfinding', 'grid': 'S.\n.', }, {'algorithm': 'bubble_sort', 'params': {'x': 1}},
+                     {'algorithm': 'counting_sort', 'data': [0, 10 ** 9]},
+                     {'algorithm': 'radix_sort_lsd', 'data': [3, 1], 'params': {'base': 1}}, [1, 2],
+                     *BADLY_TYPED):
+            with self.subTest(body=body):
+                status, data = self.request('POST', '/stream', body)
+                self.assertEqual(status, 400)
+                self.assertIn('error', json.loads(data))
+
+    def test_websocket_cancel(self):
+        with connect(f'ws://127.0.0.1:{self.port}/ws') as ws:
+            ws.send(json.dumps({'algorithm': 'bubble_sort', 'data': list(range(300, 0, -1)), 'chunk': 10}))
+            self.assertEqual(json.loads(ws.recv())['type'], 'start')
+            self.assertEqual(len(json.loads(ws.recv())['frames']), 10)
+            ws.send(json.dumps({'type': 'cancel'}))
+            while True:
+                message = json.loads(ws.recv())
+                if message['type'] != 'chunk':
+                    break
+            self.assertEqual(message['type'], 'cancelled')
+            self.assertLess(message['sent'], 300 * 300)
+        self.wait_for(lambda: not self.streams())
+
+    def test_websocket_error(self):
+        with connect(f'ws://127.0.0.1:{self.port}/ws') as ws:
+            ws.send(json.dumps({'algorithm': 'nope'}))
+            self.assertEqual(json.loads(ws.recv())['type'], 'error')
+        for body in BADLY_TYPED:
+            with self.subTest(body=body), connect(f'ws://127.0.0.1:{self.port}/ws') as ws:
+                ws.send(json.dumps(body))
+                message = json.loads(ws.recv())
+                self.assertEqual(message['type'], 'error')
+                self.assertIn('bad params', message['message'])
+                with self.assertRaises(ConnectionClosedError) as closed:
+                    ws.recv()
+                self.assertEqual(closed.exception.rcvd.code, 1003)
+
+    def test_error_part_way(self):
+        with mock.patch.object(RunRequest, 'frames', lambda request: failing()):
+            messages = self.stream({'algorithm': 'bubble_sort', 'data': [3, 2, 1], 'chunk': 2})
+            self.assertEqual([m['type'] for m in messages], ['start', 'chunk', 'chunk', 'error'])
+            self.assertEqual(sum(len(m['frames']) for m in messages[1:-1]), 3)
+            self.assertEqual(messages[-1]['message'], 'lost the array')
+            with connect(f'ws://127.0.0.1:{self.port}/ws') as ws:
+                ws.send(json.dumps({'algorithm': 'bubble_sort', 'data': [3, 2, 1]}))
+                types = [json.loads(ws.recv())['type'] for _ in range(3)]
+                self.assertEqual(types, ['start', 'chunk', 'error'])
+                with self.assertRaises(ConnectionClosedError) as closed:
+                    ws.recv()
+                self.assertEqual(closed.exception.rcvd.code, 1011)
+        self.wait_for(lambda: not self.streams())
+
+    def test_slow_client_holds_the_run_back(self):
+        body = json.dumps({'algorithm': 'bubble_sort', 'data': list(range(3000, 0, -1)), 'chunk': 500}).encode()
+        client = socket.socket()
+        client.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        client.connect(('127.0.0.1', self.port))
+        client.sendall(b'POST /stream HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n'
+                       b'Content-Length: %d\r\n\r\n' % len(body) + body)
+        try:
+            self.wait_for(lambda: self.streams())
+            # the client reads nothing: once the socket buffers are full, the run stops advancing
+            sent = [-1]
+
+            def settled():
+                time.sleep(0.3)
+                now = self.streams()[0]['sent']
+                previous, sent[0] = sent[0], now
+                return now == previous
+
+            self.wait_for(settled)
+            self.assertLess(sent[0], 3000 * 3000 // 10)
+        finally:
+            client.close()
+        # and a client that goes away stops its run
+        self.wait_for(lambda: not self.streams())
+
+
+if __name__ == '__main__':
+    unittest.main()
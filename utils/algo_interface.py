@@ -1,11 +1,34 @@
 """Common interface helpers for algorithms"""
+import hashlib
 from typing import Callable, Any
 
+from utils.trace import Trace, record_trace
 
-def collect_generator(gen):
-    """Collect yields from a generator into a list and return final result when available."""
-    frames = []
-    result = None
-    for item in gen:
-        frames.append(item)
-    return frames
+
+def collect_generator(gen) -> Trace:
+    """Collect yields from a generator into a compact trace.
+
+    Generators share their working list between frames, so the frames are
+    recorded as a :class:`~utils.trace.Trace`; index or iterate it to get the
+    usual frame dicts.
+    """
+    return record_trace(gen)
+
+
+def input_fingerprint(algo_name: str, data: Any, **params: Any) -> str:
+    """Stable hash of an algorithm run: its name, input and parameters.
+
+    Used as the cache key for everything derived from a run (rendered frames,
+    traces), so identical requests map to the same entry.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(algo_name.encode())
+    h.update(b"\0")
+    if hasattr(data, "tobytes"):
+        h.update(str(getattr(data, "dtype", "")).encode())
+        h.update(data.tobytes())
+    else:
+        h.update(repr(list(data)).encode())
+    for name in sorted(params):
+        h.update(f"\0{name}={params[name]!r}".encode())
+    return h.hexdigest()
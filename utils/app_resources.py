@@ -0,0 +1,85 @@
+"""Process-wide resources of the Streamlit app (``main.py``).
+
+Streamlit re-executes ``main.py`` on every interaction, so anything defined
+there is rebuilt on each rerun, including the ``st.cache_*`` wrappers, which
+then hash their function's source again before finding their cached value.
+Defined here, in a module imported once per process, they are set up once
+and a rerun only looks them up.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import streamlit as st
+
+from algorithms.search_engine import SearchEngine
+from utils.frame_cache import FrameCache
+from utils.input_data import BYTES_PER_FRAME
+from utils.trace_cache import DEFAULT_MAX_BYTES, DiskTraceStore, TraceCache
+from visualizers.browser_player import trace_payload
+
+
+@st.cache_resource
+def get_frame_cache():
+    """Process-wide cache of rendered frames, shared by every session."""
+    return FrameCache()
+
+
+@st.cache_resource
+def get_trace_cache():
+    """Process-wide cache of runs: sessions submitting the same input share one trace.
+
+    ``ALGO_VIS_TRACE_CACHE_MB`` sets its memory budget and ``ALGO_VIS_TRACE_DIR``
+    a directory finished runs are spilled to when evicted.
+    """
+    max_mb = os.environ.get("ALGO_VIS_TRACE_CACHE_MB")
+    spill_dir = os.environ.get("ALGO_VIS_TRACE_DIR")
+    return TraceCache(
+        max_bytes=int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES,
+        store=DiskTraceStore(spill_dir) if spill_dir else None,
+    )
+
+
+@st.cache_resource(max_entries=4)
+def get_search_engine(data_key, _values):
+    """Search engine over a sorted input, keyed by its fingerprint and shared by every session."""
+    return SearchEngine(_values)
+
+
+@st.cache_resource
+def get_race_pool():
+    """Process pool that generates race lanes, shared by every session."""
+    return ProcessPoolExecutor()
+
+
+def frame_budget():
+    """Most frames one submission may need, set by the trace cache's memory budget.
+
+    ``ALGO_VIS_FRAME_BUDGET`` overrides it.
+    """
+    budget = os.environ.get("ALGO_VIS_FRAME_BUDGET")
+    return int(budget) if budget else get_trace_cache().max_bytes // BYTES_PER_FRAME
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def browser_payload(run_key, _timeline):
+    """Serialized trace for the browser player; built once per distinct run."""
+    return trace_payload(_timeline.run_to_end())
+
+
+@st.cache_resource
+def preload_renderers():
+    """Import the matplotlib renderers on a background thread, once per process.
+
+    ``main.py`` leaves them out of its imports so the first page is served
+    without loading matplotlib; calling this after the page is built loads
+    them while the visitor is still filling in the form. A frame rendered
+    before the thread finishes simply waits on the same import.
+    """
+    def load():
+        import utils.draw_helpers
+        import visualizers.pathfinding_visualizer
+
+    thread = threading.Thread(target=load, name="preload-renderers", daemon=True)
+    thread.start()
+    return thread
@@ -1,14 +1,175 @@
 """Minimal drawing helpers using matplotlib."""
-from typing import List, Dict, Tuple
-import matplotlib.pyplot as plt
-
-
-def draw_state(state: List[int], highlight=(), info: str = ""):
-    plt.clf()
-    bars = plt.bar(range(len(state)), state, color=['C0']*len(state))
-    if highlight:
-        for idx in (highlight if isinstance(highlight, (list, tuple)) else [highlight]):
-            if 0 <= idx < len(bars):
-                bars[idx].set_color('C1')
-    plt.title(info)
-    plt.pause(0.05)
+from io import BytesIO
+from typing import Dict, List, Optional
+import numpy as np
+from matplotlib import style as mpl_style
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter, ScalarFormatter
+
+# Above this many bars, value labels and per-index ticks are unreadable anyway.
+ANNOTATE_LIMIT = 60
+BAR_WIDTH = 0.8
+
+
+class BarRenderer:
+    """Retained-mode bar chart.
+
+    The axes and a single ``PolyCollection`` holding every bar are built once;
+    each ``update`` only rewrites bar heights and face colors in place (both
+    vectorized), so the per-frame cost no longer includes figure setup, one
+    artist per bar or ``tight_layout``.
+    """
+
+    def __init__(self, ax=None, figsize=(9, 4), bar_color="#4C78A8", highlight_color="#EE994F",
+                 annotate_limit: int = ANNOTATE_LIMIT, style: Optional[str] = None):
+        self.style = style
+        if ax is None:
+            with mpl_style.context(style or "default"):
+                self.fig = Figure(figsize=figsize)
+                ax = self.fig.add_subplot()
+        else:
+            self.fig = ax.figure
+        self.ax = ax
+        self.annotate_limit = annotate_limit
+        self.set_colors(bar_color, highlight_color)
+        self._n = None
+        self._bars = None
+        self._labels: List = []
+        self._highlighted = np.zeros(0, dtype=int)
+        self._ylim = None
+        self._offset = 0
+        self._title = ax.set_title("", fontsize=12)
+
+    def set_colors(self, bar_color, highlight_color) -> None:
+        self.bar_color = bar_color
+        self.highlight_color = highlight_color
+        self._bar_rgba = np.array(to_rgba(bar_color))
+        self._highlight_rgba = np.array(to_rgba(highlight_color))
+        self._n = None  # rebuild so every bar picks up the new color
+
+    def _build(self, n: int) -> None:
+        ax = self.ax
+        if self._bars is not None:
+            self._bars.remove()
+        for label in self._labels:
+            label.remove()
+        x = np.arange(n, dtype=float)
+        # one closed outline per bar: (left, 0) (left, h) (right, h) (right, 0) (left, 0)
+        self._verts = np.zeros((n, 5, 2))
+        self._verts[:, [0, 1, 4], 0] = (x - BAR_WIDTH / 2)[:, None]
+        self._verts[:, [2, 3], 0] = (x + BAR_WIDTH / 2)[:, None]
+        self._colors = np.tile(self._bar_rgba, (n, 1))
+        small = n <= self.annotate_limit
+        self._bars = PolyCollection(self._verts, closed=False, facecolors=self._colors,
+                                    edgecolors="black" if small else "none", linewidths=0.8 if small else 0)
+        ax.add_collection(self._bars)
+        self._labels = []
+        if small:
+            self._labels = [ax.annotate("", xy=(k, 0), xytext=(0, 3), textcoords="offset points",
+                                        ha="center", va="bottom", fontsize=8) for k in range(n)]
+            ax.set_xticks(range(n))
+        ax.set_xlim(-0.5, max(n - 0.5, 0.5))
+        ax.set_xlabel("Index")
+        ax.set_ylabel("Value")
+        self._highlighted = np.zeros(0, dtype=int)
+        self._ylim = None
+        self._n = n
+        self.fig.tight_layout()
+
+    def update(self, state, highlight=(), info: str = "", colors: Optional[Dict[int, str]] = None,
+               offset: int = 0) -> Figure:
+        """Show ``state`` with ``highlight`` indices marked; returns the figure.
+
+        ``colors`` optionally maps extra indices to their own colors (pivots,
+        pointers), applied after the highlight. ``offset`` is the index of the
+        first bar when ``state`` is a slice of a longer array; ticks show the
+        real indices.
+        """
+        heights = np.asarray(state, dtype=float)
+        n = len(heights)
+        # set before a rebuild so tight_layout leaves room for the title
+        self._title.set_text(info)
+        if n != self._n:
+            self._build(n)
+        if offset != self._offset:
+            formatter = FuncFormatter(lambda x, _pos: f"{int(round(x)) + offset:,}") if offset else ScalarFormatter()
+            self.ax.xaxis.set_major_formatter(formatter)
+            self._offset = offset
+        # Paths share memory with ``_verts``, so this updates every bar at once.
+        self._verts[:, 1:3, 1] = heights[:, None]
+
+        self._colors[self._highlighted] = self._bar_rgba
+        if highlight is None:
+            highlight = ()
+        elif not isinstance(highlight, (list, tuple)):
+            highlight = (highlight,)
+        idx = np.array([k for k in highlight if isinstance(k, (int, np.integer)) and 0 <= k < n], dtype=int)
+        self._colors[idx] = self._highlight_rgba
+        self._highlighted = idx
+        if colors:
+            extra = np.array([k for k in colors if 0 <= k < n], dtype=int)
+            for k in extra:
+                self._colors[k] = to_rgba(colors[k])
+            self._highlighted = np.concatenate([idx, extra])
+        self._bars.set_facecolor(self._colors)
+        self._bars.stale = True
+
+        lo = min(heights.min(), 0) if n else 0
+        hi = heights.max() * 1.1 if n and heights.max() > 0 else 1
+        if self._ylim != (lo, hi):
+            self.ax.set_ylim(lo, hi)
+            self._ylim = (lo, hi)
+        for label, value, height in zip(self._labels, state, heights):
+            label.set_text(f"{value}")
+            label.xy = (label.xy[0], height)
+        return self.fig
+
+    def to_png(self, dpi: Optional[int] = None) -> bytes:
+        """Render the current figure to PNG bytes."""
+        buf = BytesIO()
+        self.fig.savefig(buf, format="png", dpi=dpi)
+        return buf.getvalue()
+
+
+def draw_state_fig(state, highlight=(), info="", bar_color="#4C78A8", highlight_color="#EE994F", renderer=None,
+                   style: Optional[str] = None, offset: int = 0):
+    """Draws a bar chart with axis labels, title, and highlight indices.
+
+    Pass a ``BarRenderer`` to reuse its figure: only bar heights, colors and
+    labels are updated instead of building a new figure every frame.
+    ``offset`` numbers the bars from there (a window of a longer array).
+    """
+    # If state is a grid (list of lists), flatten for now
+    if not isinstance(state, (list, tuple)) or (len(state) and isinstance(state[0], (list, tuple))):
+        # Fallback: show a simple text when non-list state
+        import matplotlib.pyplot as plt
+
+        with plt.style.context(style or "default"):
+            fig, ax = plt.subplots(figsize=(9, 4))
+        ax.text(0.5, 0.5, str(state), ha='center', va='center')
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.set_title(info, fontsize=12)
+        plt.tight_layout()
+        return fig
+    if renderer is None:
+        renderer = BarRenderer(bar_color=bar_color, highlight_color=highlight_color, style=style)
+    elif (renderer.bar_color, renderer.highlight_color) != (bar_color, highlight_color):
+        renderer.set_colors(bar_color, highlight_color)
+    return renderer.update(state, highlight, info, offset=offset)
+
+
+def draw_state(state: List[int], highlight=(), info: str = "", pause: float = 0.05):
+    """Draw into the current pyplot figure and wait ``pause`` seconds (0: no wait, no redraw)."""
+    import matplotlib.pyplot as plt
+
+    fig = plt.gcf()
+    renderer = getattr(fig, "_bar_renderer", None)
+    if renderer is None or renderer.ax not in fig.axes:
+        renderer = BarRenderer(ax=fig.gca(), bar_color="C0", highlight_color="C1")
+        fig._bar_renderer = renderer
+    renderer.update(state, highlight, info)
+    if pause:
+        plt.pause(pause)
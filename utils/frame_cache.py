@@ -0,0 +1,114 @@
+"""Cache of rendered frames (PNG/SVG bytes) with LRU eviction and prefetching.
+
+Keys are plain tuples, normally ``(input fingerprint, frame index, colors)``
+built with :func:`frame_key`, so stepping back and forth or replaying a run
+reuses the images already rendered. ``FramePrefetcher`` renders the next few
+frames on a background thread while the current one is on screen.
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def frame_key(fingerprint: str, index: int, colors: Tuple = ()) -> Tuple:
+    """Cache key for frame ``index`` of a run drawn with ``colors``."""
+    return (fingerprint, index, tuple(colors))
+
+
+class FrameCache:
+    """Thread-safe LRU cache of rendered frames bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: Hashable, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._items[key] = data
+            self.nbytes += len(data)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def get_or_render(self, key: Hashable, render: Callable[[], bytes]) -> bytes:
+        data = self.get(key)
+        if data is None:
+            data = render()
+            self.put(key, data)
+        return data
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+
+class FramePrefetcher:
+    """Renders upcoming frames into a ``FrameCache`` on a worker thread.
+
+    ``render`` is called as ``render(key)`` on the worker only, so it may hold
+    its own matplotlib figure without locking against the foreground renderer.
+    """
+
+    def __init__(self, cache: FrameCache, render: Callable[[Hashable], Optional[bytes]], workers: int = 1):
+        self.cache = cache
+        self.render = render
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-prefetch")
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, keys: Iterable[Hashable]) -> None:
+        """Queue rendering of every key that is neither cached nor queued."""
+        for key in keys:
+            with self._lock:
+                if key in self._pending or key in self.cache:
+                    continue
+                self._pending[key] = self._pool.submit(self._run, key)
+
+    def _run(self, key: Hashable) -> None:
+        try:
+            if key not in self.cache:
+                data = self.render(key)
+                if data is not None:
+                    self.cache.put(key, data)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def wait(self) -> None:
+        """Block until everything scheduled so far has been rendered."""
+        with self._lock:
+            futures = list(self._pending.values())
+        wait(futures)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False)
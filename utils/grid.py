@@ -0,0 +1,132 @@
+"""Row-major grid helpers shared by the pathfinding algorithms.
+
+Cells are addressed by flat index ``r * cols + c``; walls (non-zero cells)
+are kept in a ``bytearray`` and parents in an ``array('i')`` so a 1000×1000
+grid costs a few megabytes instead of millions of tuples.
+"""
+import time
+from array import array
+from functools import wraps
+from typing import Dict, Generator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def flat_walls(grid) -> Tuple[int, int, bytearray]:
+    """``(rows, cols, walls)`` for a list of rows or a 2-D array; 1 marks a wall."""
+    if not len(grid):
+        return 0, 0, bytearray()
+    cells = np.asarray(grid)
+    if cells.ndim != 2:
+        raise ValueError("grid must be a rectangular list of rows")
+    rows, cols = cells.shape
+    return rows, cols, bytearray((cells != 0).astype(np.uint8).tobytes())
+
+
+def flat_weights(weights, rows: int, cols: int) -> Optional[array]:
+    """Cost of entering each cell as an ``array('d')``, or None for unit costs."""
+    if weights is None:
+        return None
+    cells = np.asarray(weights, dtype=np.float64)
+    if cells.shape != (rows, cols):
+        raise ValueError(f"weights must have the grid's shape {rows}x{cols}, not {cells.shape}")
+    if (cells <= 0).any():
+        raise ValueError("cell weights must be positive")
+    return array("d", cells.tobytes())
+
+
+def to_index(cell: Sequence[int], cols: int) -> int:
+    return cell[0] * cols + cell[1]
+
+
+def to_cell(index: int, cols: int) -> Tuple[int, int]:
+    return divmod(index, cols)
+
+
+def parent_array(size: int) -> array:
+    """Parent index per cell, -1 for none."""
+    return array("i", [-1]) * size
+
+
+def rebuild_path(parent: array, goal: int, cols: int) -> List[Tuple[int, int]]:
+    """Cells from the root of ``goal``'s parent chain to ``goal``."""
+    path = []
+    index = goal
+    while index != -1:
+        path.append(divmod(index, cols))
+        index = parent[index]
+    path.reverse()
+    return path
+
+
+def parse_grid(text: str) -> Tuple[List[List[int]], Tuple[int, int], Tuple[int, int]]:
+    """``(grid, start, goal)`` from a text maze.
+
+    One line per row; ``#`` or ``1`` is a wall, ``.`` or ``0`` open, ``S`` and
+    ``G`` mark start and goal (default: top-left and bottom-right corners).
+    """
+    rows = [line.strip().replace(" ", "") for line in text.strip().splitlines() if line.strip()]
+    if not rows:
+        raise ValueError("grid is empty")
+    if len({len(row) for row in rows}) != 1:
+        raise ValueError("all grid rows must have the same length")
+    grid, start, goal = [], None, None
+    for r, row in enumerate(rows):
+        cells = []
+        for c, ch in enumerate(row):
+            if ch in "#1":
+                cells.append(1)
+            elif ch in ".0":
+                cells.append(0)
+            elif ch in "Ss":
+                start = (r, c)
+                cells.append(0)
+            elif ch in "Gg":
+                goal = (r, c)
+                cells.append(0)
+            else:
+                raise ValueError(f"unknown grid cell {ch!r} at row {r + 1}")
+        grid.append(cells)
+    start = start or (0, 0)
+    goal = goal or (len(grid) - 1, len(grid[0]) - 1)
+    grid[start[0]][start[1]] = grid[goal[0]][goal[1]] = 0
+    return grid, start, goal
+
+
+def random_grid(rows: int, cols: int, density: float = 0.25, seed=None) -> List[List[int]]:
+    """``rows`` × ``cols`` grid with about ``density`` of its cells walls."""
+    cells = (np.random.default_rng(seed).random((rows, cols)) < density).astype(int)
+    return cells.tolist()
+
+
+def search_stats(search):
+    """Decorate a grid search generator to report its work on the last frame.
+
+    The last frame gains ``"stats"``: ``{"expanded": cells expanded,
+    "seconds": time spent inside the generator}``. Time spent by the consumer
+    between frames is not counted, so runs can be compared however they are
+    played back.
+    """
+    @wraps(search)
+    def wrapper(*args, **kwargs) -> Generator[Dict, None, Optional[List[Tuple[int, int]]]]:
+        gen = search(*args, **kwargs)
+        expanded = 0
+        seconds = 0.0
+        frame = None
+        while True:
+            resumed = time.perf_counter()
+            try:
+                following = next(gen)
+            except StopIteration as stop:
+                seconds += time.perf_counter() - resumed
+                if frame is not None:
+                    frame["stats"] = {"expanded": expanded, "seconds": seconds}
+                    yield frame
+                return stop.value
+            seconds += time.perf_counter() - resumed
+            # frames are passed on one late, so the last one can carry the totals
+            if frame is not None:
+                yield frame
+            frame = following
+            expanded += len(frame.get("visited", ()))
+    return wrapper
@@ -0,0 +1,204 @@
+"""Compact traces for grid (pathfinding) algorithms.
+
+Grid generators yield deltas: the cells expanded (``visited``) and
+discovered (``frontier``) in each frame. A ``GridTrace`` appends those to two
+flat index columns and keeps, per frame, where its slice ends. Cell states
+only ever move forward (empty -> frontier -> visited -> path), so the raster
+for any frame is the walls plus two vectorized writes; no keyframes needed.
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils.grid import flat_walls, to_index
+
+EMPTY = 0
+WALL = 1
+FRONTIER = 2
+VISITED = 3
+PATH = 4
+CURRENT = 5
+START = 6
+GOAL = 7
+
+CELL_NAMES = ("empty", "wall", "frontier", "visited", "path", "current", "start", "goal")
+
+# info text of an ordinary expansion frame, stored as one template
+VISIT_INFO = "visit {r},{c}"
+
+
+def is_grid_frame(frame: Dict) -> bool:
+    return "frontier" in frame or "visited" in frame
+
+
+class GridTrace(Sequence):
+    """Randomly accessible frames of a grid algorithm.
+
+    ``trace[k]`` is the frame dict as yielded; ``raster_at(k)`` the uint8
+    cell codes after frame ``k`` and ``delta(a, b)`` the cells discovered
+    and expanded in frames ``a+1..b``.
+    """
+
+    def __init__(self, grid, start: Optional[Sequence[int]] = None, goal: Optional[Sequence[int]] = None):
+        self.grid = grid
+        self.rows, self.cols, walls = flat_walls(grid)
+        self.walls = np.frombuffer(bytes(walls), dtype=np.uint8)
+        self.start = None if start is None else to_index(start, self.cols)
+        self.goal = None if goal is None else to_index(goal, self.cols)
+        self.frontier = array("i")
+        self.visited = array("i")
+        # per frame: end of its slice of ``frontier``/``visited``
+        self.frontier_end = array("q")
+        self.visited_end = array("q")
+        # per frame: the expanded cell, or -1
+        self.current = array("i")
+        self.info_ids = array("I")
+        self.infos: List[str] = [VISIT_INFO]
+        self._info_lookup: Dict[str, int] = {}
+        # running size of ``infos``, so nbytes() reads plain ints
+        self._info_bytes = len(VISIT_INFO)
+        self.highlights: Dict[int, List] = {}
+        self.path: Optional[List[Tuple[int, int]]] = None
+        self.path_frame: Optional[int] = None
+        # ``{"expanded", "seconds"}`` reported on the last frame of a search
+        self.stats: Optional[Dict] = None
+        self.stats_frame: Optional[int] = None
+        # no op columns and no pass marks: a level-of-detail view samples
+        # grid traces by frame count only
+        self.pass_starts = array("q")
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[Dict], start=None, goal=None) -> "GridTrace":
+        trace = None
+        for frame in frames:
+            if trace is None:
+                trace = cls(frame["state"], start, goal)
+            trace.record(frame)
+        return trace if trace is not None else cls([], start, goal)
+
+    def record(self, frame: Dict) -> None:
+        k = len(self.current)
+        visited = frame.get("visited", ())
+        self.frontier.extend(frame.get("frontier", ()))
+        self.visited.extend(visited)
+        self.frontier_end.append(len(self.frontier))
+        self.visited_end.append(len(self.visited))
+        current = visited[-1] if len(visited) == 1 else -1
+        self.current.append(current)
+        if self.start is None and k == 0 and len(frame.get("frontier", ())) == 1:
+            self.start = frame["frontier"][0]
+        info = frame.get("info", "")
+        if current >= 0 and info == VISIT_INFO.format(r=current // self.cols, c=current % self.cols):
+            self.info_ids.append(0)
+        else:
+            info_id = self._info_lookup.get(info)
+            if info_id is None:
+                info_id = self._info_lookup[info] = len(self.infos)
+                self.infos.append(info)
+                self._info_bytes += len(info)
+            self.info_ids.append(info_id)
+        if "path" in frame:
+            self.path = list(frame["path"])
+            self.path_frame = k
+            if self.goal is None and self.path:
+                self.goal = to_index(self.path[-1], self.cols)
+        if "stats" in frame:
+            self.stats = dict(frame["stats"])
+            self.stats_frame = k
+        highlight = list(frame.get("highlight", ()))
+        if highlight != self._default_highlight(k):
+            self.highlights[k] = self.path if k == self.path_frame and highlight == self.path else highlight
+
+    # -- access ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.current)
+
+    def _index(self, k: int) -> int:
+        n = len(self.current)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("trace index out of range")
+        return k
+
+    def _default_highlight(self, k: int) -> List:
+        current = self.current[k]
+        return [divmod(current, self.cols)] if current >= 0 else []
+
+    def info_at(self, k: int) -> str:
+        k = self._index(k)
+        info_id = self.info_ids[k]
+        if info_id == 0:
+            r, c = divmod(self.current[k], self.cols)
+            return VISIT_INFO.format(r=r, c=c)
+        return self.infos[info_id]
+
+    def highlight_at(self, k: int) -> List:
+        k = self._index(k)
+        return self.highlights.get(k, self._default_highlight(k))
+
+    def stats_at(self, k: int) -> Dict:
+        """Cells expanded up to frame ``k``; ``seconds`` too once the search reported it."""
+        k = self._index(k)
+        stats = {"expanded": self.visited_end[k], "seconds": None}
+        if self.stats_frame is not None and k >= self.stats_frame:
+            stats.update(self.stats)
+        return stats
+
+    def _bounds(self, k: int) -> Tuple[int, int]:
+        """Start of frame ``k``'s slices (frame -1 ends at 0)."""
+        if k < 0:
+            return 0, 0
+        return self.frontier_end[k], self.visited_end[k]
+
+    def delta(self, a: int, b: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Cells discovered and cells expanded in frames ``a+1..b``."""
+        f0, v0 = self._bounds(a)
+        f1, v1 = self._bounds(b)
+        # slice first: a buffer view of the live column would block appends
+        return (np.frombuffer(self.frontier[f0:f1], dtype=np.int32),
+                np.frombuffer(self.visited[v0:v1], dtype=np.int32))
+
+    def raster_at(self, k: int) -> np.ndarray:
+        """Cell codes (``EMPTY``, ``WALL``, ``FRONTIER``, ``VISITED``, ``PATH``) after frame ``k``."""
+        k = self._index(k)
+        raster = self.walls * WALL
+        frontier, visited = self.delta(-1, k)
+        raster[frontier] = FRONTIER
+        raster[visited] = VISITED
+        if self.path_frame is not None and k >= self.path_frame:
+            raster[[to_index(cell, self.cols) for cell in self.path]] = PATH
+        return raster.reshape(self.rows, self.cols)
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        k = self._index(k)
+        f0, v0 = self._bounds(k - 1)
+        frame = {
+            "state": self.grid,
+            "highlight": self.highlight_at(k),
+            "info": self.info_at(k),
+            "visited": tuple(self.visited[v0:self.visited_end[k]]),
+            "frontier": tuple(self.frontier[f0:self.frontier_end[k]]),
+        }
+        if k == self.path_frame:
+            frame["path"] = self.path
+        if k == self.stats_frame:
+            frame["stats"] = dict(self.stats)
+        return frame
+
+    def final_state(self):
+        return self.grid
+
+    def nbytes(self) -> int:
+        cols = (self.frontier, self.visited, self.frontier_end, self.visited_end, self.current, self.info_ids)
+        columns = sum(c.itemsize * len(c) for c in cols)
+        return self.walls.nbytes + columns + self._info_bytes + 64 * len(self.highlights)
+
+
+def record_grid_trace(frames: Iterable[Dict], start=None, goal=None) -> GridTrace:
+    """Record a grid algorithm generator into a :class:`GridTrace`."""
+    return GridTrace.from_frames(frames, start, goal)
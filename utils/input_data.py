@@ -0,0 +1,210 @@
+"""Array inputs: typed text, uploaded files and generated datasets.
+
+Every reader returns a 1-D ``int64`` NumPy array and raises ``ValueError``
+with a readable message on bad input. Text is parsed with NumPy's C parser
+(``np.fromstring``) instead of a Python loop over tokens, and uploaded CSV
+files are read in chunks, so reading stops as soon as an input turns out
+larger than ``max_values``.
+
+How large an input may be depends on the algorithm: ``estimate_frames``
+guesses a run's frame count from its complexity string, and
+``max_input_size`` turns a frame budget into the largest ``n`` that fits it.
+"""
+import math
+import os
+import re
+import warnings
+from typing import BinaryIO, Optional
+
+import numpy as np
+
+# Largest input accepted from any source
+MAX_VALUES = 1_000_000
+# Upload chunks; CSV text is parsed one chunk at a time
+CHUNK_BYTES = 1 << 20
+# Trace memory per frame, rounded up from what the sorting traces use
+BYTES_PER_FRAME = 20
+
+DATASETS = ("random", "nearly sorted", "reversed", "few unique")
+RAW_DTYPES = ("int8", "int16", "int32", "int64", "uint8", "uint16", "uint32")
+TEXT_SUFFIXES = (".csv", ".txt")
+NPY_SUFFIX = ".npy"
+
+_INT64 = np.iinfo(np.int64)
+_SEPARATORS = (b",", b" ", b"\t", b"\n", b"\r")
+_HEADER = re.compile(rb'\s*["\'A-Za-z_]')
+
+
+def _too_many(max_values: int) -> ValueError:
+    return ValueError(f"more than {max_values:,} values")
+
+
+def _bad_token(text: str) -> str:
+    for token in text.split():
+        try:
+            int(token)
+        except ValueError:
+            return token
+    return text[:20]
+
+
+def parse_text(text: str, max_values: int = MAX_VALUES) -> np.ndarray:
+    """Integers separated by commas and/or whitespace; empty fields are skipped."""
+    text = text.replace(",", " ").strip()
+    if not text:
+        return np.empty(0, dtype=np.int64)
+    with warnings.catch_warnings():
+        # older NumPy warns instead of raising when it stops at a bad token
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            values = np.fromstring(text, dtype=np.int64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            raise ValueError(f"not an integer: {_bad_token(text)!r}") from None
+    if len(values) > max_values:
+        raise _too_many(max_values)
+    # the parser saturates out-of-range numbers instead of failing
+    if len(values) and (values.max() == _INT64.max or values.min() == _INT64.min):
+        raise ValueError("values must fit in 64 bits")
+    return values
+
+
+def read_csv(fh: BinaryIO, max_values: int = MAX_VALUES, chunk_bytes: int = CHUNK_BYTES) -> np.ndarray:
+    """Every integer in a CSV or plain text file, in file order.
+
+    A first line starting with a letter or quote is a header and is skipped.
+    """
+    carry = fh.readline(4096)
+    if _HEADER.match(carry):
+        carry = b""
+    parts = []
+    count = 0
+    while True:
+        chunk = fh.read(chunk_bytes)
+        data = carry + chunk
+        carry = b""
+        if chunk:
+            # parse up to the last separator; the rest may continue in the next chunk
+            cut = max(data.rfind(sep) for sep in _SEPARATORS) + 1
+            data, carry = data[:cut], data[cut:]
+        try:
+            values = parse_text(data.decode("utf-8"), max_values - count)
+        except UnicodeDecodeError:
+            raise ValueError("not a text file") from None
+        parts.append(values)
+        count += len(values)
+        if not chunk:
+            return np.concatenate(parts)
+
+
+def _as_int64(values: np.ndarray) -> np.ndarray:
+    if values.dtype.kind == "b":
+        return values.astype(np.int64)
+    if values.dtype.kind == "u" and values.size and values.max() > _INT64.max:
+        raise ValueError("values must fit in 64 bits")
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64)
+    if values.dtype.kind == "f":
+        if not np.all(np.isfinite(values)) or np.any(values != np.round(values)):
+            raise ValueError("only whole numbers can be sorted here")
+        if values.size and (values.max() >= 2.0 ** 63 or values.min() < -2.0 ** 63):
+            raise ValueError("values must fit in 64 bits")
+        return values.astype(np.int64)
+    raise ValueError(f"unsupported array type {values.dtype}")
+
+
+def read_npy(fh: BinaryIO, max_values: int = MAX_VALUES) -> np.ndarray:
+    """A NumPy ``.npy`` file of numbers, flattened."""
+    try:
+        values = np.load(fh, allow_pickle=False)
+    except (OSError, ValueError) as exc:
+        raise ValueError(f"not a readable .npy file: {exc}") from None
+    if not isinstance(values, np.ndarray):
+        raise ValueError("expected a single array")
+    if values.size > max_values:
+        raise _too_many(max_values)
+    return _as_int64(values.reshape(-1))
+
+
+def read_raw(fh: BinaryIO, dtype: str = "int32", max_values: int = MAX_VALUES) -> np.ndarray:
+    """Packed little-endian integers of ``dtype`` with no header."""
+    if dtype not in RAW_DTYPES:
+        raise ValueError(f"unknown raw type {dtype!r}")
+    item = np.dtype(dtype).newbyteorder("<")
+    data = fh.read(max_values * item.itemsize + 1)
+    if len(data) > max_values * item.itemsize:
+        raise _too_many(max_values)
+    if len(data) % item.itemsize:
+        raise ValueError(f"file size is not a multiple of {item.itemsize} bytes ({dtype})")
+    return _as_int64(np.frombuffer(data, dtype=item))
+
+
+def read_upload(fh: BinaryIO, name: str, raw_dtype: str = "int32", max_values: int = MAX_VALUES) -> np.ndarray:
+    """Read an uploaded file by its extension: CSV/text, ``.npy`` or raw binary."""
+    suffix = os.path.splitext(name)[1].lower()
+    if suffix in TEXT_SUFFIXES:
+        return read_csv(fh, max_values)
+    if suffix == NPY_SUFFIX:
+        return read_npy(fh, max_values)
+    return read_raw(fh, raw_dtype, max_values)
+
+
+def generate(kind: str, n: int, seed: Optional[int] = None) -> np.ndarray:
+    """A dataset of ``n`` integers, reproducible with ``seed``.
+
+    ``random`` draws from ``0..10n``, ``nearly sorted`` is sorted random data
+    with about one in twenty elements swapped with a near neighbour,
+    ``reversed`` counts down from ``n`` and ``few unique`` draws from ``0..4``.
+    """
+    if not 1 <= n <= MAX_VALUES:
+        raise ValueError(f"size must be between 1 and {MAX_VALUES:,}")
+    rng = np.random.default_rng(seed)
+    if kind == "random":
+        return rng.integers(0, 10 * n, n, dtype=np.int64, endpoint=True)
+    if kind == "nearly sorted":
+        values = np.sort(rng.integers(0, 10 * n, n, dtype=np.int64, endpoint=True))
+        swaps = n // 20
+        left = rng.integers(0, n, swaps)
+        right = np.clip(left + rng.integers(1, 6, swaps), 0, n - 1)
+        for i, j in zip(left.tolist(), right.tolist()):
+            values[i], values[j] = values[j], values[i]
+        return values
+    if kind == "reversed":
+        return np.arange(n, 0, -1, dtype=np.int64)
+    if kind == "few unique":
+        return rng.integers(0, 4, n, dtype=np.int64, endpoint=True)
+    raise ValueError(f"unknown dataset: {kind}")
+
+
+def estimate_frames(complexity: str, n: int) -> int:
+    """Rough upper bound on the frames a run on ``n`` values yields.
+
+    Reads the leading term of a complexity string such as ``"O(n²)"`` or
+    ``"O(n log n) average, O(n²) worst"`` (the first one given).
+    """
+    term = complexity.split(",")[0].replace(" ", "")
+    log_n = math.log2(n) if n > 1 else 1.0
+    if "n²" in term or "n^2" in term:
+        return n * n
+    if "nlogn" in term:
+        return int(2 * n * log_n) + n
+    if "logn" in term:
+        return int(log_n) + 2
+    return 2 * n
+
+
+def max_input_size(complexity: str, budget: int) -> int:
+    """The largest ``n`` (at most ``MAX_VALUES``) whose estimated frames fit ``budget``."""
+    lo, hi = 0, MAX_VALUES
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_frames(complexity, mid) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def preview(values, limit: int = 20) -> str:
+    """The first ``limit`` values as text, e.g. ``"[5, 2, 4, …]"`` (1,000 values)."""
+    head = ", ".join(str(v) for v in values[:limit])
+    return f"[{head}, …]" if len(values) > limit else f"[{head}]"
@@ -0,0 +1,196 @@
+"""Operation counters and timings for algorithm runs.
+
+``instrument(gen, metrics)`` wraps any generator from ``algorithms/`` without
+touching its code and fills a :class:`RunMetrics` as frames are pulled:
+
+* op counts (comparisons, swaps, writes, ...) read from each frame's ``op``;
+* recursion depth, the length of the ``yield from`` chain the frame came
+  out of (a helper generator such as merge sort's ``_merge`` is one level),
+  or the frame's own ``depth`` from generators that keep an explicit stack;
+* time spent inside the generator, in total and per phase, where a phase
+  starts at every frame flagged ``"pass"``.
+
+A :class:`~utils.timeline.Timeline` built with ``metrics=`` also adds the
+time it spends recording frames, the visualizer's overhead next to the
+algorithm's own work. Runs that are not instrumented keep the bare
+generator, so the counters cost nothing unless asked for.
+
+``python -m utils.instrumentation ALGORITHM ...`` prints a run's report as
+JSON.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from array import array
+from typing import Any, Dict, Generator, Iterable, List
+
+import numpy as np
+
+from utils.trace import OP_NAMES
+
+
+class RunMetrics:
+    """Counters and timings of one instrumented run, filled while it generates."""
+
+    def __init__(self):
+        self.frames = 0
+        self.ops: Dict[str, int] = dict.fromkeys(OP_NAMES, 0)
+        self.first_op = "note"
+        # recursion depth of every frame
+        self.depths = array("H")
+        self.max_depth = 0
+        # seconds spent inside the generator and recording its frames
+        self.work_seconds = 0.0
+        self.record_seconds = 0.0
+        # first frame, work seconds and op counts at the start of each phase
+        self.phase_starts = array("q")
+        self._phase_seconds = array("d")
+        self._phase_ops: List[Dict[str, int]] = []
+        self.done = False
+
+    def _start_phase(self) -> None:
+        self.phase_starts.append(self.frames)
+        self._phase_seconds.append(self.work_seconds)
+        self._phase_ops.append(dict(self.ops))
+
+    def ops_until(self, trace, stop: int) -> Dict[str, int]:
+        """Op counts over frames ``0..stop-1`` of this run's recorded ``trace``.
+
+        Traces keep their first frame as a note; it is counted here as the op
+        the generator reported.
+        """
+        counts = op_counts_until(trace, stop)
+        if stop > 0 and counts["note"] and self.first_op != "note":
+            counts["note"] -= 1
+            counts[self.first_op] += 1
+        return counts
+
+    def phases(self) -> List[Dict[str, Any]]:
+        """``{"start", "frames", "seconds", "ops"}`` of every phase so far."""
+        starts = list(self.phase_starts) + [self.frames]
+        seconds = list(self._phase_seconds) + [self.work_seconds]
+        ops = self._phase_ops + [self.ops]
+        return [{
+            "start": starts[p],
+            "frames": starts[p + 1] - starts[p],
+            "seconds": seconds[p + 1] - seconds[p],
+            "ops": {name: ops[p + 1][name] - ops[p][name] for name in OP_NAMES},
+        } for p in range(len(self.phase_starts))]
+
+    def report(self) -> Dict[str, Any]:
+        """The metrics as a JSON-serializable dict."""
+        return {
+            "frames": self.frames,
+            "done": self.done,
+            "ops": dict(self.ops),
+            "max_depth": self.max_depth,
+            "seconds": {"algorithm": self.work_seconds, "recording": self.record_seconds},
+            "phases": self.phases(),
+        }
+
+    def nbytes(self) -> int:
+        return self.depths.itemsize * len(self.depths) + 16 * len(self.phase_starts) + 64 * len(self._phase_ops)
+
+
+def _depth(gen) -> int:
+    depth = 0
+    inner = getattr(gen, "gi_yieldfrom", None)
+    while inner is not None:
+        depth += 1
+        inner = getattr(inner, "gi_yieldfrom", None)
+    return depth
+
+
+def instrument(frames: Iterable[Dict], metrics: RunMetrics) -> Generator[Dict, None, Any]:
+    """Yield the frames of ``frames`` unchanged while filling ``metrics``.
+
+    Returns whatever the wrapped generator returns.
+    """
+    gen = iter(frames)
+    clock = time.perf_counter
+    ops = metrics.ops
+    depths = metrics.depths
+    while True:
+        resumed = clock()
+        try:
+            frame = next(gen)
+        except StopIteration as stop:
+            metrics.work_seconds += clock() - resumed
+            metrics.done = True
+            return stop.value
+        metrics.work_seconds += clock() - resumed
+        op = frame.get("op")
+        name = op[0] if op else "note"
+        if frame.get("pass") or not metrics.frames:
+            if not metrics.frames:
+                metrics.first_op = name
+            metrics._start_phase()
+        ops[name] += 1
+        depth = frame.get("depth")
+        if depth is None:
+            depth = _depth(gen)
+        depths.append(depth)
+        if depth > metrics.max_depth:
+            metrics.max_depth = depth
+        metrics.frames += 1
+        yield frame
+
+
+def op_counts_until(trace, stop: int) -> Dict[str, int]:
+    """Op counts of a recorded trace over frames ``0..stop-1``; zeros for grid traces."""
+    kinds = getattr(trace, "kinds", None)
+    if kinds is None or stop <= 0:
+        return dict.fromkeys(OP_NAMES, 0)
+    codes = np.frombuffer(kinds, dtype=np.uint8, count=min(stop, len(kinds)))
+    return dict(zip(OP_NAMES, np.bincount(codes, minlength=len(OP_NAMES)).tolist()))
+
+
+def main(argv=None) -> int:
+    from algorithms.registry import get_algorithm
+    from utils.timeline import Timeline
+
+    parser = argparse.ArgumentParser(description="Run an algorithm with instrumentation and print its report.")
+    parser.add_argument("algorithm", help="registered array algorithm, e.g. bubble_sort or 'Merge Sort'")
+    parser.add_argument("data", nargs="?", help="comma separated integers, e.g. 5,2,4,1,3")
+    parser.add_argument("--random", type=int, metavar="N", help="use N random integers instead of DATA")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=int, help="target value for search algorithms")
+    parser.add_argument("--phases", action="store_true", help="include every phase in the report")
+    parser.add_argument("-o", "--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    spec = get_algorithm(args.algorithm)
+    if spec.input_kind == "grid":
+        parser.error(f"{spec.name} works on grids; only array algorithms are supported here")
+    if args.random is not None:
+        rng = random.Random(args.seed)
+        data = [rng.randint(0, 10 * args.random) for _ in range(args.random)]
+    elif args.data:
+        data = [int(x) for x in args.data.split(",") if x.strip()]
+    else:
+        parser.error("give DATA or --random N")
+    params = []
+    if spec.input_kind == "sorted_array":
+        if args.target is None:
+            parser.error(f"{spec.name} needs --target")
+        data.sort()
+        params.append(args.target)
+
+    metrics = RunMetrics()
+    Timeline(instrument(spec.load()(data, *params), metrics), metrics=metrics).run_to_end()
+    report = {"algorithm": spec.name, "n": len(data), **metrics.report()}
+    if not args.phases:
+        report["phases"] = len(report["phases"])
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
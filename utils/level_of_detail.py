@@ -0,0 +1,154 @@
+"""Level-of-detail playback for long traces.
+
+A bubble sort of a few thousand elements has millions of frames. A
+``SampledTrace`` shows only some of them: one per outer pass, every K-th
+frame, or an evenly spaced selection sized to a frame budget or a duration.
+Each shown frame reports the operations it stands for, so the info line
+still says how much work happened since the previous one.
+
+Pass boundaries come from the generators' ``"pass"`` flag, recorded in
+``Trace.pass_starts``.
+"""
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+from utils.trace import COMPARE, OP_NAMES, SET, SWAP, Trace
+
+EVERY_FRAME = "every frame"
+PER_PASS = "per pass"
+EVERY_K = "every k frames"
+FRAME_BUDGET = "frame budget"
+DURATION = "duration"
+LEVELS = (EVERY_FRAME, PER_PASS, EVERY_K, FRAME_BUDGET, DURATION)
+
+_SUMMARY = ((COMPARE, "compare", "compares"), (SWAP, "swap", "swaps"), (SET, "write", "writes"))
+
+
+class SampledTrace(Sequence):
+    """The frames of ``trace`` at ``indices`` (sorted, last frame included).
+
+    ``view[k]`` is the frame dict of ``trace[indices[k]]`` plus ``"step"``,
+    its index in the full trace, and ``"ops"``, the op counts of every frame
+    since the previous shown one (this one included). Offers the same
+    ``has_frame``/``known_length``/``total`` playback interface as a
+    :class:`~utils.timeline.Timeline`.
+    """
+
+    def __init__(self, trace: Trace, indices: Sequence[int]):
+        self.trace = trace
+        n = len(trace)
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        indices = indices[(indices >= 0) & (indices < n)]
+        if n and (not len(indices) or indices[-1] != n - 1):
+            indices = np.append(indices, n - 1)
+        self.indices = indices
+        self.op_counts = _segment_counts(trace, indices)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    @property
+    def known_length(self) -> int:
+        return len(self.indices)
+
+    @property
+    def total(self) -> int:
+        return len(self.indices)
+
+    def has_frame(self, k: int) -> bool:
+        return 0 <= k < len(self.indices)
+
+    def step_at(self, k: int) -> int:
+        """Index in the full trace of shown frame ``k``."""
+        return int(self.indices[k])
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        step = self.step_at(k)
+        counts = self.op_counts[k]
+        frame = self.trace[step]
+        frame["step"] = step
+        frame["ops"] = dict(zip(OP_NAMES, counts.tolist()))
+        if counts.sum() > 1:
+            frame["info"] = f"{frame['info']} ({summarize(frame['ops'])})"
+        return frame
+
+    def __iter__(self) -> Iterator[Dict]:
+        return (self[k] for k in range(len(self)))
+
+
+def summarize(ops: Dict[str, int]) -> str:
+    """Short text for aggregated op counts, e.g. ``"120 compares, 31 swaps"``."""
+    parts = []
+    for code, one, many in _SUMMARY:
+        count = ops.get(OP_NAMES[code], 0)
+        if count:
+            parts.append(f"{count} {one if count == 1 else many}")
+    return ", ".join(parts) or "no changes"
+
+
+def _segment_counts(trace: Trace, indices: np.ndarray) -> np.ndarray:
+    """Op counts per kind over frames ``(indices[k-1], indices[k]]``."""
+    counts = np.zeros((len(indices), len(OP_NAMES)), dtype=np.int64)
+    # grid traces record cell deltas, not ops
+    if not len(indices) or not hasattr(trace, "kinds"):
+        return counts
+    kinds = np.array(trace.kinds, dtype=np.uint8)
+    starts = np.concatenate(([0], indices[:-1] + 1))
+    for code in range(len(OP_NAMES)):
+        counts[:, code] = np.add.reduceat(kinds == code, starts, dtype=np.int64)
+    return counts
+
+
+def every(trace: Trace, k: int) -> SampledTrace:
+    """Every ``k``-th frame (and the first and last)."""
+    k = max(1, int(k))
+    return SampledTrace(trace, np.concatenate(([0], np.arange(k - 1, len(trace), k))))
+
+
+def per_pass(trace: Trace) -> SampledTrace:
+    """The first frame and the last frame of every outer pass.
+
+    Traces without pass flags (e.g. searches) are shown frame by frame.
+    """
+    if not len(trace.pass_starts):
+        return every(trace, 1)
+    starts = np.array(trace.pass_starts, dtype=np.int64)
+    return SampledTrace(trace, np.concatenate(([0], starts - 1)))
+
+
+def budget(trace: Trace, frames: int) -> SampledTrace:
+    """At most ``frames`` evenly spaced frames, first and last included."""
+    frames = max(2, int(frames))
+    if len(trace) <= frames:
+        return every(trace, 1)
+    return SampledTrace(trace, np.linspace(0, len(trace) - 1, frames).round())
+
+
+def duration(trace: Trace, seconds: float, fps: float) -> SampledTrace:
+    """Enough frames to play the whole run in ``seconds`` at ``fps``."""
+    return budget(trace, int(seconds * fps))
+
+
+def level_of_detail(trace: Trace, level: str = EVERY_FRAME, value: Optional[float] = None,
+                    fps: float = 2.0) -> SampledTrace:
+    """Sample ``trace`` at one of ``LEVELS``.
+
+    ``value`` is K for ``EVERY_K``, the frame count for ``FRAME_BUDGET`` and
+    seconds for ``DURATION``.
+    """
+    if level == EVERY_FRAME:
+        return every(trace, 1)
+    if level == PER_PASS:
+        return per_pass(trace)
+    if value is None:
+        raise ValueError(f"level {level!r} needs a value")
+    if level == EVERY_K:
+        return every(trace, value)
+    if level == FRAME_BUDGET:
+        return budget(trace, value)
+    if level == DURATION:
+        return duration(trace, value, fps)
+    raise ValueError(f"unknown level of detail: {level!r}")
@@ -0,0 +1,139 @@
+"""Several algorithms on the same input, played side by side.
+
+A ``Race`` holds one finished timeline per algorithm (a "lane") and plays
+them in lock-step on a shared clock: tick ``k`` shows frame ``k`` of every
+lane, and lanes that finish early hold their last frame. ``counters(k)``
+gives each lane's comparisons, swaps and writes up to that tick.
+
+Lanes are generated concurrently in a process pool, since the generators
+are pure Python and threads would take turns on the interpreter lock; each
+worker records its run into a compact trace and sends that back. Lanes
+already in a ``TraceCache`` are reused, keyed by the same input fingerprint
+as a single run. ``render`` draws the lanes of one tick in parallel threads,
+one figure per lane.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from algorithms.registry import get_algorithm
+from utils.algo_interface import input_fingerprint
+from utils.instrumentation import op_counts_until
+from utils.timeline import Timeline
+from utils.trace import Trace
+
+
+def record_run(key: str, data: Sequence) -> Tuple[Trace, Any]:
+    """Run algorithm ``key`` on a copy of ``data`` to the end: ``(trace, result)``.
+
+    Module-level so a process pool can call it; the trace pickles compactly.
+    """
+    timeline = Timeline(get_algorithm(key).load()(list(data)))
+    return timeline.run_to_end(), timeline.result
+
+
+@dataclass
+class Lane:
+    """One algorithm's run in a race."""
+
+    key: str
+    name: str
+    run_key: str
+    timeline: Timeline
+
+    @property
+    def steps(self) -> int:
+        return self.timeline.known_length
+
+    def step_at(self, tick: int) -> int:
+        """Frame shown at ``tick``: the lane's last one once it has finished."""
+        return max(min(tick, self.steps - 1), 0)
+
+
+class Race:
+    """Finished lanes played in lock-step.
+
+    Offers the ``has_frame``/``known_length``/``total`` playback interface of
+    a :class:`~utils.timeline.Timeline`, counted in ticks of the longest lane.
+    """
+
+    def __init__(self, lanes: Sequence[Lane]):
+        self.lanes = list(lanes)
+        self._renderers: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def generate(cls, keys: Sequence[str], data: Sequence, executor: Optional[Executor] = None,
+                 cache=None) -> "Race":
+        """Run every algorithm in ``keys`` on ``data`` concurrently.
+
+        ``executor`` defaults to a process pool with one worker per missing
+        lane. With a ``TraceCache`` finished runs are taken from it and new
+        ones stored in it.
+        """
+        specs = [get_algorithm(key) for key in keys]
+        for spec in specs:
+            if spec.input_kind != "array":
+                raise ValueError(f"{spec.name} takes {spec.input_kind!r} input; races need array algorithms")
+        run_keys = [input_fingerprint(spec.name, list(data)) for spec in specs]
+        timelines: Dict[str, Timeline] = {}
+        if cache is not None:
+            for run_key in run_keys:
+                timeline = cache.get(run_key)
+                if timeline is not None and timeline.done:
+                    timelines[run_key] = timeline
+        missing = [(spec, run_key) for spec, run_key in zip(specs, run_keys) if run_key not in timelines]
+        if missing:
+            pool = executor or ProcessPoolExecutor(max_workers=len(missing))
+            try:
+                futures = [(spec, run_key, pool.submit(record_run, spec.key, list(data)))
+                           for spec, run_key in missing]
+                for spec, run_key, future in futures:
+                    timeline = Timeline.from_trace(*future.result())
+                    if cache is not None:
+                        cache.put(run_key, timeline, metadata={"algorithm": spec.name, "n": len(data)})
+                    timelines[run_key] = timeline
+            finally:
+                if executor is None:
+                    pool.shutdown()
+        return cls([Lane(spec.key, spec.name, run_key, timelines[run_key])
+                    for spec, run_key in zip(specs, run_keys)])
+
+    @property
+    def known_length(self) -> int:
+        return max((lane.steps for lane in self.lanes), default=0)
+
+    @property
+    def total(self) -> int:
+        return self.known_length
+
+    def has_frame(self, tick: int) -> bool:
+        return 0 <= tick < self.known_length
+
+    def frames_at(self, tick: int) -> List[Dict]:
+        """Each lane's frame at ``tick``."""
+        return [lane.timeline[lane.step_at(tick)] for lane in self.lanes]
+
+    def counters(self, tick: int) -> List[Dict[str, int]]:
+        """Each lane's op counts (``compare``, ``swap``, ``set``, ...) up to ``tick``."""
+        return [op_counts_until(lane.timeline.trace, lane.step_at(tick) + 1) for lane in self.lanes]
+
+    def standings(self) -> List[Lane]:
+        """Lanes by the number of steps they take, fewest first."""
+        return sorted(self.lanes, key=lambda lane: lane.steps)
+
+    def render(self, tick: int, render: Callable[[Lane, int], bytes]) -> List[bytes]:
+        """``render(lane, step)`` for every lane at ``tick``, on one thread per lane.
+
+        Each lane is rendered by one call at a time, so ``render`` may keep a
+        figure per lane without locking.
+        """
+        if self._renderers is None:
+            self._renderers = ThreadPoolExecutor(max_workers=max(len(self.lanes), 1),
+                                                 thread_name_prefix="race-render")
+        futures = [self._renderers.submit(render, lane, lane.step_at(tick)) for lane in self.lanes]
+        return [future.result() for future in futures]
+
+    def shutdown(self) -> None:
+        if self._renderers is not None:
+            self._renderers.shutdown(wait=False)
+            self._renderers = None
@@ -0,0 +1,92 @@
+"""Traces of search algorithms over a shared, read-only array.
+
+A search never changes its array, so a ``SearchTrace`` keeps no snapshot or
+keyframes of its own: it holds a reference to the array it was given (a
+read-only NumPy array shared by every search over it, see
+``algorithms.search_engine``) and records only each frame's op, highlight
+and info, in the columns of a :class:`~utils.trace.Trace`.
+
+Arrays longer than ``window`` are not drawn whole: ``trace[k]`` holds the
+``window`` values around that frame's highlight as ``state``, with
+``highlight`` and ``op`` relative to that slice and ``offset`` its position
+in the array. Info texts keep the real indices.
+"""
+from array import array
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from utils.trace import COMPARE, Trace, _as_highlight
+
+# Bars drawn per frame of a long search
+WINDOW = 200
+
+
+class SearchTrace(Trace):
+    """Frames of a search over ``values``, which are referenced, not copied."""
+
+    def __init__(self, values: Sequence, window: int = WINDOW):
+        super().__init__(())
+        self.initial = values
+        self._tail = values
+        self.window = window
+        # per frame: the index its window is centred on
+        self.centers = array("q")
+
+    def record(self, frame: Dict) -> None:
+        op = frame.get("op")
+        if op is not None and op[0] != "compare":
+            raise ValueError(f"a search cannot {op[0]}: the array is read-only")
+        highlight = _as_highlight(frame.get("highlight", ()))
+        self._record_op(op, highlight, frame.get("info", ""))
+        marks = [h for h in highlight if 0 <= h < len(self.initial)]
+        if marks:
+            center = (min(marks) + max(marks)) // 2
+        else:
+            center = self.centers[-1] if self.centers else len(self.initial) // 2
+        self.centers.append(center)
+
+    def add_keyframe(self, index: int, state) -> None:
+        """Nothing to store: every frame's state is the shared array."""
+
+    def state_at(self, k: int):
+        self._index(k)
+        return self.initial
+
+    def final_state(self):
+        return self.initial
+
+    def window_at(self, k: int) -> Tuple[int, int]:
+        """``(start, stop)`` of the values shown by frame ``k``."""
+        n = len(self.initial)
+        if n <= self.window:
+            return 0, n
+        start = min(max(self.centers[self._index(k)] - self.window // 2, 0), n - self.window)
+        return start, start + self.window
+
+    def _frame(self, k: int, state=None) -> Dict:
+        start, stop = self.window_at(k)
+        values = self.initial[start:stop]
+        frame = {
+            "state": values.tolist() if hasattr(values, "tolist") else list(values),
+            "highlight": tuple(h - start for h in self.highlight_at(k) if start <= h < stop),
+            "info": self.info_at(k),
+            "op": self.op_at(k),
+        }
+        if frame["op"] is not None:
+            frame["op"] = ("compare", frame["op"][1] - start, None)
+        if stop - start < len(self.initial):
+            frame["offset"] = start
+        return frame
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        stop = len(self) if stop is None else min(stop, len(self))
+        for k in range(start, stop):
+            yield self._frame(k)
+
+    def probes(self) -> int:
+        """Elements compared against the target so far."""
+        return self.kinds.count(COMPARE)
+
+    def nbytes(self) -> int:
+        """Memory held by this trace's columns; the shared array is not counted."""
+        columns = (self.kinds, self.first, self.second, self.info_ids, self.centers)
+        return sum(c.itemsize * len(c) for c in columns) + self._info_bytes + 64 * len(self.highlights)
@@ -0,0 +1,138 @@
+"""Lazy, seekable frame timeline.
+
+A ``Timeline`` wraps an algorithm generator and only runs it as far as the
+viewer has asked for (plus a small lookahead), recording the frames into a
+compact :class:`~utils.trace.Trace`. Going back to an earlier frame rebuilds it
+from the trace's keyframes instead of keeping every frame around, so playback
+can start as soon as the first frame exists.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from utils.grid_trace import GridTrace, is_grid_frame
+from utils.trace import Trace
+
+# Frames recorded between two ``on_grow`` calls
+GROW_CHECK = 4096
+
+
+class Timeline:
+    """Frames of a generator, produced on demand.
+
+    ``timeline[k]`` runs the generator until frame ``k`` exists (raising
+    ``IndexError`` if it finishes first) and then keeps at most ``lookahead``
+    frames ready beyond it. ``total`` is ``None`` until the generator is done.
+    If the generator raises, the timeline is not done: ``error`` keeps the
+    exception and every later request for a frame past the end raises it again.
+    ``on_grow``, if set, is called every ``GROW_CHECK`` recorded frames, e.g. by
+    a cache that bounds the memory of the runs it holds.
+    ``metrics`` is the :class:`~utils.instrumentation.RunMetrics` of an
+    instrumented generator; the time spent recording frames is added to it.
+    ``trace`` is an empty trace to record into instead of the one chosen
+    from the first frame, e.g. a :class:`~utils.search_trace.SearchTrace`.
+    """
+
+    def __init__(self, frames: Iterable[Dict], lookahead: int = 32, keyframe_interval: Optional[int] = None,
+                 start=None, goal=None, metrics=None, trace=None):
+        self._gen = iter(frames)
+        # endpoints shown by grid renderers; grid traces find them otherwise
+        self.start = start
+        self.goal = goal
+        self.lookahead = lookahead
+        self.keyframe_interval = keyframe_interval
+        self.metrics = metrics
+        self.trace: Optional[Trace] = trace
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.on_grow: Optional[Callable[[], None]] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_trace(cls, trace, result: Any = None) -> "Timeline":
+        """A finished timeline over an already recorded trace."""
+        timeline = cls(())
+        timeline.trace = trace
+        timeline.done = True
+        timeline.result = result
+        timeline._gen = None
+        return timeline
+
+    @property
+    def known_length(self) -> int:
+        """Number of frames generated so far."""
+        return len(self.trace) if self.trace is not None else 0
+
+    @property
+    def total(self) -> Optional[int]:
+        """Total frame count, once the generator has finished."""
+        return self.known_length if self.done else None
+
+    def _fill(self, k: int) -> None:
+        """Pull frames from the generator until frame ``k`` exists or it ends."""
+        with self._lock:
+            while not self.done and self.known_length <= k:
+                if self.error is not None:
+                    raise self.error
+                try:
+                    frame = next(self._gen)
+                except StopIteration as stop:
+                    self.done = True
+                    self.result = stop.value
+                    self._gen = None
+                    break
+                except Exception as exc:
+                    # a dead generator would only say StopIteration next time
+                    self.error = exc
+                    self._gen = None
+                    raise
+                if self.trace is None:
+                    self.trace = self._new_trace(frame)
+                if self.metrics is None:
+                    self.trace.record(frame)
+                else:
+                    started = time.perf_counter()
+                    self.trace.record(frame)
+                    self.metrics.record_seconds += time.perf_counter() - started
+                if self.on_grow is not None and len(self.trace) % GROW_CHECK == 0:
+                    self.on_grow()
+
+    def _new_trace(self, frame: Dict):
+        """A :class:`GridTrace` for grid algorithms, a :class:`Trace` otherwise."""
+        if is_grid_frame(frame):
+            return GridTrace(frame["state"], self.start, self.goal)
+        return Trace(frame.get("state", []), self.keyframe_interval)
+
+    def nbytes(self) -> int:
+        """Memory held by the frames recorded so far."""
+        size = self.trace.nbytes() if self.trace is not None else 0
+        return size + (self.metrics.nbytes() if self.metrics is not None else 0)
+
+    def has_frame(self, k: int) -> bool:
+        if k < 0:
+            return False
+        self._fill(k)
+        return k < self.known_length
+
+    def __getitem__(self, k: int) -> Dict:
+        if k < 0:
+            raise IndexError("timeline index must be non-negative")
+        self._fill(k + self.lookahead)
+        with self._lock:
+            if k >= self.known_length:
+                raise IndexError("timeline index out of range")
+            return self.trace[k]
+
+    def run_to_end(self) -> Trace:
+        """Generate every remaining frame and return the full trace."""
+        with self._lock:
+            while not self.done:
+                self._fill(self.known_length + 1024)
+            return self.trace if self.trace is not None else Trace([])
+
+    def __iter__(self):
+        k = 0
+        while self.has_frame(k):
+            yield self[k]
+            k += 1
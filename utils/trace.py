@@ -0,0 +1,417 @@
+"""Compact frame traces for array algorithms.
+
+A trace keeps one snapshot of the input and then a small record per frame:
+the operation that produced it (compare, swap, set, load or a plain note),
+its two index arguments, an interned info string and, only when it differs
+from the operation's default, an explicit highlight. Full snapshots
+("keyframes") are taken every ``keyframe_interval`` frames so any frame can be
+rebuilt by replaying at most that many operations.
+
+Generators in ``algorithms/`` yield their working list as ``state`` together
+with an ``op`` tuple, so recording them costs O(1) per step instead of a full
+copy. The old dict-based frame API stays available: indexing or iterating a
+``Trace`` returns ``{"state", "highlight", "info", "op"}`` dicts built on
+demand.
+"""
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+NOTE = 0
+COMPARE = 1
+SWAP = 2
+SET = 3
+LOAD = 4
+
+OP_NAMES = ("note", "compare", "swap", "set", "load")
+OP_CODES = {name: code for code, name in enumerate(OP_NAMES)}
+
+# Index columns use C ints; that covers arrays (and flattened grids) far larger
+# than anything we can draw.
+INDEX_TYPECODE = "i"
+
+
+def value_array(values: Iterable):
+    """Store ``values`` in the most compact container that holds them exactly.
+
+    Integers go into an ``array('q')``, floats into ``array('d')`` and anything
+    else (big ints, nested lists, strings) falls back to a plain list.
+    64-bit integer and float buffers (NumPy arrays) are copied byte for byte.
+    """
+    try:
+        view = memoryview(values)
+    except TypeError:
+        pass
+    else:
+        if view.ndim == 1 and view.itemsize == 8 and view.format in ("q", "l", "d"):
+            return _column(None, view)
+    values = list(values)
+    if all(isinstance(v, int) for v in values):
+        try:
+            return array("q", values)
+        except OverflowError:
+            return values
+    if all(isinstance(v, (int, float)) for v in values):
+        return array("d", values)
+    return values
+
+
+def default_keyframe_interval(n: int) -> int:
+    """Frames between keyframes for an n-element state: about 2 bytes per frame."""
+    return max(256, 4 * n)
+
+
+_ID_TYPECODES = {1: "B", 2: "H", 4: "I"}
+
+
+def _column(typecode, data):
+    """Copy ``data`` into an ``array``.
+
+    Buffers (NumPy arrays) are copied byte for byte and must have the item
+    size of ``typecode``. ``typecode`` may also be a dict from item size to
+    typecode, or None for a value column (``"d"`` for float buffers, ``"q"``
+    for other 8-byte buffers, :func:`value_array` for sequences).
+    """
+    try:
+        view = memoryview(data)
+    except TypeError:
+        if typecode is None:
+            return value_array(data)
+        return array(typecode if isinstance(typecode, str) else "I", data)
+    if isinstance(typecode, dict):
+        typecode = typecode.get(view.itemsize)
+    elif typecode is None:
+        typecode = "d" if view.format == "d" else "q"
+    if typecode is None or array(typecode).itemsize != view.itemsize:
+        raise ValueError(f"column item size {view.itemsize} does not fit typecode {typecode!r}")
+    col = array(typecode)
+    col.frombytes(view.cast("B") if view.c_contiguous else view.tobytes())
+    return col
+
+
+def _nbytes(column) -> int:
+    return column.itemsize * len(column) if isinstance(column, array) else 8 * len(column)
+
+
+def _as_highlight(highlight) -> Tuple:
+    if highlight is None:
+        return ()
+    if isinstance(highlight, (list, tuple)):
+        return tuple(highlight)
+    return (highlight,)
+
+
+def _default_highlight(kind: int, i: int, j: int) -> Tuple:
+    if kind == LOAD:
+        return ()
+    if kind == SET:
+        return (i,)
+    return tuple(x for x in (i, j) if x >= 0)
+
+
+class Trace(Sequence):
+    """Compact, randomly accessible sequence of frames.
+
+    ``trace[k]`` is the frame dict for step ``k``; its state is the initial
+    snapshot with the operations of frames ``0..k`` applied.
+    """
+
+    def __init__(self, initial: Iterable, keyframe_interval: Optional[int] = None):
+        self.initial = value_array(initial)
+        n = len(self.initial)
+        self.keyframe_interval = keyframe_interval or default_keyframe_interval(n)
+        self.kinds = array("B")
+        self.first = array(INDEX_TYPECODE)
+        self.second = array(INDEX_TYPECODE)
+        # widened to "I" once the info table outgrows 16-bit ids
+        self.info_ids = array("H")
+        self.infos: List[str] = []
+        # info ids whose text is a ``str.format`` template over i, j and v
+        self.templates = set()
+        self._info_lookup: Dict[str, int] = {}
+        # values written by SET ops; ``second`` holds the position in here
+        self.values = value_array(())
+        self.highlights: Dict[int, Tuple] = {}
+        # frames flagged ``"pass": True``: the first frame of each outer pass
+        self.pass_starts = array("q")
+        self._keyframe_at: List[int] = []
+        self._keyframes: Dict[int, object] = {}
+        # running sizes of the keyframes and info texts, so nbytes() reads
+        # plain ints while another thread records
+        self._keyframe_bytes = 0
+        self._info_bytes = 0
+        self._tail = list(self.initial)
+
+    # -- recording ---------------------------------------------------------
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[Dict], keyframe_interval: Optional[int] = None) -> "Trace":
+        """Record every frame yielded by an algorithm generator."""
+        trace = None
+        for frame in frames:
+            if trace is None:
+                trace = cls(frame.get("state", []), keyframe_interval)
+            trace.record(frame)
+        return trace if trace is not None else cls([], keyframe_interval)
+
+    @classmethod
+    def from_columns(cls, initial: Iterable, kinds, first, second, info_ids, infos: Sequence[str],
+                     templates: Iterable[int] = (), values=(), highlights: Optional[Dict[int, Tuple]] = None,
+                     keyframes: Optional[Dict[int, Iterable]] = None, pass_starts: Iterable[int] = (),
+                     keyframe_interval: Optional[int] = None) -> "Trace":
+        """Build a trace from precomputed op columns, e.g. from a NumPy engine.
+
+        Columns may be sequences or buffers (NumPy arrays) whose item size
+        matches the trace column: ``uint8`` kinds, ``int32`` indices, 8, 16 or
+        32-bit info ids and ``int64``/``float64`` values. ``keyframes`` maps
+        frame indices to the state after that frame; it should include one
+        near the end, since the final state is rebuilt from it.
+        """
+        trace = cls(initial, keyframe_interval)
+        trace.kinds = _column("B", kinds)
+        trace.first = _column(INDEX_TYPECODE, first)
+        trace.second = _column(INDEX_TYPECODE, second)
+        trace.info_ids = _column(_ID_TYPECODES, info_ids)
+        trace.values = _column(None, values)
+        if not len(trace.kinds) == len(trace.first) == len(trace.second) == len(trace.info_ids):
+            raise ValueError("trace columns differ in length")
+        trace.templates = set(templates)
+        for info in infos:
+            trace.intern_info(info, template=len(trace.infos) in trace.templates)
+        trace.highlights = dict(highlights or {})
+        trace.pass_starts = _column("q", pass_starts)
+        for index, state in sorted((keyframes or {}).items()):
+            trace.add_keyframe(index, state)
+        if len(trace):
+            trace._tail = trace.state_at(-1)
+        return trace
+
+    def intern_info(self, info: str, template: bool = False) -> int:
+        """Return the id of ``info`` in the info table, adding it if needed."""
+        key = ("\0t" if template else "") + info
+        info_id = self._info_lookup.get(key)
+        if info_id is None:
+            info_id = len(self.infos)
+            self.infos.append(info)
+            self._info_bytes += len(info)
+            self._info_lookup[key] = info_id
+            if template:
+                self.templates.add(info_id)
+        return info_id
+
+    def record(self, frame: Dict) -> None:
+        """Append one frame dict.
+
+        Frames carrying an ``op`` key are trusted: only the op is stored.
+        Frames without one (generators that still yield copies) are diffed
+        against the current state: a single changed cell becomes a ``set`` op,
+        anything larger a ``load`` op backed by a keyframe, so any generator
+        can be recorded.
+        """
+        highlight = _as_highlight(frame.get("highlight", ()))
+        info = frame.get("info", "")
+        if frame.get("pass"):
+            self.pass_starts.append(len(self.kinds))
+        if "op" in frame:
+            op = frame["op"]
+            if op is not None and not self.kinds:
+                # The first frame's state already includes its op; keep it
+                # as a note so replaying it does not apply it twice.
+                op = None
+            self._record_op(op, highlight, info)
+        else:
+            self._record_diff(frame.get("state", []), highlight, info)
+
+    def _record_diff(self, state, highlight: Tuple, info: str) -> None:
+        changed = [k for k, (old, new) in enumerate(zip(self._tail, state)) if old != new]
+        if len(state) != len(self._tail) or len(changed) > 1:
+            # Several cells (or the length) changed at once: store a snapshot.
+            self._tail = list(state)
+            self._append(LOAD, -1, -1, highlight, info)
+        elif changed:
+            k = changed[0]
+            self._tail[k] = state[k]
+            self._append(SET, k, self._store_value(state[k]), highlight, info)
+        else:
+            self._record_op(None, highlight, info)
+
+    def _record_op(self, op, highlight: Tuple, info: str) -> None:
+        if op is None:
+            kind, i, j = NOTE, -1, -1
+            if len(highlight) <= 2 and all(isinstance(h, int) and h >= 0 for h in highlight):
+                i = highlight[0] if highlight else -1
+                j = highlight[1] if len(highlight) > 1 else -1
+        else:
+            kind = OP_CODES[op[0]]
+            i = op[1]
+            if kind == SET:
+                self._tail[i] = op[2]
+                j = self._store_value(op[2])
+            else:
+                j = op[2] if len(op) > 2 and op[2] is not None else -1
+                if kind == SWAP:
+                    self._tail[i], self._tail[j] = self._tail[j], self._tail[i]
+        self._append(kind, i, j, highlight, info)
+
+    def _store_value(self, value) -> int:
+        try:
+            self.values.append(value)
+        except (TypeError, OverflowError):
+            self.values = list(self.values)
+            self.values.append(value)
+        return len(self.values) - 1
+
+    def _append(self, kind: int, i: int, j: int, highlight: Tuple, info: str) -> None:
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.first.append(i)
+        self.second.append(j)
+        info_id = self.intern_info(info)
+        if info_id > 0xFFFF and self.info_ids.typecode != "I":
+            self.info_ids = array("I", self.info_ids)
+        self.info_ids.append(info_id)
+        if highlight != _default_highlight(kind, i, j):
+            self.highlights[index] = highlight
+        if kind == LOAD or (index + 1) % self.keyframe_interval == 0:
+            self.add_keyframe(index, self._tail)
+
+    def add_keyframe(self, index: int, state: Iterable) -> None:
+        """Store the full state after frame ``index`` to speed up seeking."""
+        keyframe = self._keyframe_copy(state)
+        old = self._keyframes.get(index)
+        if old is None:
+            self._keyframe_at.insert(bisect_right(self._keyframe_at, index), index)
+        else:
+            self._keyframe_bytes -= _nbytes(old)
+        self._keyframes[index] = keyframe
+        self._keyframe_bytes += _nbytes(keyframe)
+
+    def _keyframe_copy(self, state: Iterable):
+        if isinstance(self.initial, array):
+            if self.initial.typecode == "q":
+                # whole-array passes keyframe a million ints at a time; try
+                # the copy before checking every value
+                try:
+                    return array("q", state)
+                except (TypeError, OverflowError):
+                    pass
+            return value_array(state)
+        return list(state)
+
+    # -- replay ------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def _apply(self, state: List, k: int) -> None:
+        kind = self.kinds[k]
+        if kind == SWAP:
+            i, j = self.first[k], self.second[k]
+            state[i], state[j] = state[j], state[i]
+        elif kind == SET:
+            state[self.first[k]] = self.values[self.second[k]]
+        elif kind == LOAD:
+            state[:] = self._keyframes[k]
+
+    def state_at(self, k: int) -> List:
+        """Rebuild the state after frame ``k`` from the nearest keyframe."""
+        k = self._index(k)
+        pos = bisect_right(self._keyframe_at, k) - 1
+        if pos >= 0:
+            start = self._keyframe_at[pos] + 1
+            state = list(self._keyframes[start - 1])
+        else:
+            start = 0
+            state = list(self.initial)
+        for step in range(start, k + 1):
+            self._apply(state, step)
+        return state
+
+    def final_state(self) -> List:
+        return list(self._tail)
+
+    def highlight_at(self, k: int) -> Tuple:
+        k = self._index(k)
+        if k in self.highlights:
+            return self.highlights[k]
+        return _default_highlight(self.kinds[k], self.first[k], self.second[k])
+
+    def info_at(self, k: int) -> str:
+        k = self._index(k)
+        info_id = self.info_ids[k]
+        text = self.infos[info_id]
+        if info_id in self.templates:
+            i, j = self.first[k], self.second[k]
+            v = self.values[j] if self.kinds[k] == SET else None
+            return text.format(i=i, j=j, v=v)
+        return text
+
+    def op_at(self, k: int) -> Optional[Tuple]:
+        k = self._index(k)
+        kind = self.kinds[k]
+        if kind in (NOTE, LOAD):
+            return None
+        i, j = self.first[k], self.second[k]
+        if kind == SET:
+            return ("set", i, self.values[j])
+        return (OP_NAMES[kind], i, j if j >= 0 else None)
+
+    def _frame(self, k: int, state: List) -> Dict:
+        return {
+            "state": state,
+            "highlight": self.highlight_at(k),
+            "info": self.info_at(k),
+            "op": self.op_at(k),
+        }
+
+    def _index(self, k: int) -> int:
+        n = len(self.kinds)
+        if k < 0:
+            k += n
+        if not 0 <= k < n:
+            raise IndexError("trace index out of range")
+        return k
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        k = self._index(k)
+        return self._frame(k, self.state_at(k))
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.frames()
+
+    def frames(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Dict]:
+        """Yield frames ``start..stop-1``, seeking once and then replaying."""
+        stop = len(self.kinds) if stop is None else min(stop, len(self.kinds))
+        if start >= stop:
+            return
+        state = self.state_at(start)
+        yield self._frame(start, list(state))
+        for k in range(start + 1, stop):
+            self._apply(state, k)
+            yield self._frame(k, list(state))
+
+    # -- bookkeeping -------------------------------------------------------
+
+    def op_counts(self) -> Dict[str, int]:
+        """Number of frames per op kind, e.g. ``{"compare": 10, "swap": 4, ...}``."""
+        counts = [0] * len(OP_NAMES)
+        for kind in self.kinds:
+            counts[kind] += 1
+        return dict(zip(OP_NAMES, counts))
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the trace columns and keyframes.
+
+        Reads only lengths and running totals, so it is safe to call while
+        another thread records into the trace.
+        """
+        columns = (self.initial, self.values, self.kinds, self.first, self.second, self.info_ids, self.pass_starts)
+        total = sum(_nbytes(c) for c in columns) + self._keyframe_bytes
+        return total + self._info_bytes + 64 * len(self.highlights)
+
+
+def record_trace(frames: Iterable[Dict], keyframe_interval: Optional[int] = None) -> Trace:
+    """Record an algorithm generator into a compact :class:`Trace`."""
+    return Trace.from_frames(frames, keyframe_interval)
@@ -0,0 +1,208 @@
+"""Process-wide cache of algorithm runs, shared across sessions.
+
+Entries are :class:`~utils.timeline.Timeline` objects keyed by the run's
+input fingerprint (algorithm, input and parameters; see
+``utils.algo_interface.input_fingerprint``). Sessions that submit the same
+run get the same timeline, so its generator runs once and its trace is held
+once however many viewers step through it; ``Timeline`` is thread-safe.
+
+The cache is bounded by the bytes of the traces it holds, counted as they
+grow: eviction runs when a run is stored and again every
+``utils.timeline.GROW_CHECK`` frames a cached timeline records during
+playback. Least recently used runs are evicted first; with a ``DiskTraceStore``
+finished ones are spilled to disk as trace files (``utils.trace_file``) and
+mapped back on their next request instead of being regenerated. The same
+directory can hold runs precomputed offline with
+``python -m utils.trace_file ... --dir``.
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.timeline import Timeline
+from utils.trace_file import SUFFIX, open_trace, save_trace, trace_file_info
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class DiskTraceStore:
+    """Finished traces as trace files under ``directory``, one per key.
+
+    Keys are input fingerprints (hex strings). With ``max_bytes`` the least
+    recently used files are removed once the directory holds more than that.
+    """
+
+    SUFFIX = SUFFIX
+
+    def __init__(self, directory: str, max_bytes: Optional[int] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def save(self, key: str, timeline: Timeline, metadata: Optional[Dict] = None) -> bool:
+        """Write a finished run; False if its trace cannot be stored (non-numeric states)."""
+        try:
+            save_trace(self._path(key), timeline.trace, timeline.result, metadata)
+        except TypeError:
+            return False
+        self._trim()
+        return True
+
+    def load(self, key: str) -> Optional[Timeline]:
+        try:
+            trace = open_trace(self._path(key))
+        except (OSError, ValueError):
+            return None
+        os.utime(self._path(key))
+        return Timeline.from_trace(trace, trace.result)
+
+    def entries(self) -> List[Tuple[str, Dict]]:
+        """``(key, footer info)`` of every stored run, most recently used first."""
+        entries = []
+        for _, _, path in reversed(self._files()):
+            try:
+                info = trace_file_info(path)
+            except (OSError, ValueError):
+                continue
+            entries.append((os.path.basename(path)[:-len(self.SUFFIX)], info))
+        return entries
+
+    def _files(self) -> List[Tuple[float, int, str]]:
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        return sorted(files)
+
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self._files())
+
+    def _trim(self) -> None:
+        if self.max_bytes is None:
+            return
+        files = self._files()
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+
+
+class TraceCache:
+    """Thread-safe LRU of timelines bounded by total trace bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, store: Optional[DiskTraceStore] = None):
+        self.max_bytes = max_bytes
+        self.store = store
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._items: "OrderedDict[str, Timeline]" = OrderedDict()
+        # what each run is (algorithm, input size, ...), written with its trace file
+        self._metadata: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._items
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the cached traces right now (they grow while generating)."""
+        with self._lock:
+            return sum(t.nbytes() for t in self._items.values())
+
+    def get(self, key: str) -> Optional[Timeline]:
+        with self._lock:
+            timeline = self._items.get(key)
+            if timeline is not None and timeline.error is not None:
+                # its generator raised; a new request runs it again
+                del self._items[key]
+                self._metadata.pop(key, None)
+                timeline = None
+            if timeline is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return timeline
+        if self.store is not None and key in self.store:
+            timeline = self.store.load(key)
+            if timeline is not None:
+                self.disk_hits += 1
+                self.put(key, timeline)
+                return timeline
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, timeline: Timeline, metadata: Optional[Dict] = None) -> None:
+        with self._lock:
+            self._items[key] = timeline
+            self._items.move_to_end(key)
+            if metadata is not None:
+                self._metadata[key] = metadata
+        timeline.on_grow = self.evict
+        self.evict()
+
+    def get_or_create(self, key: str, make: Callable[[], Timeline], metadata: Optional[Dict] = None) -> Timeline:
+        """The cached timeline for ``key``, or ``make()`` stored under it.
+
+        Two sessions asking for the same new key at once may both call
+        ``make``; the first one stored wins and both get it. ``metadata``
+        describes the run in its trace file if it is spilled to disk.
+        """
+        timeline = self.get(key)
+        if timeline is not None:
+            return timeline
+        timeline = make()
+        with self._lock:
+            timeline = self._items.setdefault(key, timeline)
+            if metadata is not None:
+                self._metadata.setdefault(key, metadata)
+        timeline.on_grow = self.evict
+        self.evict()
+        return timeline
+
+    def evict(self) -> None:
+        """Drop least recently used runs until the traces fit ``max_bytes``.
+
+        The most recent run is always kept. Finished runs go to the disk
+        store, if any (runs already backed by a file are not rewritten);
+        sessions still holding an evicted timeline keep using it.
+        """
+        evicted = []
+        with self._lock:
+            sizes = {key: t.nbytes() for key, t in self._items.items()}
+            total = sum(sizes.values())
+            while total > self.max_bytes and len(self._items) > 1:
+                key, timeline = self._items.popitem(last=False)
+                total -= sizes[key]
+                evicted.append((key, timeline, self._metadata.pop(key, None)))
+                timeline.on_grow = None
+        if self.store is not None:
+            for key, timeline, metadata in evicted:
+                if timeline.done and key not in self.store:
+                    self.store.save(key, timeline, metadata)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._metadata.clear()
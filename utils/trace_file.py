@@ -0,0 +1,527 @@
+"""Binary trace files: record a run once, replay it later from disk.
+
+Layout::
+
+    b"ALGTRACE"                  magic
+    u64 footer offset, u64 footer length
+    column blobs                 each 8-byte aligned, native byte order
+    footer                       UTF-8 JSON
+
+The footer holds the caller's metadata (algorithm, input fingerprint, ...),
+the column table (``name -> [offset, typecode, length]``), the info table,
+the sparse highlights and whatever small fields the trace kind needs. Array
+traces store the op columns of :class:`~utils.trace.Trace` plus a keyframe
+index (frame numbers, offsets into one concatenated state column); grid
+traces the delta columns of :class:`~utils.grid_trace.GridTrace` and walls.
+
+:func:`write_trace_file` streams any ``algorithms/`` generator to disk,
+spilling each column to a temporary file as it grows, so even runs far larger
+than memory can be precomputed. :func:`open_trace` maps the file with
+``mmap`` and returns a trace whose columns are memoryviews into it: opening
+costs one footer parse, and frame ``k`` replays at most one keyframe
+interval of ops, whatever the file size.
+
+Usage::
+
+    python -m utils.trace_file bubble_sort 5,2,4,1,3 -o bubble.trace
+    python -m utils.trace_file bubble_sort --random 5000 --fast --dir traces/
+"""
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.grid_trace import GridTrace, is_grid_frame
+from utils.trace import Trace
+
+MAGIC = b"ALGTRACE"
+FORMAT_VERSION = 1
+SUFFIX = ".trace"
+_HEADER = struct.Struct("<8sQQ")
+# items buffered per column before spilling to its temporary file
+SPILL_CHUNK = 1 << 16
+
+
+class _SpillColumn:
+    """Append-only column kept in a temporary file, with a small tail in memory.
+
+    Supports what recording needs: ``append``, ``extend``, ``len`` and
+    indexing the items still in memory (the most recent ones).
+    """
+
+    def __init__(self, typecode: str):
+        self.typecode = typecode
+        self.itemsize = array(typecode).itemsize
+        self._buf = array(typecode)
+        self._flushed = 0
+        self._file = tempfile.TemporaryFile()
+
+    def __len__(self) -> int:
+        return self._flushed + len(self._buf)
+
+    def __getitem__(self, k: int):
+        if k < 0:
+            k += len(self)
+        if k < self._flushed:
+            raise IndexError("item already spilled to disk")
+        return self._buf[k - self._flushed]
+
+    def append(self, item) -> None:
+        if len(self._buf) >= SPILL_CHUNK:
+            self.flush()
+        self._buf.append(item)
+
+    def extend(self, items: Iterable) -> None:
+        if len(self._buf) >= SPILL_CHUNK:
+            self.flush()
+        self._buf.extend(items)
+
+    def flush(self) -> None:
+        self._buf.tofile(self._file)
+        self._flushed += len(self._buf)
+        self._buf = array(self.typecode)
+
+    def copy_to(self, fh, typecode: str) -> int:
+        """Write the whole column to ``fh`` as ``typecode`` items; returns its length."""
+        self.flush()
+        self._file.seek(0)
+        while True:
+            chunk = self._file.read(SPILL_CHUNK * self.itemsize)
+            if not chunk:
+                break
+            if typecode != self.typecode:
+                items = array(self.typecode)
+                items.frombytes(chunk)
+                chunk = array(typecode, items).tobytes()
+            fh.write(chunk)
+        return self._flushed
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _Keyframes:
+    """Keyframe states by frame index, stored as three flat columns.
+
+    ``states[offsets[p]:offsets[p + 1]]`` is the state after frame
+    ``frames[p]``. Used both while writing (spilled columns) and reading
+    (memoryviews into the file).
+    """
+
+    def __init__(self, frames, offsets, states):
+        self.frames = frames
+        self.offsets = offsets
+        self.states = states
+
+    def __contains__(self, index: int) -> bool:
+        pos = bisect_left(self.frames, index)
+        return pos < len(self.frames) and self.frames[pos] == index
+
+    def __getitem__(self, index: int):
+        pos = bisect_left(self.frames, index)
+        if pos == len(self.frames) or self.frames[pos] != index:
+            raise KeyError(index)
+        return self.states[self.offsets[pos]:self.offsets[pos + 1]]
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+# -- writing -------------------------------------------------------------------
+
+class _TraceWriter(Trace):
+    """A :class:`Trace` that spills its columns and keyframes while recording."""
+
+    def __init__(self, initial: Iterable, keyframe_interval: Optional[int] = None):
+        super().__init__(initial, keyframe_interval)
+        if not isinstance(self.initial, array):
+            raise TypeError("trace files hold numeric states only")
+        self.kinds = _SpillColumn("B")
+        self.first = _SpillColumn("i")
+        self.second = _SpillColumn("i")
+        # narrowed to "H" on write if the info table stays small
+        self.info_ids = _SpillColumn("I")
+        self.values = _SpillColumn(self.initial.typecode)
+        self.pass_starts = _SpillColumn("q")
+        self._keyframes = _Keyframes(_SpillColumn("q"), _SpillColumn("q"), _SpillColumn(self.initial.typecode))
+        self._keyframes.offsets.append(0)
+
+    def _store_value(self, value) -> int:
+        try:
+            self.values.append(value)
+        except (TypeError, OverflowError):
+            raise TypeError(f"trace files hold {self.values.typecode!r} values only, got {value!r}") from None
+        return len(self.values) - 1
+
+    def add_keyframe(self, index: int, state: Iterable) -> None:
+        keyframes = self._keyframes
+        try:
+            keyframes.states.extend(state)
+        except (TypeError, OverflowError):
+            raise TypeError("trace files hold numeric states only") from None
+        keyframes.frames.append(index)
+        keyframes.offsets.append(len(keyframes.states))
+
+    def columns(self) -> List:
+        return [self.kinds, self.first, self.second, self.info_ids, self.values, self.pass_starts,
+                self._keyframes.frames, self._keyframes.offsets, self._keyframes.states]
+
+
+class _GridTraceWriter(GridTrace):
+    """A :class:`GridTrace` that spills its delta columns while recording."""
+
+    def __init__(self, grid, start=None, goal=None):
+        super().__init__(grid, start, goal)
+        self.frontier = _SpillColumn("i")
+        self.visited = _SpillColumn("i")
+        self.frontier_end = _SpillColumn("q")
+        self.visited_end = _SpillColumn("q")
+        self.current = _SpillColumn("i")
+        self.info_ids = _SpillColumn("I")
+
+    def columns(self) -> List:
+        return [self.frontier, self.visited, self.frontier_end, self.visited_end, self.current, self.info_ids]
+
+
+def _typecode(column) -> Optional[str]:
+    if isinstance(column, (array, _SpillColumn)):
+        return column.typecode
+    try:
+        return memoryview(column).format
+    except TypeError:
+        return None
+
+
+def _copy_column(fh, column, typecode: str) -> int:
+    if isinstance(column, _SpillColumn):
+        return column.copy_to(fh, typecode)
+    if _typecode(column) != typecode:
+        try:
+            column = array(typecode, column)
+        except (TypeError, OverflowError):
+            raise TypeError(f"trace files hold numeric columns only (typecode {typecode!r})") from None
+    view = memoryview(column)
+    fh.write(view.cast("B") if view.c_contiguous else view.tobytes())
+    return len(view)
+
+
+def _jsonable(value: Any) -> Any:
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+def _array_layout(trace: Trace) -> Tuple[List, Dict]:
+    if not isinstance(trace.initial, (array, memoryview)):
+        raise TypeError("trace files hold numeric states only")
+    state_tc = _typecode(trace.initial)
+    keyframes = trace._keyframes
+    if not isinstance(keyframes, _Keyframes):
+        frames = array("q", trace._keyframe_at)
+        offsets = array("q", [0])
+        states = array(state_tc)
+        for index in frames:
+            states.extend(array(state_tc, keyframes[index]))
+            offsets.append(len(states))
+        keyframes = _Keyframes(frames, offsets, states)
+    ids_tc = "H" if len(trace.infos) <= 0x10000 else "I"
+    columns = [
+        ("initial", state_tc, trace.initial),
+        ("kinds", "B", trace.kinds),
+        ("first", "i", trace.first),
+        ("second", "i", trace.second),
+        ("info_ids", ids_tc, trace.info_ids),
+        ("values", _typecode(trace.values) or state_tc, trace.values),
+        ("pass_starts", "q", trace.pass_starts),
+        ("keyframe_frames", "q", keyframes.frames),
+        ("keyframe_offsets", "q", keyframes.offsets),
+        ("keyframe_states", state_tc, keyframes.states),
+    ]
+    footer = {
+        "trace": "array",
+        "keyframe_interval": trace.keyframe_interval,
+        "infos": list(trace.infos),
+        "templates": sorted(trace.templates),
+        "highlights": [[k, list(h)] for k, h in sorted(trace.highlights.items())],
+    }
+    return columns, footer
+
+
+def _grid_layout(trace: GridTrace) -> Tuple[List, Dict]:
+    columns = [
+        ("walls", "B", trace.walls),
+        ("frontier", "i", trace.frontier),
+        ("visited", "i", trace.visited),
+        ("frontier_end", "q", trace.frontier_end),
+        ("visited_end", "q", trace.visited_end),
+        ("current", "i", trace.current),
+        ("info_ids", "I", trace.info_ids),
+    ]
+    footer = {
+        "trace": "grid",
+        "rows": trace.rows,
+        "cols": trace.cols,
+        "start": trace.start,
+        "goal": trace.goal,
+        "path": trace.path,
+        "path_frame": trace.path_frame,
+        "stats": trace.stats,
+        "stats_frame": trace.stats_frame,
+        "infos": list(trace.infos),
+        "highlights": [[k, list(h)] for k, h in sorted(trace.highlights.items())],
+    }
+    return columns, footer
+
+
+def save_trace(path: str, trace, result: Any = None, metadata: Optional[Dict] = None) -> None:
+    """Write a recorded :class:`Trace` or :class:`GridTrace` to ``path``.
+
+    ``result`` (the generator's return value) is kept if it is JSON
+    serializable. Raises ``TypeError`` for traces with non-numeric states.
+    The file is written under a temporary name and moved into place.
+    """
+    layout = _grid_layout if isinstance(trace, GridTrace) else _array_layout
+    columns, footer = layout(trace)
+    footer.update(format=FORMAT_VERSION, byteorder=sys.byteorder, frames=len(trace),
+                  result=_jsonable(result), metadata=dict(metadata or {}))
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(_HEADER.pack(MAGIC, 0, 0))
+            table = {}
+            for name, typecode, column in columns:
+                fh.write(b"\0" * (-fh.tell() % 8))
+                offset = fh.tell()
+                table[name] = [offset, typecode, _copy_column(fh, column, typecode)]
+            footer["columns"] = table
+            data = json.dumps(footer).encode("utf-8")
+            offset = fh.tell()
+            fh.write(data)
+            fh.seek(0)
+            fh.write(_HEADER.pack(MAGIC, offset, len(data)))
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def write_trace_file(path: str, frames: Iterable[Dict], metadata: Optional[Dict] = None,
+                     keyframe_interval: Optional[int] = None, start=None, goal=None) -> int:
+    """Stream an algorithm generator into a trace file; returns the frame count.
+
+    Columns are spilled to temporary files as they grow, so memory stays at
+    one state plus a few buffers however long the run is. ``start`` and
+    ``goal`` are recorded for grid algorithms.
+    """
+    gen = iter(frames)
+    writer = None
+    result = None
+    try:
+        while True:
+            try:
+                frame = next(gen)
+            except StopIteration as stop:
+                result = stop.value
+                break
+            if writer is None:
+                if is_grid_frame(frame):
+                    writer = _GridTraceWriter(frame["state"], start, goal)
+                else:
+                    writer = _TraceWriter(frame.get("state", []), keyframe_interval)
+            writer.record(frame)
+        if writer is None:
+            writer = _TraceWriter([], keyframe_interval)
+        save_trace(path, writer, result, metadata)
+        return len(writer)
+    finally:
+        if writer is not None:
+            for column in writer.columns():
+                column.close()
+
+
+# -- reading -------------------------------------------------------------------
+
+def _read_footer(fh) -> Dict:
+    magic, offset, length = _HEADER.unpack(fh.read(_HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("not a trace file")
+    fh.seek(offset)
+    footer = json.loads(fh.read(length).decode("utf-8"))
+    if footer.get("format") != FORMAT_VERSION:
+        raise ValueError(f"unsupported trace file format {footer.get('format')!r}")
+    return footer
+
+
+def trace_file_info(path: str) -> Dict:
+    """The footer of a trace file (metadata, frame count, ...) without mapping it."""
+    with open(path, "rb") as fh:
+        footer = _read_footer(fh)
+    footer.pop("columns", None)
+    footer.pop("highlights", None)
+    return footer
+
+
+def _tuples(item):
+    return tuple(_tuples(x) for x in item) if isinstance(item, list) else item
+
+
+class MappedTrace(Trace):
+    """A read-only :class:`Trace` whose columns live in a mapped trace file."""
+
+    def __init__(self, footer: Dict, columns: Dict[str, memoryview]):
+        self.metadata = footer["metadata"]
+        self.initial = columns["initial"]
+        self.keyframe_interval = footer["keyframe_interval"]
+        self.kinds = columns["kinds"]
+        self.first = columns["first"]
+        self.second = columns["second"]
+        self.info_ids = columns["info_ids"]
+        self.infos = footer["infos"]
+        self.templates = set(footer["templates"])
+        self._info_lookup = {}
+        self.values = columns["values"]
+        self.highlights = {k: _tuples(h) for k, h in footer["highlights"]}
+        self.pass_starts = columns["pass_starts"]
+        self._keyframes = _Keyframes(columns["keyframe_frames"], columns["keyframe_offsets"],
+                                     columns["keyframe_states"])
+        self._keyframe_at = self._keyframes.frames
+
+    def record(self, frame: Dict) -> None:
+        raise TypeError("mapped traces are read-only")
+
+    def final_state(self) -> List:
+        return self.state_at(-1) if len(self) else list(self.initial)
+
+    def nbytes(self) -> int:
+        """Memory held outside the mapping (the file itself is paged in on demand)."""
+        return sum(len(s) for s in self.infos) + 64 * len(self.highlights)
+
+
+class MappedGridTrace(GridTrace):
+    """A read-only :class:`GridTrace` whose columns live in a mapped trace file."""
+
+    def __init__(self, footer: Dict, columns: Dict[str, memoryview]):
+        self.metadata = footer["metadata"]
+        self.rows, self.cols = footer["rows"], footer["cols"]
+        self.walls = np.frombuffer(columns["walls"], dtype=np.uint8)
+        self.start, self.goal = footer["start"], footer["goal"]
+        self.frontier = columns["frontier"]
+        self.visited = columns["visited"]
+        self.frontier_end = columns["frontier_end"]
+        self.visited_end = columns["visited_end"]
+        self.current = columns["current"]
+        self.info_ids = columns["info_ids"]
+        self.infos = footer["infos"]
+        self._info_lookup = {}
+        self.path = None if footer["path"] is None else [tuple(cell) for cell in footer["path"]]
+        self.path_frame = footer["path_frame"]
+        self.stats, self.stats_frame = footer["stats"], footer["stats_frame"]
+        self.highlights = {k: [_tuples(cell) for cell in h] for k, h in footer["highlights"]}
+        self.pass_starts = array("q")
+        self._grid = None
+
+    @property
+    def grid(self) -> List[List[int]]:
+        """The walls as a list of rows (built on first use)."""
+        if self._grid is None:
+            self._grid = self.walls.reshape(self.rows, self.cols).astype(int).tolist()
+        return self._grid
+
+    def record(self, frame: Dict) -> None:
+        raise TypeError("mapped traces are read-only")
+
+    def nbytes(self) -> int:
+        """Memory held outside the mapping (the file itself is paged in on demand)."""
+        return sum(len(s) for s in self.infos) + 64 * len(self.highlights)
+
+
+def open_trace(path: str):
+    """Map a trace file; returns a :class:`MappedTrace` or :class:`MappedGridTrace`.
+
+    The trace has the file's ``metadata`` and the generator's ``result`` as
+    attributes. The mapping stays open as long as the trace is referenced.
+    """
+    with open(path, "rb") as fh:
+        footer = _read_footer(fh)
+        if footer["byteorder"] != sys.byteorder:
+            raise ValueError(f"trace file was written on a {footer['byteorder']}-endian machine")
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = memoryview(mapped)
+    columns = {}
+    for name, (offset, typecode, length) in footer["columns"].items():
+        columns[name] = buf[offset:offset + length * array(typecode).itemsize].cast(typecode)
+    trace = (MappedGridTrace if footer["trace"] == "grid" else MappedTrace)(footer, columns)
+    result = footer.get("result")
+    if footer["trace"] == "grid" and result is not None:
+        result = [tuple(cell) for cell in result]
+    trace.result = result
+    return trace
+
+
+# -- command line ----------------------------------------------------------------
+
+def main(argv=None) -> int:
+    from algorithms.fast_trace import FAST_ENGINES
+    from algorithms.registry import get_algorithm
+    from utils.algo_interface import input_fingerprint
+
+    parser = argparse.ArgumentParser(description="Precompute an algorithm run into a trace file.")
+    parser.add_argument("algorithm", help="registered array algorithm, e.g. bubble_sort or 'Merge Sort'")
+    parser.add_argument("data", nargs="?", help="comma separated integers, e.g. 5,2,4,1,3")
+    parser.add_argument("--random", type=int, metavar="N", help="use N random integers instead of DATA")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=int, help="target value for search algorithms")
+    parser.add_argument("--fast", action="store_true", help="record with the NumPy engine, if there is one")
+    out = parser.add_mutually_exclusive_group(required=True)
+    out.add_argument("-o", "--output", help="trace file to write")
+    out.add_argument("--dir", help="write <input fingerprint>.trace here, where the web demo's "
+                                   "ALGO_VIS_TRACE_DIR store finds it")
+    args = parser.parse_args(argv)
+
+    spec = get_algorithm(args.algorithm)
+    if spec.input_kind == "grid":
+        parser.error(f"{spec.name} works on grids; only array algorithms are supported here")
+    if args.random is not None:
+        rng = random.Random(args.seed)
+        data = [rng.randint(0, 10 * args.random) for _ in range(args.random)]
+    elif args.data:
+        data = [int(x) for x in args.data.split(",") if x.strip()]
+    else:
+        parser.error("give DATA or --random N")
+    params = {}
+    if spec.input_kind == "sorted_array":
+        if args.target is None:
+            parser.error(f"{spec.name} needs --target")
+        data.sort()
+        params["target"] = args.target
+    # the same key the web demo computes for this input
+    fingerprint = input_fingerprint(spec.name, data, **params)
+    path = args.output or os.path.join(args.dir, fingerprint + SUFFIX)
+    if args.dir:
+        os.makedirs(args.dir, exist_ok=True)
+    metadata = {"algorithm": spec.name, "key": spec.key, "n": len(data), "fingerprint": fingerprint, **params}
+    if args.fast and spec.key in FAST_ENGINES:
+        trace = FAST_ENGINES[spec.key](data)
+        save_trace(path, trace, metadata=metadata)
+        count = len(trace)
+    else:
+        algo = spec.load()
+        count = write_trace_file(path, algo(data, *params.values()), metadata)
+    print(f"wrote {count} frames to {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+"""Streaming trace server: algorithm runs over HTTP and WebSocket.
+
+Other front-ends (an LMS page, a notebook, a script) can get frames from a
+local server instead of running their own Streamlit app. A client posts
+an algorithm and its input; the server runs the ``algorithms/`` generator
+and streams its frames back in chunks as the run goes.
+
+Requests are JSON objects::
+
+    {"algorithm": "bubble_sort", "data": [5, 2, 4, 1, 3]}
+    {"algorithm": "binary_search", "data": "1,3,5,7", "target": 5}
+    {"algorithm": "bfs_pathfinding", "grid": "S..#\\n.#..\\n...G"}
+
+Optional fields: ``format`` (``"deltas"``, the default, or ``"frames"``),
+``chunk`` (frames per message, default 256), ``max_frames`` (stop after
+that many) and ``params`` (extra keyword arguments, e.g. ``{"seed": 1}``).
+A grid may also be a list of 0/1 rows with ``start`` and ``goal`` cells.
+
+Every response is a sequence of JSON messages:
+
+- ``{"type": "start", ...}`` with the algorithm, and ``initial`` (the array
+  as of the first frame) or ``grid``, ``start`` and ``goal``;
+- ``{"type": "chunk", "first": k, "frames": [...]}``, frames ``k`` onwards;
+- ``{"type": "end", "total": n, "result": ..., "truncated": bool}``, or
+  ``{"type": "error", "message": ...}`` if the run failed part way (after
+  the chunks of every frame it made).
+
+In ``deltas`` format, array frames carry ``op``, ``highlight`` and ``info``
+but no state. Apply each ``op`` to a copy of ``initial``: ``["swap", i, j]``
+or ``["set", i, value]``; ``compare`` and notes change nothing. The first
+frame's op is sent as ``null``, since ``initial`` already includes it. A
+frame that carries ``state`` (generators without ops) replaces the array.
+``frames`` format adds the full ``state`` to every array frame. Grid frames
+are deltas in both formats: ``visited`` and ``frontier`` cells, then
+``path`` on the last frame.
+
+Endpoints:
+
+- ``GET /algorithms``: the registered algorithms.
+- ``POST /stream``: the request as body; the reply is chunked NDJSON, one
+  message per line.
+- ``WS /ws``: send the request as the first message; messages stream back.
+  Send ``{"type": "cancel"}`` to stop early, answered by
+  ``{"type": "cancelled", "sent": n}``.
+- ``GET /status``: the runs being streamed and how many frames each sent.
+
+A request that cannot run, including input the algorithm itself rejects
+before its first frame, is answered with ``{"error": ...}`` instead: a 400
+over HTTP, an ``{"type": "error", "message": ...}`` message and close code
+1003 over a WebSocket. A WebSocket whose run fails part way is closed with
+code 1011 after the ``error`` message.
+
+Generators are advanced one chunk at a time on a thread pool, and the next
+chunk is only computed once the previous one is handed to the socket. A
+client that reads slowly therefore holds its run back instead of making the
+server buffer it, and a client that goes away stops its run.
+
+Usage::
+
+    python -m utils.trace_server --port 8765
+    curl -N localhost:8765/stream -d '{"algorithm": "bubble_sort", "data": "5,2,4,1,3"}'
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Generator, Iterator, List, Optional, Sequence
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route, WebSocketRoute
+from starlette.websockets import WebSocket, WebSocketDisconnect
+
+from algorithms.registry import available_algorithms, get_algorithm
+from utils.grid import parse_grid
+from utils.grid_trace import is_grid_frame
+from utils.input_data import MAX_VALUES, parse_text
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+DEFAULT_CHUNK = 256
+MAX_CHUNK = 10_000
+# Largest grid (rows × cols) accepted, as in the web demo
+GRID_CELL_LIMIT = 1_000_000
+FORMATS = ("deltas", "frames")
+
+
+def _json(message: Dict) -> str:
+    return json.dumps(message, separators=(",", ":"), default=_json_default)
+
+
+def _json_default(value: Any) -> Any:
+    # NumPy scalars and arrays, e.g. from generators fed NumPy input
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _positive_int(body: Dict, name: str, default: Optional[int], limit: Optional[int] = None) -> Optional[int]:
+    value = body.get(name, default)
+    if value is None:
+        return None
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError(f"{name} must be a positive integer")
+    if limit is not None and value > limit:
+        raise ValueError(f"{name} must be at most {limit:,}")
+    return value
+
+
+def _array(data: Any) -> List[int]:
+    if isinstance(data, str):
+        return parse_text(data).tolist()
+    if not isinstance(data, list) or not all(isinstance(v, int) and not isinstance(v, bool) for v in data):
+        raise ValueError("data must be a list of integers or a comma separated string")
+    if len(data) > MAX_VALUES:
+        raise ValueError(f"more than {MAX_VALUES:,} values")
+    return list(data)
+
+
+def _cell(value: Any, name: str) -> tuple:
+    if not (isinstance(value, list) and len(value) == 2 and all(isinstance(v, int) for v in value)):
+        raise ValueError(f"{name} must be a [row, col] pair")
+    return tuple(value)
+
+
+def _grid(body: Dict):
+    grid = body.get("grid")
+    if isinstance(grid, str):
+        grid, start, goal = parse_grid(grid)
+    elif isinstance(grid, list) and grid and all(isinstance(row, list) for row in grid):
+        if len({len(row) for row in grid}) != 1 or not all(v in (0, 1) for row in grid for v in row):
+            raise ValueError("grid rows must be equally long lists of 0 (open) and 1 (wall)")
+        start = _cell(body.get("start", [0, 0]), "start")
+        goal = _cell(body.get("goal", [len(grid) - 1, len(grid[0]) - 1]), "goal")
+    else:
+        raise ValueError("grid must be a maze string or a list of rows")
+    if len(grid) * len(grid[0]) > GRID_CELL_LIMIT:
+        raise ValueError(f"grid has more than {GRID_CELL_LIMIT:,} cells")
+    for cell in (start, goal):
+        if not (0 <= cell[0] < len(grid) and 0 <= cell[1] < len(grid[0])):
+            raise ValueError(f"cell {list(cell)} is outside the grid")
+    return grid, start, goal
+
+
+class RunRequest:
+    """A validated request: which generator to run, on what, and how to send it.
+
+    ``RunRequest(body)`` raises ``ValueError`` with a readable message for
+    anything it cannot run.
+    """
+
+    def __init__(self, body: Any):
+        if not isinstance(body, dict):
+            raise ValueError("the request must be a JSON object")
+        try:
+            self.spec = get_algorithm(str(body.get("algorithm", "")))
+        except KeyError:
+            raise ValueError(f"unknown algorithm: {body.get('algorithm')!r}") from None
+        self.format = body.get("format", "deltas")
+        if self.format not in FORMATS:
+            raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+        self.chunk = _positive_int(body, "chunk", DEFAULT_CHUNK, MAX_CHUNK)
+        self.max_frames = _positive_int(body, "max_frames", None)
+        self.params = body.get("params", {})
+        if not isinstance(self.params, dict):
+            raise ValueError("params must be an object")
+        self.start = self.goal = None
+        if self.spec.input_kind == "grid":
+            self.args = _grid(body)
+            self.start, self.goal = self.args[1], self.args[2]
+        else:
+            data = _array(body.get("data", []))
+            self.args = (data,)
+            if self.spec.input_kind == "sorted_array":
+                target = body.get("target")
+                if not isinstance(target, int) or isinstance(target, bool):
+                    raise ValueError(f"{self.spec.name} needs an integer target")
+                self.args = (sorted(data), target)
+
+    def frames(self) -> Iterator[Dict]:
+        """Start the generator; bad ``params`` raise ``ValueError``."""
+        try:
+            return self.spec.load()(*self.args, **self.params)
+        except TypeError as exc:
+            raise ValueError(f"bad params for {self.spec.name}: {exc}") from None
+
+
+def _resumed(first: Optional[Dict], gen: Optional[Iterator[Dict]], result: Any = None) -> Generator:
+    """``first`` and then the rest of ``gen``, returning what it returns."""
+    if first is None:
+        return result
+    yield first
+    return (yield from gen)
+
+
+class FrameStream:
+    """One run, read a chunk at a time; ``next_messages`` runs on a worker thread."""
+
+    def __init__(self, request: RunRequest):
+        self.request = request
+        self.sent = 0
+        self.done = False
+        self.truncated = False
+        self.result = None
+        self.error: Optional[Exception] = None
+        self._gen = request.frames()
+
+    def start(self) -> None:
+        """Generate the first frame now, so bad input fails before anything is sent.
+
+        Generators check their input before their first frame; their
+        ``ValueError`` is raised here, as is a ``TypeError`` from a param of
+        the wrong type (e.g. a list for ``seed``), like :meth:`RunRequest.frames`.
+        """
+        try:
+            first = next(self._gen)
+        except TypeError as exc:
+            raise ValueError(f"bad params for {self.request.spec.name}: {exc}") from None
+        except StopIteration as stop:
+            self._gen = _resumed(None, None, stop.value)
+        else:
+            self._gen = _resumed(first, self._gen)
+
+    def _start_message(self, frame: Dict) -> Dict:
+        spec = self.request.spec
+        message = {"type": "start", "algorithm": spec.key, "name": spec.name, "format": self.request.format}
+        if is_grid_frame(frame):
+            message.update(grid=frame["state"], start=self.request.start, goal=self.request.goal)
+        else:
+            message["initial"] = list(frame.get("state", []))
+        return message
+
+    def _encode(self, frame: Dict, index: int) -> Dict:
+        if is_grid_frame(frame):
+            return {key: value for key, value in frame.items() if key != "state"}
+        encoded = {key: value for key, value in frame.items() if key != "state"}
+        highlight = frame.get("highlight", ())
+        encoded["highlight"] = list(highlight) if isinstance(highlight, (list, tuple)) else [highlight]
+        if self.request.format == "frames" or "op" not in frame:
+            encoded["state"] = list(frame.get("state", []))
+        if index == 0 and self.request.format == "deltas":
+            # ``initial`` already includes the first frame's op
+            encoded["op"] = None
+        return encoded
+
+    def next_messages(self) -> List[str]:
+        """Advance the generator by up to one chunk and encode what it yielded."""
+        messages = []
+        frames = []
+        limit = self.request.chunk
+        if self.request.max_frames is not None:
+            limit = min(limit, self.request.max_frames - self.sent)
+        while len(frames) < limit:
+            try:
+                frame = next(self._gen)
+            except StopIteration as stop:
+                self.done = True
+                self.result = stop.value
+                break
+            except Exception as exc:
+                # the frames made so far still go out, then the error
+                self.done = True
+                self.error = exc
+                break
+            if self.sent == 0 and not frames:
+                messages.append(_json(self._start_message(frame)))
+            # encoded now: the generator may change ``state`` on its next step
+            frames.append(self._encode(frame, self.sent + len(frames)))
+        if frames:
+            messages.append(_json({"type": "chunk", "first": self.sent, "frames": frames}))
+            self.sent += len(frames)
+        if not self.done and self.request.max_frames is not None and self.sent >= self.request.max_frames:
+            self.done = self.truncated = True
+        if self.error is not None:
+            messages.append(_error_message(self.error))
+        elif self.done:
+            result = self.result if not self.truncated else None
+            messages.append(_json({"type": "end", "total": self.sent, "result": result,
+                                   "truncated": self.truncated}))
+        return messages
+
+    def close(self) -> None:
+        close = getattr(self._gen, "close", None)
+        if close is not None:
+            close()
+
+
+def _error_message(exc: Exception) -> str:
+    return _json({"type": "error", "message": str(exc) or type(exc).__name__})
+
+
+async def stream_messages(stream: FrameStream, executor: Executor) -> AsyncIterator[str]:
+    """The stream's messages, computing each chunk only after the last was consumed.
+
+    If the consumer stops early (or is cancelled), the generator is closed,
+    after the chunk a worker may still be computing. A chunk that fails ends
+    the stream with an ``error`` message.
+    """
+    pending = None
+    try:
+        while not stream.done:
+            pending = executor.submit(stream.next_messages)
+            try:
+                messages = await asyncio.wrap_future(pending)
+            except Exception as exc:
+                stream.done = True
+                stream.error = exc
+                messages = [_error_message(exc)]
+            pending = None
+            for message in messages:
+                yield message
+    finally:
+        if pending is not None and not pending.done():
+            pending.add_done_callback(lambda _: stream.close())
+        else:
+            stream.close()
+
+
+@contextlib.contextmanager
+def _tracked(app: Starlette, stream: FrameStream):
+    app.state.streams.add(stream)
+    try:
+        yield
+    finally:
+        app.state.streams.discard(stream)
+
+
+async def algorithms_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse([
+        {"key": spec.key, "name": spec.name, "input": spec.input_kind, "complexity": spec.complexity}
+        for spec in available_algorithms()
+    ])
+
+
+async def status_endpoint(request: Request) -> JSONResponse:
+    streams = list(request.app.state.streams)
+    return JSONResponse({"streams": [{"algorithm": s.request.spec.key, "sent": s.sent} for s in streams]})
+
+
+async def stream_endpoint(request: Request):
+    app = request.app
+    try:
+        stream = FrameStream(RunRequest(json.loads(await request.body() or b"null")))
+        await asyncio.wrap_future(app.state.executor.submit(stream.start))
+    except (ValueError, json.JSONDecodeError) as exc:
+        return JSONResponse({"error": str(exc)}, status_code=400)
+
+    async def lines():
+        with _tracked(app, stream):
+            async for message in stream_messages(stream, app.state.executor):
+                yield message + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def stream_socket(websocket: WebSocket) -> None:
+    await websocket.accept()
+    try:
+        stream = FrameStream(RunRequest(await websocket.receive_json()))
+        await asyncio.wrap_future(websocket.app.state.executor.submit(stream.start))
+    except WebSocketDisconnect:
+        return
+    except (ValueError, json.JSONDecodeError) as exc:
+        await websocket.send_json({"type": "error", "message": str(exc)})
+        await websocket.close(code=1003)
+        return
+
+    async def send_all():
+        async for message in stream_messages(stream, websocket.app.state.executor):
+            await websocket.send_text(message)
+
+    async def until_cancelled() -> bool:
+        """True once the client asks to cancel, False if it disconnects."""
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return False
+            with contextlib.suppress(ValueError, AttributeError):
+                if json.loads(message.get("text") or "{}").get("type") == "cancel":
+                    return True
+
+    with _tracked(websocket.app, stream):
+        sender = asyncio.ensure_future(send_all())
+        listener = asyncio.ensure_future(until_cancelled())
+        await asyncio.wait({sender, listener}, return_when=asyncio.FIRST_COMPLETED)
+        cancelled = listener.done() and listener.exception() is None and listener.result()
+        # the client is gone if it said so, or if sending to it failed
+        gone = (listener.done() and not cancelled) or (sender.done() and sender.exception() is not None)
+        for task in (sender, listener):
+            task.cancel()
+        await asyncio.gather(sender, listener, return_exceptions=True)
+        if gone:
+            return
+        if cancelled:
+            await websocket.send_json({"type": "cancelled", "sent": stream.sent})
+        await websocket.close(code=1011 if stream.error is not None else 1000)
+
+
+def create_app(executor: Optional[Executor] = None, workers: int = DEFAULT_WORKERS,
+               allow_origins: Sequence[str] = ()) -> Starlette:
+    """The server as an ASGI app; run it with ``uvicorn`` or any ASGI server.
+
+    Generators run on ``executor``, or on a thread pool of ``workers``
+    threads owned by the app. ``allow_origins`` lists the web origins whose
+    pages may call the API (CORS), e.g. ``["https://lms.example.org"]``.
+    """
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        owned = executor is None
+        app.state.executor = ThreadPoolExecutor(workers, thread_name_prefix="trace-server") if owned else executor
+        try:
+            yield
+        finally:
+            if owned:
+                app.state.executor.shutdown(wait=False, cancel_futures=True)
+
+    middleware = []
+    if allow_origins:
+        middleware.append(Middleware(CORSMiddleware, allow_origins=list(allow_origins), allow_methods=["GET", "POST"],
+                                     allow_headers=["Content-Type"]))
+    app = Starlette(
+        routes=[
+            Route("/algorithms", algorithms_endpoint),
+            Route("/status", status_endpoint),
+            Route("/stream", stream_endpoint, methods=["POST"]),
+            WebSocketRoute("/ws", stream_socket),
+        ],
+        middleware=middleware,
+        lifespan=lifespan,
+    )
+    app.state.streams = set()
+    return app
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Stream algorithm runs over HTTP and WebSocket.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help=f"interface to listen on (default {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="threads that advance the generators")
+    parser.add_argument("--allow-origin", action="append", default=[], metavar="ORIGIN",
+                        help="web origin allowed to call the API from a browser (repeatable)")
+    args = parser.parse_args(argv)
+    app = create_app(workers=args.workers, allow_origins=args.allow_origin)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
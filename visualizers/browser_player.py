@@ -0,0 +1,205 @@
+"""Play a whole trace in the browser.
+
+``trace_payload`` serializes a compact :class:`~utils.trace.Trace` once
+(typed-array columns as base64) and ``player_html`` wraps it in a small
+self-contained canvas player. The browser replays the ops itself, so the
+server does one render per animation instead of one script run per frame.
+"""
+import base64
+import json
+from array import array
+from typing import Dict
+
+from utils.trace import LOAD, Trace
+
+
+def _b64(typecode: str, values) -> str:
+    return base64.b64encode(array(typecode, values).tobytes()).decode("ascii")
+
+
+def trace_payload(trace: Trace) -> Dict:
+    """JSON-serializable form of ``trace`` for the browser player.
+
+    Columns are little-endian typed arrays (``Uint8``/``Int32``/``Uint32``/
+    ``Float64``) encoded as base64; values are sent as float64, which is exact
+    for integers below 2**53.
+    """
+    loads = [k for k, kind in enumerate(trace.kinds) if kind == LOAD]
+    return {
+        "length": len(trace),
+        "initial": _b64("d", trace.initial),
+        "kinds": _b64("B", trace.kinds),
+        "first": _b64("i", trace.first),
+        "second": _b64("i", trace.second),
+        "values": _b64("d", trace.values),
+        "info_ids": _b64("I", trace.info_ids),
+        "infos": trace.infos,
+        "templates": sorted(trace.templates),
+        "highlights": {str(k): list(h) for k, h in trace.highlights.items()},
+        "loads": {str(k): list(trace.state_at(k)) for k in loads},
+    }
+
+
+def decode_payload(payload: Dict) -> Dict:
+    """Inverse of the column encoding, mainly for tests and debugging."""
+    def col(name, typecode):
+        out = array(typecode)
+        out.frombytes(base64.b64decode(payload[name]))
+        return out
+
+    return {
+        "initial": col("initial", "d"),
+        "kinds": col("kinds", "B"),
+        "first": col("first", "i"),
+        "second": col("second", "i"),
+        "values": col("values", "d"),
+        "info_ids": col("info_ids", "I"),
+    }
+
+
+_PLAYER_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><style>
+body { margin: 0; font-family: sans-serif; }
+#bar { display: flex; gap: 6px; align-items: center; padding: 4px 0; }
+#info { font-size: 14px; margin: 4px 0; min-height: 18px; }
+canvas { width: 100%; background: #eaeaf2; }
+</style></head><body>
+<div id="info"></div>
+<canvas id="plot" width="900" height="__HEIGHT__"></canvas>
+<div id="bar">
+  <button id="play">&#9654; Play</button>
+  <button id="step">&#9197; Step</button>
+  <button id="reset">&#8634; Reset</button>
+  <input id="seek" type="range" min="0" value="0" style="flex: 1">
+  <span id="counter"></span>
+</div>
+<script>
+const PAYLOAD = __PAYLOAD__;
+const OPTIONS = __OPTIONS__;
+
+function column(b64, Type) {
+  const bytes = Uint8Array.from(atob(b64), c => c.charCodeAt(0));
+  return new Type(bytes.buffer);
+}
+
+const T = {
+  length: PAYLOAD.length,
+  initial: column(PAYLOAD.initial, Float64Array),
+  kinds: column(PAYLOAD.kinds, Uint8Array),
+  first: column(PAYLOAD.first, Int32Array),
+  second: column(PAYLOAD.second, Int32Array),
+  values: column(PAYLOAD.values, Float64Array),
+  infoIds: column(PAYLOAD.info_ids, Uint32Array),
+  templates: new Set(PAYLOAD.templates),
+};
+
+// op codes, as in utils/trace.py
+const SWAP = 2, SET = 3, LOAD = 4;
+
+let state = Float64Array.from(T.initial);
+let pos = -1;  // frame whose state is in `state`
+
+function apply(k) {
+  const kind = T.kinds[k];
+  if (kind === SWAP) {
+    const i = T.first[k], j = T.second[k];
+    const t = state[i]; state[i] = state[j]; state[j] = t;
+  } else if (kind === SET) {
+    state[T.first[k]] = T.values[T.second[k]];
+  } else if (kind === LOAD) {
+    state = Float64Array.from(PAYLOAD.loads[k]);
+  }
+}
+
+function seek(k) {
+  if (k < pos) { state = Float64Array.from(T.initial); pos = -1; }
+  while (pos < k) { pos += 1; apply(pos); }
+}
+
+function highlight(k) {
+  if (PAYLOAD.highlights[k]) return PAYLOAD.highlights[k];
+  const kind = T.kinds[k], i = T.first[k], j = T.second[k];
+  if (kind === LOAD) return [];
+  if (kind === SET) return [i];
+  return [i, j].filter(x => x >= 0);
+}
+
+function info(k) {
+  const id = T.infoIds[k], text = PAYLOAD.infos[id];
+  if (!T.templates.has(id)) return text;
+  const i = T.first[k], j = T.second[k];
+  const v = T.kinds[k] === SET ? T.values[j] : null;
+  return text.replaceAll("{i}", i).replaceAll("{j}", j).replaceAll("{v}", v);
+}
+
+const canvas = document.getElementById("plot");
+const ctx = canvas.getContext("2d");
+const seekBar = document.getElementById("seek");
+seekBar.max = Math.max(T.length - 1, 0);
+
+function draw(k) {
+  seek(k);
+  const n = state.length, w = canvas.width, h = canvas.height;
+  let top = 0, bottom = 0;
+  for (const v of state) { top = Math.max(top, v); bottom = Math.min(bottom, v); }
+  const span = (top - bottom) * 1.1 || 1;
+  const zero = h * top * 1.1 / span;
+  const slot = w / Math.max(n, 1), bw = Math.max(slot * 0.8, 1);
+  ctx.clearRect(0, 0, w, h);
+  ctx.fillStyle = OPTIONS.bar_color;
+  for (let x = 0; x < n; x++) {
+    const y = h * state[x] / span;
+    ctx.fillRect(x * slot + (slot - bw) / 2, zero - Math.max(y, 0), bw, Math.abs(y));
+  }
+  ctx.fillStyle = OPTIONS.highlight_color;
+  for (const x of highlight(k)) {
+    if (x < 0 || x >= n) continue;
+    const y = h * state[x] / span;
+    ctx.fillRect(x * slot + (slot - bw) / 2, zero - Math.max(y, 0), bw, Math.abs(y));
+  }
+  if (n <= OPTIONS.annotate_limit) {
+    ctx.fillStyle = "#222"; ctx.font = "11px sans-serif"; ctx.textAlign = "center";
+    for (let x = 0; x < n; x++) ctx.fillText(String(state[x]), (x + 0.5) * slot, zero - h * state[x] / span - 3);
+  }
+  document.getElementById("info").textContent = info(k);
+  document.getElementById("counter").textContent = (k + 1) + "/" + T.length;
+  seekBar.value = k;
+}
+
+let frame = 0, timer = null;
+function stop() { clearInterval(timer); timer = null; document.getElementById("play").innerHTML = "&#9654; Play"; }
+function play() {
+  if (frame >= T.length - 1) frame = 0;
+  document.getElementById("play").innerHTML = "&#9208; Pause";
+  timer = setInterval(() => {
+    if (frame >= T.length - 1) { stop(); return; }
+    frame += 1; draw(frame);
+  }, 1000 / OPTIONS.fps);
+}
+document.getElementById("play").onclick = () => (timer ? stop() : play());
+document.getElementById("step").onclick = () => { stop(); if (frame < T.length - 1) draw(++frame); };
+document.getElementById("reset").onclick = () => { stop(); frame = 0; draw(0); };
+seekBar.oninput = () => { stop(); frame = Number(seekBar.value); draw(frame); };
+if (T.length) { draw(0); if (OPTIONS.autoplay) play(); }
+</script></body></html>
+"""
+
+
+def player_html(payload: Dict, bar_color: str = "#4C78A8", highlight_color: str = "#EE994F",
+                fps: float = 2.0, height: int = 360, annotate_limit: int = 60, autoplay: bool = False) -> str:
+    """Self-contained HTML page that plays ``payload`` on a canvas."""
+    options = {
+        "bar_color": bar_color,
+        "highlight_color": highlight_color,
+        "fps": fps,
+        "annotate_limit": annotate_limit,
+        "autoplay": autoplay,
+    }
+    # "</" must not appear inside the inline script
+    def dump(obj):
+        return json.dumps(obj).replace("</", "<\\/")
+
+    return (_PLAYER_TEMPLATE
+            .replace("__HEIGHT__", str(int(height)))
+            .replace("__OPTIONS__", dump(options))
+            .replace("__PAYLOAD__", dump(payload)))
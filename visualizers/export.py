@@ -0,0 +1,223 @@
+"""Headless exporter: render any algorithm run to GIF, MP4 or WebM.
+
+The run is recorded once into a compact trace, split into chunks of frames
+and rendered with the Agg backend across a ``ProcessPoolExecutor``. Chunks are
+consumed in order with a bounded number in flight and streamed straight into
+the encoder, so memory stays flat however long the clip is.
+
+GIFs are written by a small streaming writer on top of Pillow (workers do the
+LZW encoding); MP4/WebM frames are piped to ``ffmpeg``.
+
+Usage::
+
+    python -m visualizers.export bubble_sort 5,2,4,1,3 -o bubble.gif --fps 10
+    python -m visualizers.export binary_search 1,3,5,7,9 --target 7 -o search.mp4
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Iterator, List, Optional, Sequence
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+from PIL import GifImagePlugin, Image
+
+from algorithms.fast_trace import FAST_ENGINES
+from algorithms.registry import get_algorithm
+from utils.draw_helpers import BarRenderer
+from utils.trace import Trace, record_trace
+
+DEFAULT_CHUNK = 64
+PLOT_STYLE = "seaborn-v0_8-darkgrid"
+
+
+def record_run(algo_name: str, data: Sequence, target=None) -> Trace:
+    """Record a registered array algorithm (key or display name) on ``data``.
+
+    Sorts with a vectorized engine in ``algorithms.fast_trace`` use it; the
+    trace is the same as the generator's.
+    """
+    spec = get_algorithm(algo_name)
+    if spec.input_kind == "grid":
+        raise ValueError(f"{spec.name} works on grids; only array algorithms can be exported")
+    if spec.key in FAST_ENGINES:
+        return FAST_ENGINES[spec.key](list(data))
+    algo = spec.load()
+    if spec.input_kind == "sorted_array":
+        if target is None:
+            raise ValueError(f"{spec.name} needs a target value")
+        return record_trace(algo(sorted(data), target))
+    return record_trace(algo(list(data)))
+
+
+# -- worker side -------------------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(trace: Trace, options: dict) -> None:
+    renderer = BarRenderer(figsize=options["figsize"], bar_color=options["bar_color"],
+                           highlight_color=options["highlight_color"], style=PLOT_STYLE)
+    FigureCanvasAgg(renderer.fig)
+    _worker.update(trace=trace, options=options, renderer=renderer)
+
+
+def _frame_image(frame) -> Image.Image:
+    renderer = _worker["renderer"]
+    renderer.update(frame["state"], frame["highlight"], frame["info"])
+    canvas = renderer.fig.canvas
+    canvas.draw()
+    return Image.fromarray(np.asarray(canvas.buffer_rgba())[..., :3])
+
+
+def _render_chunk(bounds) -> List[bytes]:
+    """Render frames ``start..stop-1`` as encoder-ready byte strings."""
+    start, stop = bounds
+    options = _worker["options"]
+    out = []
+    for frame in _worker["trace"].frames(start, stop):
+        image = _frame_image(frame)
+        if options["format"] == "gif":
+            palette = options["palette"]
+            quantized = image.quantize(palette=palette, dither=Image.Dither.NONE)
+            out.append(b"".join(GifImagePlugin.getdata(quantized, (0, 0), duration=options["duration"])))
+        else:
+            buf = BytesIO()
+            image.save(buf, format="PNG", compress_level=1)
+            out.append(buf.getvalue())
+    return out
+
+
+# -- parent side -------------------------------------------------------------
+
+def _chunks(total: int, size: int) -> List[tuple]:
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+def _rendered(trace: Trace, options: dict, workers: int, chunk_size: int) -> Iterator[bytes]:
+    """Yield encoded frames in order, keeping at most ``2 * workers`` chunks in flight."""
+    chunks = _chunks(len(trace), chunk_size)
+    if workers <= 1:
+        _init_worker(trace, options)
+        for bounds in chunks:
+            yield from _render_chunk(bounds)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(trace, options)) as pool:
+        pending = []
+        todo = iter(chunks)
+        for bounds in todo:
+            pending.append(pool.submit(_render_chunk, bounds))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            frames = pending.pop(0).result()
+            nxt = next(todo, None)
+            if nxt is not None:
+                pending.append(pool.submit(_render_chunk, nxt))
+            yield from frames
+
+
+def _gif_palette(trace: Trace, options: dict) -> Image.Image:
+    """One palette for the whole clip.
+
+    Built from the first frame drawn twice, plain and fully highlighted, so
+    both bar colors (and their anti-aliased edges) get palette entries.
+    """
+    _init_worker(trace, options)
+    first = trace[0]
+    plain = _frame_image(first)
+    marked = _frame_image(dict(first, highlight=tuple(range(len(first["state"])))))
+    sample = Image.new("RGB", (plain.width, plain.height * 2))
+    sample.paste(plain, (0, 0))
+    sample.paste(marked, (0, plain.height))
+    return sample.quantize(colors=256, dither=Image.Dither.NONE)
+
+
+def _write_gif(path: str, frames: Iterator[bytes], palette: Image.Image) -> None:
+    # the palette sample is two frames tall; its top half has the frame size
+    screen = palette.crop((0, 0, palette.width, palette.height // 2))
+    header, _ = GifImagePlugin.getheader(screen, info={"loop": 0, "duration": 1})
+    with open(path, "wb") as fp:
+        for part in header:
+            fp.write(part)
+        for data in frames:
+            fp.write(data)
+        fp.write(b";")
+
+
+def _write_ffmpeg(path: str, frames: Iterator[bytes], fps: float, ffmpeg: str) -> None:
+    codec = ["-c:v", "libvpx-vp9", "-b:v", "0", "-crf", "32"] if path.endswith(".webm") else \
+        ["-c:v", "libx264", "-pix_fmt", "yuv420p", "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+    cmd = [ffmpeg, "-y", "-loglevel", "error", "-f", "image2pipe", "-framerate", str(fps),
+           "-c:v", "png", "-i", "-"] + codec + [path]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+    try:
+        for data in frames:
+            proc.stdin.write(data)
+    finally:
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {proc.returncode}")
+
+
+def export_trace(trace: Trace, path: str, fps: float = 10, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK, figsize=(9, 4), bar_color: str = "#4C78A8",
+                 highlight_color: str = "#EE994F") -> int:
+    """Render ``trace`` to ``path`` (.gif, .mp4 or .webm); returns the frame count."""
+    fmt = os.path.splitext(path)[1].lower().lstrip(".")
+    if fmt not in ("gif", "mp4", "webm"):
+        raise ValueError(f"unsupported output format: {path}")
+    if not len(trace):
+        raise ValueError("nothing to export: the trace has no frames")
+    ffmpeg = None
+    if fmt != "gif":
+        ffmpeg = shutil.which("ffmpeg")
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg is required for MP4/WebM output")
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    options = {
+        "format": fmt,
+        "figsize": figsize,
+        "bar_color": bar_color,
+        "highlight_color": highlight_color,
+        "duration": int(round(1000 / fps)),
+    }
+    if fmt == "gif":
+        options["palette"] = _gif_palette(trace, options)
+        _write_gif(path, _rendered(trace, options, workers, chunk_size), options["palette"])
+    else:
+        _write_ffmpeg(path, _rendered(trace, options, workers, chunk_size), fps, ffmpeg)
+    return len(trace)
+
+
+def export_animation(algo_name: str, data: Sequence, path: str, target=None, **kwargs) -> int:
+    """Record ``algo_name`` on ``data`` and export it; see :func:`export_trace`."""
+    return export_trace(record_run(algo_name, data, target), path, **kwargs)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export an algorithm animation to GIF/MP4/WebM.")
+    parser.add_argument("algorithm", help="registered algorithm, e.g. bubble_sort or 'Merge Sort'")
+    parser.add_argument("data", help="comma separated integers, e.g. 5,2,4,1,3")
+    parser.add_argument("-o", "--output", required=True, help="output file (.gif, .mp4 or .webm)")
+    parser.add_argument("--target", type=int, help="target value for search algorithms")
+    parser.add_argument("--fps", type=float, default=10)
+    parser.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK, help="frames per worker task")
+    args = parser.parse_args(argv)
+
+    data = [int(x) for x in args.data.split(",") if x.strip()]
+    count = export_animation(args.algorithm, data, args.output, target=args.target, fps=args.fps,
+                             workers=args.workers, chunk_size=args.chunk_size)
+    print(f"wrote {count} frames to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""Grid visualizer for pathfinding algorithms.
+
+The grid is one uint8 raster of cell codes (see ``utils.grid_trace``) drawn
+by a single ``imshow`` through a ``ListedColormap``. Moving to a later frame
+only writes the cells discovered or expanded in between and hands the raster
+to ``set_data``, so the per-frame cost follows the frontier, not the grid
+size; stepping back rebuilds the raster from the trace.
+"""
+from io import BytesIO
+from typing import Dict, Optional
+
+import numpy as np
+from matplotlib import style as mpl_style
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+
+from utils.grid import to_index
+from utils.grid_trace import (CELL_NAMES, CURRENT, EMPTY, FRONTIER, GOAL, PATH, START, VISITED, WALL,
+                              GridTrace)
+
+DEFAULT_COLORS = {
+    EMPTY: "#f4f4f4",
+    WALL: "#2b2b2b",
+    FRONTIER: "#9ecae1",
+    VISITED: "#4C78A8",
+    PATH: "#EE994F",
+    CURRENT: "#e45756",
+    START: "#54a24b",
+    GOAL: "#b279a2",
+}
+
+
+class GridRenderer:
+    """Retained-mode grid view of a :class:`~utils.grid_trace.GridTrace`."""
+
+    def __init__(self, ax=None, figsize=(6, 6), colors: Optional[Dict[int, str]] = None, style: Optional[str] = None):
+        if ax is None:
+            with mpl_style.context(style or "default"):
+                self.fig = Figure(figsize=figsize)
+                ax = self.fig.add_subplot()
+        else:
+            self.fig = ax.figure
+        self.ax = ax
+        self.colors = dict(DEFAULT_COLORS, **(colors or {}))
+        self._cmap = ListedColormap([self.colors[code] for code in range(len(CELL_NAMES))])
+        self._image = None
+        self._trace: Optional[GridTrace] = None
+        self._step = -1
+        self._raster = None
+        # cells painted as current/start/goal, with the code underneath
+        self._marks: Dict[int, int] = {}
+        self._title = ax.set_title("", fontsize=12)
+
+    def set_colors(self, visited_color: str, highlight_color: str) -> None:
+        """Use the app's bar/highlight colors for visited cells and the path."""
+        if (self.colors[VISITED], self.colors[PATH]) == (visited_color, highlight_color):
+            return
+        self.colors[VISITED] = visited_color
+        self.colors[PATH] = highlight_color
+        self._cmap = ListedColormap([self.colors[code] for code in range(len(CELL_NAMES))])
+        if self._image is not None:
+            self._image.set_cmap(self._cmap)
+
+    def _reset(self, trace: GridTrace) -> None:
+        shape_changed = self._raster is None or self._raster.shape != (trace.rows, trace.cols)
+        self._raster = (trace.walls * WALL).reshape(trace.rows, trace.cols)
+        self._marks = {}
+        self._trace = trace
+        self._step = -1
+        if shape_changed or self._image is None:
+            if self._image is not None:
+                self._image.remove()
+            self._image = self.ax.imshow(self._raster, cmap=self._cmap, vmin=-0.5, vmax=len(CELL_NAMES) - 0.5,
+                                         interpolation="nearest")
+            self.ax.set_xticks([])
+            self.ax.set_yticks([])
+            self.fig.tight_layout()
+
+    def show(self, trace: GridTrace, k: int, info: Optional[str] = None) -> Figure:
+        """Draw frame ``k`` of ``trace``; returns the figure."""
+        k = trace._index(k)
+        if trace is not self._trace or k < self._step:
+            self._reset(trace)
+        flat = self._raster.reshape(-1)
+        for index, code in self._marks.items():
+            flat[index] = code
+        frontier, visited = trace.delta(self._step, k)
+        flat[frontier] = FRONTIER
+        flat[visited] = VISITED
+        if trace.path_frame is not None and self._step < trace.path_frame <= k:
+            flat[[to_index(cell, trace.cols) for cell in trace.path]] = PATH
+        self._step = k
+
+        marks = {trace.current[k]: CURRENT, trace.start: START, trace.goal: GOAL}
+        self._marks = {index: int(flat[index]) for index in marks if index is not None and index >= 0}
+        for index, code in marks.items():
+            if index in self._marks:
+                flat[index] = code
+        self._image.set_data(self._raster)
+        self._title.set_text(f"{trace.info_at(k) if info is None else info}\n{format_stats(trace.stats_at(k))}")
+        return self.fig
+
+    def to_png(self, dpi: Optional[int] = None) -> bytes:
+        buf = BytesIO()
+        self.fig.savefig(buf, format="png", dpi=dpi)
+        return buf.getvalue()
+
+
+def format_stats(stats: Dict) -> str:
+    """E.g. ``"1,234 cells expanded in 5.6 ms"``."""
+    text = f"{stats['expanded']:,} cells expanded"
+    if stats.get("seconds") is not None:
+        text += f" in {1000 * stats['seconds']:.1f} ms"
+    return text
+
+
+def visualize_path(gen, start=None, goal=None, pause: float = 0.02, every: int = 1):
+    """Animate a grid algorithm generator in a pyplot window.
+
+    ``every`` draws only every n-th frame, for large grids.
+    """
+    import matplotlib.pyplot as plt
+
+    plt.ion()
+    fig = plt.figure(figsize=(6, 6))
+    renderer = GridRenderer(ax=fig.gca())
+    trace = None
+    for frame in gen:
+        if trace is None:
+            trace = GridTrace(frame["state"], start, goal)
+        trace.record(frame)
+        if (len(trace) - 1) % every == 0 or "path" in frame:
+            renderer.show(trace, len(trace) - 1)
+            plt.pause(pause)
+    plt.ioff()
+    plt.show()
+    return trace
+
+
+if __name__ == '__main__':
+    # Quick manual demo
+    from algorithms.bfs_pathfinding import bfs_pathfinding
+    grid = np.zeros((20, 30), dtype=int)
+    grid[5, :25] = 1
+    grid[12, 5:] = 1
+    visualize_path(bfs_pathfinding(grid.tolist(), (0, 0), (19, 29)), (0, 0), (19, 29))